@@ -3,9 +3,26 @@ Wagyu Sports Package
 
 This package provides a client for sports betting data, allowing users to fetch
 sports betting data including live odds, scores, and event information.
+
+Exports are loaded on first access so that importing a subpackage (such as the
+MCP server) does not pay for the HTTP client.
 """
 
-from wagyu_sports.odds_client import OddsClient
-from wagyu_sports.utils import get_next_test_number, save_response, test_wagyu_sports
+import importlib
+
+_EXPORTS = {
+    'OddsClient': 'wagyu_sports.odds_client',
+    'CaptureLog': 'wagyu_sports.mcp_server.capture_log',
+    'open_capture_log': 'wagyu_sports.utils',
+    'test_wagyu_sports': 'wagyu_sports.utils',
+}
+
+__all__ = ['OddsClient', 'CaptureLog', 'open_capture_log', 'test_wagyu_sports']
+
 
-__all__ = ['OddsClient', 'get_next_test_number', 'save_response', 'test_wagyu_sports']
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark for alert rule evaluation.
+
+This script loads a synthetic rule set against a synthetic slate and feeds
+snapshots in which a fraction of the lines move. It compares the indexed
+AlertEngine with a naive evaluator that checks every rule against every line
+of every snapshot.
+
+Usage:
+    python benchmarks/bench_alert_rules.py --rules 5000 --snapshots 200
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.alert_rules import AlertEngine
+
+BOOKS = ["draftkings", "fanduel", "betmgm", "caesars", "pointsbetus", "bovada", "betrivers", "unibet_us"]
+
+
+def make_slate(events: int):
+    """Build a slate of h2h and spreads markets for every book."""
+    slate = []
+    for i in range(events):
+        home, away = f"Home {i}", f"Away {i}"
+        slate.append({"id": f"event{i}", "home_team": home, "away_team": away, "bookmakers": [
+            {"key": book, "markets": [
+                {"key": "h2h", "outcomes": [{"name": home, "price": 1.9}, {"name": away, "price": 1.9}]},
+                {"key": "spreads", "outcomes": [{"name": home, "price": 1.91, "point": -3.5},
+                                                {"name": away, "price": 1.91, "point": 3.5}]},
+            ]} for book in BOOKS
+        ]})
+    return slate
+
+
+def move(slate, fraction: float, rng: random.Random):
+    """Move a fraction of the outcomes of a slate in place."""
+    for event in slate:
+        for book in event["bookmakers"]:
+            for market in book["markets"]:
+                for outcome in market["outcomes"]:
+                    if rng.random() < fraction:
+                        outcome["price"] = round(max(1.01, outcome["price"] + rng.choice((-0.05, 0.05))), 2)
+                        if "point" in outcome:
+                            outcome["point"] += rng.choice((-0.5, 0.5))
+
+
+def add_rules(engine: AlertEngine, count: int, events: int, rng: random.Random):
+    """Add a mix of level and movement rules, some with wildcards."""
+    for _ in range(count):
+        i = rng.randrange(events)
+        event_id = f"event{i}" if rng.random() < 0.9 else None
+        outcome = rng.choice((f"Home {i}", f"Away {i}"))
+        if rng.random() < 0.5:
+            engine.add_rule("h2h", outcome=outcome, event_id=event_id, above=round(rng.uniform(1.95, 2.5), 2))
+        else:
+            engine.add_rule("spreads", outcome=outcome, event_id=event_id, field="point",
+                            move=1.5, window=1800)
+
+
+def naive(rules, sport, slate, last, now):
+    """Check every rule against every line, as an unindexed implementation would."""
+    checks = 0
+    for event in slate:
+        for book in event["bookmakers"]:
+            for market in book["markets"]:
+                for outcome in market["outcomes"]:
+                    line = (event["id"], book["key"], market["key"], outcome["name"])
+                    last[line] = (outcome["price"], outcome.get("point"))
+                    for rule in rules:
+                        checks += 1
+                        if rule.market == market["key"] and rule.event_id in (None, event["id"]) \
+                                and rule.outcome in (None, outcome["name"]) and rule.move is None:
+                            rule.level_met(outcome["price"])
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark alert rule evaluation")
+    parser.add_argument("--rules", type=int, default=5000, help="Number of standing rules")
+    parser.add_argument("--events", type=int, default=15, help="Events per snapshot")
+    parser.add_argument("--snapshots", type=int, default=200, help="Snapshots to evaluate")
+    parser.add_argument("--moving", type=float, default=0.1, help="Fraction of lines that move per snapshot")
+    parser.add_argument("--naive-snapshots", type=int, default=5, help="Snapshots for the naive baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    engine = AlertEngine(clock=lambda: 0.0)
+    add_rules(engine, args.rules, args.events, rng)
+    slate = make_slate(args.events)
+    engine.process("basketball_nba", slate, 0.0)
+
+    started = time.perf_counter()
+    for n in range(1, args.snapshots + 1):
+        move(slate, args.moving, rng)
+        engine.process("basketball_nba", slate, n * 60.0)
+    indexed = (time.perf_counter() - started) / args.snapshots
+
+    rules, last = engine.rules(), {}
+    started = time.perf_counter()
+    for n in range(args.naive_snapshots):
+        move(slate, args.moving, rng)
+        naive(rules, "basketball_nba", slate, last, n * 60.0)
+    baseline = (time.perf_counter() - started) / args.naive_snapshots
+
+    stats = engine.stats
+    print(f"{args.rules} rules, {stats['lines'] // stats['snapshots']} lines per snapshot, "
+          f"{args.moving:.0%} moving")
+    print(f"indexed: {indexed * 1000:8.2f} ms/snapshot  "
+          f"{stats['deltas'] / stats['snapshots']:.0f} deltas, "
+          f"{stats['evaluations'] / stats['snapshots']:.0f} rule checks/snapshot, "
+          f"{stats['alerts']} alerts")
+    print(f"naive:   {baseline * 1000:8.2f} ms/snapshot  "
+          f"{len(rules) * stats['lines'] // stats['snapshots']} rule checks/snapshot")
+    print(f"speedup: {baseline / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
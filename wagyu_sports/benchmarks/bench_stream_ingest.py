@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark for streaming JSON ingestion of large /odds responses.
+
+This script builds a synthetic all-regions, all-markets soccer response and
+compares peak and retained memory (measured with tracemalloc) of:
+
+- ``response.json()``: the body decoded to text and parsed in one piece
+- ``load_json_stream``: the body parsed element by element from chunks, with
+  repeated strings and prices shared
+
+Both variants start from the same in-memory body, which is not counted. A
+real ``response.json()`` also keeps the raw body for the duration of the
+parse, so its actual peak is higher still.
+
+Usage:
+    python benchmarks/bench_stream_ingest.py --events 60 --books 45
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.odds_client import load_json_stream, STREAM_CHUNK_SIZE
+
+MARKETS = {
+    "h2h": ["{home}", "{away}", "Draw"],
+    "h2h_lay": ["{home}", "{away}", "Draw"],
+    "spreads": ["{home}", "{away}"],
+    "totals": ["Over", "Under"],
+    "draw_no_bet": ["{home}", "{away}"],
+}
+
+
+def make_body(events: int, books: int, rng: random.Random) -> bytes:
+    """Build a synthetic /odds response body."""
+    data = []
+    for i in range(events):
+        home, away = f"Home Club {i % 20}", f"Away Club {(i + 7) % 20}"
+        bookmakers = []
+        for b in range(books):
+            updated = f"2025-03-0{1 + b % 9}T12:{b % 60:02d}:00Z"
+            markets = []
+            for key, names in MARKETS.items():
+                outcomes = []
+                for name in names:
+                    outcome = {"name": name.format(home=home, away=away),
+                               "price": round(rng.uniform(1.5, 4.5), 2)}
+                    if key in ("spreads", "totals"):
+                        outcome["point"] = rng.choice((-1.5, -0.5, 0.5, 1.5, 2.5))
+                    outcomes.append(outcome)
+                markets.append({"key": key, "last_update": updated, "outcomes": outcomes})
+            bookmakers.append({"key": f"book{b}", "title": f"Book {b}", "last_update": updated,
+                               "markets": markets})
+        data.append({"id": f"{i:032x}", "sport_key": "soccer_epl", "sport_title": "EPL",
+                     "commence_time": "2025-03-08T15:00:00Z", "home_team": home, "away_team": away,
+                     "bookmakers": bookmakers})
+    return json.dumps(data).encode()
+
+
+def measure(parse, body: bytes):
+    """Run parse(body) and return (result, peak bytes, retained bytes, seconds)."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = parse(body)
+    seconds = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak, retained, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming JSON ingestion")
+    parser.add_argument("--events", type=int, default=60, help="Events in the response")
+    parser.add_argument("--books", type=int, default=45, help="Bookmakers per event")
+    args = parser.parse_args()
+
+    body = make_body(args.events, args.books, random.Random(7))
+
+    def whole(body):
+        return json.loads(body.decode("utf-8"))
+
+    def streamed(body):
+        chunks = (body[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(body), STREAM_CHUNK_SIZE))
+        return load_json_stream(chunks)
+
+    expected, whole_peak, whole_retained, whole_seconds = measure(whole, body)
+    del expected
+    result, stream_peak, stream_retained, stream_seconds = measure(streamed, body)
+    assert result == json.loads(body)
+
+    mb = 1024 * 1024
+    print(f"body: {len(body) / mb:.1f} MB, {args.events} events x {args.books} books")
+    print(f"response.json():  peak {whole_peak / mb:7.1f} MB  retained {whole_retained / mb:7.1f} MB  "
+          f"{whole_seconds * 1000:7.0f} ms")
+    print(f"load_json_stream: peak {stream_peak / mb:7.1f} MB  retained {stream_retained / mb:7.1f} MB  "
+          f"{stream_seconds * 1000:7.0f} ms")
+    print(f"peak reduction: {1 - stream_peak / whole_peak:.0%}")
+
+
+if __name__ == "__main__":
+    main()
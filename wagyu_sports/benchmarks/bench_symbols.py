@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the process-wide symbol tables.
+
+This script parses a series of synthetic /odds snapshots, as successive
+fetches would, and reports the memory retained by the snapshots with and
+without ``intern_events``, and how many strings the tables hold afterwards
+(which must not grow with the number of snapshots).
+
+Usage:
+    python benchmarks/bench_symbols.py --snapshots 10
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server import symbols
+from bench_stream_ingest import make_body
+
+
+def retained(build):
+    """Return (result, bytes still allocated after build())."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark symbol tables")
+    parser.add_argument("--snapshots", type=int, default=10, help="Snapshots retained")
+    parser.add_argument("--events", type=int, default=30, help="Events per snapshot")
+    parser.add_argument("--books", type=int, default=30, help="Bookmakers per event")
+    args = parser.parse_args()
+
+    bodies = [make_body(args.events, args.books, random.Random(n)) for n in range(args.snapshots)]
+
+    plain, plain_size = retained(lambda: [json.loads(body) for body in bodies])
+
+    def interned_snapshots():
+        snapshots = []
+        for body in bodies:
+            events = json.loads(body)
+            symbols.intern_events(events)
+            snapshots.append(events)
+        return snapshots
+
+    # Warm the tables first: in a running server they are already populated
+    interned_snapshots()
+    interned, interned_size = retained(interned_snapshots)
+
+    mb = 1024 * 1024
+    print(f"{args.snapshots} snapshots of {len(bodies[0]) / mb:.1f} MB")
+    print(f"retained, plain:    {plain_size / mb:7.1f} MB ({plain_size / args.snapshots / mb:.2f} MB/snapshot)")
+    print(f"retained, interned: {interned_size / mb:7.1f} MB ({interned_size / args.snapshots / mb:.2f} MB/snapshot)")
+
+    print("table sizes: " + ", ".join(f"{name} {len(table)}" for name, table in symbols.TABLES.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,18 @@ Wagyu Sports MCP Server
 This module provides an MCP server implementation for the Wagyu Sports API.
 """
 
-try:
-    # When imported as a package
-    from .odds_client_server import OddsMcpServer
-except ImportError:
-    # When run directly
-    from odds_client_server import OddsMcpServer
-
 __all__ = ["OddsMcpServer"]
+
+
+def __getattr__(name):
+    # Loaded on first access so the standalone helpers can be imported without FastMCP
+    if name == "OddsMcpServer":
+        try:
+            # When imported as a package
+            from .odds_client_server import OddsMcpServer
+        except ImportError:
+            # When run directly
+            from odds_client_server import OddsMcpServer
+        globals()[name] = OddsMcpServer
+        return OddsMcpServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Admission Control Module
+
+This module bounds how many calls of a tool run at once when many sessions
+share one server, and decides whose call runs next.
+
+- Each gated tool has a number of slots. A call that finds them all busy
+  waits in its session's queue.
+- When a slot frees up, it goes to the next session in round-robin order,
+  not to the oldest waiting call. A session with thirty queued calls
+  therefore gets one slot in turn with a session that has one.
+- A call is shed instead of queued when the tool's queue or its session's
+  queue is full. The caller then answers it without running the tool: from
+  cache when it can, otherwise with a fast "busy" response.
+- Background work such as prefetching only takes a slot that is free while
+  nothing is queued, and never waits for one.
+
+Queue depth, wait time, admissions and sheds are kept per tool for metrics.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Any, Hashable
+
+# Wait times kept per tool for percentiles
+WAIT_WINDOW = 500
+
+
+class Shed(Exception):
+    """Raised when a call is turned away because its queue is full."""
+
+
+class FairGate:
+    """Slots for one tool, handed out round-robin across sessions."""
+
+    def __init__(self, name: str, limit: int, max_queue: int, max_session_queue: int):
+        """
+        Initialize the gate.
+
+        Args:
+            name (str): Tool name, for metrics
+            limit (int): Calls that may run at once
+            max_queue (int): Calls that may wait, across all sessions
+            max_session_queue (int): Calls one session may have waiting
+        """
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_session_queue = max_session_queue
+        self.active = 0
+        # session -> waiting futures; the first session is served next
+        self._queues: "OrderedDict[Hashable, deque]" = OrderedDict()
+        self.queued = 0
+        self.waits = deque(maxlen=WAIT_WINDOW)
+        self.stats = {"admitted": 0, "queued": 0, "shed": 0, "peak_queued": 0, "max_wait_ms": 0.0,
+                      "background": 0}
+
+    async def acquire(self, session: Hashable) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            session (Hashable): Key of the calling session
+
+        Raises:
+            Shed: If the tool's or the session's queue is full
+        """
+        if self.active < self.limit and not self.queued:
+            self.active += 1
+            self.stats["admitted"] += 1
+            self.waits.append(0.0)
+            return
+        waiting = self._queues.get(session)
+        if self.queued >= self.max_queue or (waiting is not None and len(waiting) >= self.max_session_queue):
+            self.stats["shed"] += 1
+            raise Shed(f"{self.name} is busy: {self.active} running, {self.queued} queued")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(session, deque()).append(future)
+        self.queued += 1
+        self.stats["queued"] += 1
+        self.stats["peak_queued"] = max(self.stats["peak_queued"], self.queued)
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller gave up
+                self.release()
+            else:
+                self._forget(session, future)
+            raise
+        waited = time.monotonic() - started
+        self.waits.append(waited)
+        self.stats["admitted"] += 1
+        self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], waited * 1000)
+
+    def try_acquire(self) -> bool:
+        """
+        Take a slot for low-priority work without waiting.
+
+        Returns:
+            bool: True if a slot was taken (release it when done); False if every slot is
+                busy or a call is waiting, so background work never delays a caller
+        """
+        if self.active >= self.limit or self.queued:
+            return False
+        self.active += 1
+        self.stats["background"] += 1
+        return True
+
+    def _forget(self, session: Hashable, future: asyncio.Future) -> None:
+        waiting = self._queues.get(session)
+        if waiting is not None and future in waiting:
+            waiting.remove(future)
+            self.queued -= 1
+            if not waiting:
+                del self._queues[session]
+
+    def release(self) -> None:
+        """Free a slot, handing it to the next session's oldest waiting call."""
+        while self._queues:
+            session, waiting = next(iter(self._queues.items()))
+            future = waiting.popleft()
+            self.queued -= 1
+            if waiting:
+                # The session goes to the back of the line
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get the gate's metrics.
+
+        Returns:
+            Dict[str, Any]: Limit, running and queued calls, waiting sessions, counters and
+                wait time percentiles in milliseconds over recent admissions
+        """
+        waits = sorted(self.waits)
+
+        def percentile(pct: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(len(waits) * pct / 100))] * 1000, 3)
+
+        return {
+            "limit": self.limit,
+            "running": self.active,
+            "queue_depth": self.queued,
+            "waiting_sessions": len(self._queues),
+            **self.stats,
+            "wait_ms": {"p50": percentile(50), "p95": percentile(95)},
+        }
+
+
+class AdmissionController:
+    """Fair gates for the tools of one server."""
+
+    def __init__(self, limit: int, max_queue: int = 32, max_session_queue: int = 4):
+        """
+        Initialize the controller.
+
+        Args:
+            limit (int): Calls of each gated tool that may run at once
+            max_queue (int): Calls of each tool that may wait, across all sessions
+            max_session_queue (int): Calls of each tool one session may have waiting
+        """
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_session_queue = max_session_queue
+        self.gates: Dict[str, FairGate] = {}
+
+    def gate(self, tool: str) -> FairGate:
+        """Get the gate of a tool, creating it on first use."""
+        if tool not in self.gates:
+            self.gates[tool] = FairGate(tool, self.limit, self.max_queue, self.max_session_queue)
+        return self.gates[tool]
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get metrics of every gate.
+
+        Returns:
+            Dict[str, Any]: Per tool metrics (see FairGate.metrics)
+        """
+        return {tool: gate.metrics() for tool, gate in self.gates.items()}
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Alert Rules Module
+
+This module evaluates standing alert rules against incoming odds snapshots.
+Two kinds of rule are supported:
+
+- level rules: a price or point goes above or below a level
+  ("Warriors moneyline drifts past +150 at any book")
+- movement rules: a price or point moves by at least an amount within a
+  time window ("spread moves 1.5 points in 30 minutes")
+
+Rules are indexed by (event, market, outcome), with wildcards for rules that
+leave the event or outcome open. Each snapshot is first reduced to the lines
+whose price or point changed, and only the rules indexed under those lines are
+evaluated. The cost of a snapshot therefore depends on what moved, not on how
+many rules exist.
+"""
+import time
+import threading
+from collections import deque
+from itertools import count
+from typing import Dict, List, Optional, Any, Callable, Tuple, Deque
+
+try:
+    # When imported as a package
+    from . import symbols
+except ImportError:
+    # When run directly
+    import symbols
+
+FIELDS = ("price", "point")
+
+Line = symbols.Line
+
+
+class AlertRule:
+    """A standing alert condition."""
+
+    def __init__(self, rule_id: int, market: str, outcome: Optional[str] = None,
+                 event_id: Optional[str] = None, bookmaker: Optional[str] = None,
+                 sport: Optional[str] = None, field: str = "price",
+                 above: Optional[float] = None, below: Optional[float] = None,
+                 move: Optional[float] = None, window: float = 1800.0):
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {', '.join(FIELDS)}")
+        if above is None and below is None and move is None:
+            raise ValueError("A rule needs a level (above/below) or a movement (move)")
+        if move is not None and (above is not None or below is not None):
+            raise ValueError("A rule is either a level rule or a movement rule, not both")
+        if move is not None and move <= 0:
+            raise ValueError("move must be positive")
+        self.id = rule_id
+        self.market = market
+        self.outcome = outcome
+        self.event_id = event_id
+        self.bookmaker = bookmaker
+        self.sport = sport
+        self.field = field
+        self.above = above
+        self.below = below
+        self.move = move
+        self.window = window
+
+    @property
+    def index_key(self) -> Tuple[Optional[str], str, Optional[str]]:
+        return (self.event_id, self.market, self.outcome)
+
+    def level_met(self, value: float) -> bool:
+        """Whether a value satisfies this level rule."""
+        return (self.above is None or value > self.above) and (self.below is None or value < self.below)
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Get the rule as a dict.
+
+        Returns:
+            Dict[str, Any]: Rule fields, omitting unset ones
+        """
+        fields = {
+            "id": self.id, "sport": self.sport, "event_id": self.event_id, "market": self.market,
+            "outcome": self.outcome, "bookmaker": self.bookmaker, "field": self.field,
+            "above": self.above, "below": self.below, "move": self.move,
+            "window_seconds": self.window if self.move is not None else None,
+        }
+        return {key: value for key, value in fields.items() if value is not None}
+
+
+class AlertEngine:
+    """Indexed, incremental evaluation of alert rules."""
+
+    def __init__(self, max_alerts: int = 1000, clock: Callable[[], float] = time.time):
+        """
+        Initialize the engine.
+
+        Args:
+            max_alerts (int): Triggered alerts kept for get_alerts()
+            clock (Callable[[], float]): Time source returning epoch seconds
+        """
+        self.clock = clock
+        self._rules: Dict[int, AlertRule] = {}
+        self._index: Dict[Tuple[Optional[str], str, Optional[str]], Dict[int, AlertRule]] = {}
+        self._ids = count(1)
+        self._alert_ids = count(1)
+        self._last: Dict[Line, Tuple[float, Optional[float]]] = {}
+        # Per line, (time, price, point) changes needed by movement rules
+        self._history: Dict[Line, Deque[Tuple[float, float, Optional[float]]]] = {}
+        self._max_window = 0.0
+        # (rule id, line) -> whether a level rule was met on the last change
+        self._met: Dict[Tuple[int, Line], bool] = {}
+        # (rule id, line) -> when a movement rule last fired
+        self._fired_at: Dict[Tuple[int, Line], float] = {}
+        self.alerts: Deque[Dict[str, Any]] = deque(maxlen=max_alerts)
+        self._lock = threading.Lock()
+        self.stats = {"snapshots": 0, "lines": 0, "deltas": 0, "evaluations": 0, "alerts": 0}
+
+    def add_rule(self, market: str, **conditions) -> AlertRule:
+        """
+        Add a rule.
+
+        Args:
+            market (str): Market key (e.g., 'h2h', 'spreads')
+            **conditions: AlertRule arguments: outcome, event_id, bookmaker, sport,
+                field, above, below, move, window
+
+        Returns:
+            AlertRule: The new rule
+
+        Raises:
+            ValueError: If the conditions do not describe a valid rule
+        """
+        with self._lock:
+            rule = AlertRule(next(self._ids), market, **conditions)
+            self._rules[rule.id] = rule
+            self._index.setdefault(rule.index_key, {})[rule.id] = rule
+            if rule.move is not None:
+                self._max_window = max(self._max_window, rule.window)
+            return rule
+
+    def remove_rule(self, rule_id: int) -> bool:
+        """
+        Remove a rule.
+
+        Args:
+            rule_id (int): Rule ID
+
+        Returns:
+            bool: Whether the rule existed
+        """
+        with self._lock:
+            rule = self._rules.pop(rule_id, None)
+            if rule is None:
+                return False
+            bucket = self._index[rule.index_key]
+            del bucket[rule_id]
+            if not bucket:
+                del self._index[rule.index_key]
+            self._max_window = max((r.window for r in self._rules.values() if r.move is not None), default=0.0)
+            for state in (self._met, self._fired_at):
+                for key in [k for k in state if k[0] == rule_id]:
+                    del state[key]
+            return True
+
+    def forget_events(self, event_ids: List[str]) -> None:
+        """
+        Drop the line state of events evicted from the odds board.
+
+        Args:
+            event_ids (List[str]): Events to forget
+        """
+        gone = set(event_ids)
+        with self._lock:
+            for state in (self._last, self._history):
+                for line in [line for line in state if line[0] in gone]:
+                    del state[line]
+            for state in (self._met, self._fired_at):
+                for key in [key for key in state if key[1][0] in gone]:
+                    del state[key]
+
+    def rules(self) -> List[AlertRule]:
+        """Get every rule, oldest first."""
+        with self._lock:
+            return list(self._rules.values())
+
+    def get_alerts(self, since_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        Get triggered alerts.
+
+        Args:
+            since_id (int): Only alerts with a larger ID
+
+        Returns:
+            List[Dict[str, Any]]: Alerts, oldest first
+        """
+        with self._lock:
+            return [alert for alert in self.alerts if alert["id"] > since_id]
+
+    def _candidates(self, line: Line) -> List[AlertRule]:
+        event_id, _, market, outcome = line
+        rules: List[AlertRule] = []
+        for key in ((event_id, market, outcome), (event_id, market, None),
+                    (None, market, outcome), (None, market, None)):
+            bucket = self._index.get(key)
+            if bucket:
+                rules.extend(bucket.values())
+        return rules
+
+    def process(self, sport: str, events: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Evaluate the rules touched by a snapshot's changes.
+
+        Args:
+            sport (str): Sport key
+            events (List[Dict[str, Any]]): Events from an /odds response
+            fetched_at (float, optional): Epoch seconds of the snapshot. Defaults to now.
+
+        Returns:
+            List[Dict[str, Any]]: Alerts triggered by this snapshot
+        """
+        now = self.clock() if fetched_at is None else fetched_at
+        triggered = []
+        with self._lock:
+            self.stats["snapshots"] += 1
+            for event in events:
+                for line, outcome in symbols.iter_lines(event):
+                    self.stats["lines"] += 1
+                    value = (outcome["price"], outcome.get("point"))
+                    if self._last.get(line) == value:
+                        continue
+                    self._last[line] = value
+                    self.stats["deltas"] += 1
+                    rules = self._candidates(line)
+                    if rules:
+                        triggered.extend(self._evaluate(sport, event, line, value, rules, now))
+            self.alerts.extend(triggered)
+            self.stats["alerts"] += len(triggered)
+        return triggered
+
+    def _evaluate(self, sport: str, event: Dict[str, Any], line: Line, value: Tuple[float, Optional[float]],
+                  rules: List[AlertRule], now: float) -> List[Dict[str, Any]]:
+        history = None
+        if self._max_window:
+            history = self._history.setdefault(line, deque())
+            history.append((now, value[0], value[1]))
+            # Keep one change older than the window: it is the value in effect at the window start
+            while len(history) > 1 and history[1][0] <= now - self._max_window:
+                history.popleft()
+
+        triggered = []
+        for rule in rules:
+            if (rule.sport is not None and rule.sport != sport) or \
+                    (rule.bookmaker is not None and rule.bookmaker != line[1]):
+                continue
+            current = value[FIELDS.index(rule.field)]
+            if current is None:
+                continue
+            self.stats["evaluations"] += 1
+            key = (rule.id, line)
+            if rule.move is None:
+                met = rule.level_met(current)
+                fire = met and not self._met.get(key, False)
+                self._met[key] = met
+                moved = None
+            else:
+                moved = self._movement(rule, key, history, current, now)
+                fire = moved is not None
+                if fire:
+                    self._fired_at[key] = now
+            if fire:
+                triggered.append(self._alert(rule, event, line, value, moved, now))
+        return triggered
+
+    def _movement(self, rule: AlertRule, key: Tuple[int, Line], history: Deque, current: float,
+                  now: float) -> Optional[float]:
+        # Compare against values in effect since the window started (or since the last alert)
+        start = max(now - rule.window, self._fired_at.get(key, float("-inf")))
+        position = FIELDS.index(rule.field) + 1
+        largest = None
+        for entry in reversed(history):
+            past = entry[position]
+            if past is not None:
+                moved = current - past
+                if abs(moved) >= rule.move and (largest is None or abs(moved) > abs(largest)):
+                    largest = moved
+            if entry[0] <= start:
+                break
+        return largest
+
+    def _alert(self, rule: AlertRule, event: Dict[str, Any], line: Line, value: Tuple[float, Optional[float]],
+               moved: Optional[float], now: float) -> Dict[str, Any]:
+        event_id, bookmaker, market, outcome = line
+        alert = {
+            "id": next(self._alert_ids),
+            "rule_id": rule.id,
+            "at": now,
+            "event_id": event_id,
+            "event": f"{event.get('away_team')} @ {event.get('home_team')}",
+            "bookmaker": bookmaker,
+            "market": market,
+            "outcome": outcome,
+            "price": value[0],
+        }
+        if value[1] is not None:
+            alert["point"] = value[1]
+        if moved is not None:
+            alert["moved"] = round(moved, 4)
+        return alert
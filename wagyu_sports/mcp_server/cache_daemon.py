@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Wagyu Sports Shared Cache Daemon
+
+This module provides a small coordinator process that several stdio
+OddsMcpServer instances attach to over a Unix domain socket. It holds shared
+odds snapshots, runs cross-process single-flight for upstream requests and
+keeps one global quota ledger.
+
+The protocol is newline-delimited JSON: every request is one JSON object with
+an ``op`` field and is answered by one JSON object. Clients keep their
+connections open and reuse them for later requests.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+# Largest request or response line accepted (odds snapshots can be large)
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+# Idle connections a client keeps open for reuse
+MAX_IDLE_CONNECTIONS = 4
+
+
+def default_socket_path() -> str:
+    """
+    Get the per-user default socket path.
+
+    Returns:
+        str: Path from WAGYU_CACHE_SOCKET, or a file in the temp directory
+    """
+    env_path = os.environ.get("WAGYU_CACHE_SOCKET")
+    if env_path:
+        return env_path
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(tempfile.gettempdir(), f"wagyu-sports-cache-{uid}.sock")
+
+
+def _socket_in_use(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class CacheDaemon:
+    """Shared snapshot store, single-flight coordinator and quota ledger."""
+
+    def __init__(self, socket_path: str, max_age: float = 3600.0, idle_timeout: Optional[float] = 600.0):
+        """
+        Initialize the daemon.
+
+        Args:
+            socket_path: Unix socket path to listen on
+            max_age: Seconds a snapshot is kept at all
+            idle_timeout: Exit after this many seconds without clients. None runs forever.
+        """
+        self.socket_path = socket_path
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self.snapshots: Dict[str, Tuple[float, Any]] = {}
+        self.flights: Dict[str, Tuple[float, asyncio.Event]] = {}
+        self.ledger: Dict[str, Any] = {"keys": {}, "spent": 0, "upstream_calls": 0}
+        # Open client connections; clients keep them between requests
+        self.connections = 0
+        self._writers: set = set()
+        self.last_activity = time.monotonic()
+        self._stopped = None
+
+    async def serve(self):
+        """Listen until shut down or idle for longer than idle_timeout."""
+        self._stopped = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            if _socket_in_use(self.socket_path):
+                # Another daemon won the race to start
+                return
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=MAX_MESSAGE_BYTES)
+        os.chmod(self.socket_path, 0o600)
+        try:
+            while not self._stopped.is_set():
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    idle = time.monotonic() - self.last_activity
+                    if self.idle_timeout is not None and self.connections == 0 and idle > self.idle_timeout:
+                        break
+        finally:
+            server.close()
+            # Attached clients hold their connections open; they reconnect to the next daemon
+            for writer in list(self._writers):
+                writer.close()
+            await server.wait_closed()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than MAX_MESSAGE_BYTES: the rest of the line cannot be told
+                    # apart from the next request, so answer and drop the connection
+                    writer.write(json.dumps({"error": "Message too large"}).encode() + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                self.last_activity = time.monotonic()
+                try:
+                    request = json.loads(line)
+                    response = await self._dispatch(request)
+                except Exception as e:
+                    response = {"error": str(e)}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            self._writers.discard(writer)
+            self.last_activity = time.monotonic()
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "get":
+            return self._get(request["key"], request.get("max_age", self.max_age))
+        if op == "acquire":
+            return await self._acquire(request["key"], request.get("max_age", self.max_age),
+                                       request.get("lease", 30.0))
+        if op == "put":
+            return self._put(request["key"], request["value"], request.get("stored_at"))
+        if op == "release":
+            self._finish_flight(request["key"])
+            return {"ok": True}
+        if op == "record_quota":
+            return self._record_quota(request.get("keys", []), request.get("spent", 0))
+        if op == "ledger":
+            return {"ledger": self.ledger}
+        if op == "shutdown":
+            self._stopped.set()
+            return {"ok": True}
+        raise ValueError(f"Unknown op '{op}'")
+
+    def _get(self, key: str, max_age: float) -> Dict[str, Any]:
+        snapshot = self.snapshots.get(key)
+        if snapshot is None or time.time() - snapshot[0] > max_age:
+            return {"found": False}
+        return {"found": True, "stored_at": snapshot[0], "value": snapshot[1]}
+
+    async def _acquire(self, key: str, max_age: float, lease: float) -> Dict[str, Any]:
+        while True:
+            found = self._get(key, max_age)
+            if found["found"]:
+                return found
+            flight = self.flights.get(key)
+            if flight is None or time.monotonic() > flight[0]:
+                # Nobody is fetching this key (or the leader's lease ran out)
+                if flight is not None:
+                    flight[1].set()
+                self.flights[key] = (time.monotonic() + lease, asyncio.Event())
+                return {"found": False, "leader": True}
+            try:
+                await asyncio.wait_for(flight[1].wait(), timeout=max(flight[0] - time.monotonic(), 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def _put(self, key: str, value: Any, stored_at: Optional[float]) -> Dict[str, Any]:
+        now = time.time()
+        self.snapshots[key] = (stored_at or now, value)
+        for old_key in [k for k, (ts, _) in self.snapshots.items() if now - ts > self.max_age]:
+            del self.snapshots[old_key]
+        self._finish_flight(key)
+        return {"ok": True}
+
+    def _finish_flight(self, key: str):
+        flight = self.flights.pop(key, None)
+        if flight is not None:
+            flight[1].set()
+
+    def _record_quota(self, keys: Any, spent: int) -> Dict[str, Any]:
+        for usage in keys:
+            known = self.ledger["keys"].get(usage["key"])
+            # Keep the most recent view: used only grows within a billing period
+            if known is None or (usage.get("used_requests") or 0) >= (known.get("used_requests") or 0):
+                self.ledger["keys"][usage["key"]] = usage
+        self.ledger["spent"] += spent
+        self.ledger["upstream_calls"] += 1
+        return {"ok": True}
+
+
+class SharedCacheClient:
+    """
+    Blocking client for the shared cache daemon.
+
+    The daemon is started automatically on first use. Connections are kept
+    open and reused; concurrent requests from several threads each use their
+    own. If the daemon cannot be reached, every operation degrades to
+    local-only behavior and the connection is retried after
+    ``retry_interval`` seconds.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, autostart: bool = True,
+                 timeout: float = 30.0, retry_interval: float = 30.0):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Daemon socket path. Defaults to default_socket_path().
+            autostart: Start the daemon if nothing is listening
+            timeout: Socket timeout in seconds for a single operation
+            retry_interval: Seconds to stay local-only after the daemon was unreachable
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.autostart = autostart
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._unavailable_until = 0.0
+        self._idle: List[Tuple[socket.socket, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether the daemon is currently believed to be reachable."""
+        return time.monotonic() >= self._unavailable_until
+
+    def _connect(self, timeout: Optional[float] = None) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout or self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _start_daemon(self) -> None:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--socket", self.socket_path],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + 3.0
+        while time.monotonic() < deadline:
+            try:
+                self._connect().close()
+                return
+            except OSError:
+                time.sleep(0.05)
+
+    def _checkout(self, timeout: Optional[float]) -> Tuple[Tuple[socket.socket, Any], bool]:
+        """An idle connection, or a new one; and whether it was reused."""
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is not None:
+            connection[0].settimeout(timeout or self.timeout)
+            return connection, True
+        try:
+            sock = self._connect(timeout)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not self.autostart:
+                raise
+            self._start_daemon()
+            sock = self._connect(timeout)
+        return (sock, sock.makefile("rb")), False
+
+    def _checkin(self, connection: Tuple[socket.socket, Any]) -> None:
+        with self._lock:
+            if len(self._idle) < MAX_IDLE_CONNECTIONS:
+                self._idle.append(connection)
+                return
+        self._discard(connection)
+
+    @staticmethod
+    def _discard(connection: Tuple[socket.socket, Any]) -> None:
+        connection[1].close()
+        connection[0].close()
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._discard(connection)
+
+    def request(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send one request to the daemon.
+
+        Args:
+            message: Request with an ``op`` field
+            timeout: Socket timeout for this request. Defaults to the client timeout.
+
+        Returns:
+            Optional[Dict[str, Any]]: Response, or None if the daemon is unavailable
+        """
+        if not self.available:
+            return None
+        try:
+            while True:
+                connection, reused = self._checkout(timeout)
+                try:
+                    connection[0].sendall(json.dumps(message).encode() + b"\n")
+                    line = connection[1].readline(MAX_MESSAGE_BYTES)
+                    if not line.endswith(b"\n"):
+                        raise ConnectionError("Shared cache daemon closed the connection")
+                except TimeoutError:
+                    # The daemon is slow, not gone: trying again would double the wait
+                    self._discard(connection)
+                    raise
+                except OSError:
+                    self._discard(connection)
+                    if reused:
+                        # The daemon may have restarted since the connection was opened
+                        continue
+                    raise
+                self._checkin(connection)
+                break
+            response = json.loads(line)
+        except (OSError, ValueError):
+            self._unavailable_until = time.monotonic() + self.retry_interval
+            return None
+        if "error" in response:
+            return None
+        return response
+
+    def single_flight(self, key: str, fetch: Callable[[], Any], max_age: float,
+                      lease: float = 30.0) -> Tuple[Any, float, bool]:
+        """
+        Get a snapshot, fetching it at most once across all attached processes.
+
+        Args:
+            key: Snapshot key
+            fetch: Function performing the upstream call
+            max_age: Maximum acceptable snapshot age in seconds
+            lease: Seconds other processes wait for this one before taking over
+
+        Returns:
+            Tuple[Any, float, bool]: Value, epoch seconds it was stored, and whether
+                this process fetched it
+        """
+        response = self.request({"op": "acquire", "key": key, "max_age": max_age, "lease": lease},
+                                timeout=lease + self.timeout)
+        if response is not None and response.get("found"):
+            return response["value"], response["stored_at"], False
+
+        try:
+            value = fetch()
+        except Exception:
+            if response is not None:
+                self.request({"op": "release", "key": key})
+            raise
+        stored_at = time.time()
+        if response is not None:
+            if isinstance(value, dict) and "stale" in value:
+                # A stale fallback is not a new snapshot; let another process try
+                self.request({"op": "release", "key": key})
+            else:
+                self.request({"op": "put", "key": key, "value": value, "stored_at": stored_at})
+        return value, stored_at, True
+
+    def record_quota(self, keys: Any, spent: int = 0) -> None:
+        """
+        Report per-key quota usage and the cost of an upstream call to the global ledger.
+
+        Args:
+            keys: Per-key usage as returned by ApiKeyPool.usage()
+            spent: Quota spent by the call
+        """
+        self.request({"op": "record_quota", "keys": keys, "spent": spent})
+
+    def ledger(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the global quota ledger.
+
+        Returns:
+            Optional[Dict[str, Any]]: Ledger, or None if the daemon is unavailable
+        """
+        response = self.request({"op": "ledger"})
+        return response["ledger"] if response else None
+
+
+def main():
+    """Run the shared cache daemon as a standalone process."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Wagyu Sports shared cache daemon")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path to listen on")
+    parser.add_argument("--max-age", type=float, default=3600.0, help="Seconds to keep snapshots (default: 3600)")
+    parser.add_argument("--idle-timeout", type=float, default=600.0,
+                        help="Exit after this many seconds without clients (default: 600)")
+    args = parser.parse_args()
+
+    daemon = CacheDaemon(args.socket, max_age=args.max_age, idle_timeout=args.idle_timeout)
+    asyncio.run(daemon.serve())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Capture Log Module
+
+This module provides an append-only log of captured API responses, for
+recording live traffic and replaying it later.
+
+Log layout (one directory)::
+
+    capture.lock                 serializes appends across processes
+    segment-000001.ndjson.gz     one gzip member per record
+    segment-000001.index         fixed-width (offset, length, captured_at) per record
+    segment-000002.ndjson.gz     ...
+
+Each record is one JSON line shaped like a capture file
+(``{"_metadata": {...}, "data": ...}``) and compressed on its own, so a
+record is read with one positioned read of the length given by the index.
+The members still form a valid gzip stream, so ``zcat`` prints a segment as
+NDJSON.
+
+An append writes the record and then its index entry, so readers never see
+an index entry for a partial record. When a segment reaches its size limit
+the next one is created with ``O_EXCL`` while holding the lock, so concurrent
+writers agree on the segment they append to. The lock is ``flock`` on POSIX
+and ``msvcrt.locking`` on Windows.
+"""
+import os
+import json
+import time
+import gzip
+import bisect
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Segment size after which appends move on to a new segment
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Index entry: byte offset, compressed length, epoch seconds captured
+INDEX_ENTRY = struct.Struct("<QId")
+
+_SEGMENT_GLOB = "segment-*.ndjson.gz"
+
+
+def _segment_paths(path: Path, segment: int) -> Tuple[Path, Path]:
+    return path / f"segment-{segment:06d}.ndjson.gz", path / f"segment-{segment:06d}.index"
+
+
+def _segment_numbers(path: Path) -> List[int]:
+    return sorted(int(data.name[len("segment-"):-len(".ndjson.gz")]) for data in path.glob(_SEGMENT_GLOB))
+
+
+def is_capture_log(path: Union[str, Path]) -> bool:
+    """Whether a path is a capture log directory."""
+    path = Path(path)
+    return path.is_dir() and (path / "capture.lock").exists()
+
+
+class CaptureLog:
+    """Appends captured responses to a capture log directory."""
+
+    def __init__(self, path: Union[str, Path], max_segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 compress_level: int = 6):
+        """
+        Open a capture log for appending, creating it if needed.
+
+        Args:
+            path: Log directory
+            max_segment_bytes: Compressed size after which a new segment is started
+            compress_level: gzip compression level, 1 (fastest) to 9 (smallest)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.compress_level = compress_level
+        self._lock = threading.Lock()
+        self._lock_fd = os.open(self.path / "capture.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        self._segment = 0
+        self._data_fd = self._index_fd = None
+        # Records in the segments before the open one
+        self._base = 0
+        with self._lock, self._locked():
+            numbers = _segment_numbers(self.path)
+            self._open_segment(numbers[-1] if numbers else 1)
+
+    @contextmanager
+    def _locked(self):
+        # Serializes appends with other processes writing to the same log
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            return
+        # msvcrt locks a byte range from the file position; LK_LOCK gives up after ten seconds
+        os.lseek(self._lock_fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(self._lock_fd, msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                continue
+        try:
+            yield
+        finally:
+            os.lseek(self._lock_fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._lock_fd, msvcrt.LK_UNLCK, 1)
+
+    def _open_segment(self, segment: int) -> None:
+        # Called with the lock held
+        for fd in (self._data_fd, self._index_fd):
+            if fd is not None:
+                os.close(fd)
+        data_path, index_path = _segment_paths(self.path, segment)
+        self._data_fd = os.open(data_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._index_fd = os.open(index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Drop a torn index entry left by an interrupted append
+        size = os.fstat(self._index_fd).st_size
+        if size % INDEX_ENTRY.size:
+            os.ftruncate(self._index_fd, size - size % INDEX_ENTRY.size)
+        self._base = sum(_index_records(_segment_paths(self.path, n)[1]) for n in range(1, segment))
+        self._segment = segment
+
+    def _advance(self) -> None:
+        # Follow segments started by other writers, then start one if the current one is full
+        segment = self._segment
+        while _segment_paths(self.path, segment + 1)[0].exists():
+            segment += 1
+        if segment != self._segment:
+            self._open_segment(segment)
+        if os.fstat(self._data_fd).st_size >= self.max_segment_bytes:
+            data_path, _ = _segment_paths(self.path, self._segment + 1)
+            try:
+                os.close(os.open(data_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644))
+            except FileExistsError:
+                pass
+            self._open_segment(self._segment + 1)
+
+    def append(self, kind: str, data: Any, parameters: Optional[Dict[str, Any]] = None,
+               captured_at: Optional[float] = None) -> int:
+        """
+        Append a captured response.
+
+        Args:
+            kind: What was captured, e.g. the client method ('get_odds')
+            data: Captured response
+            parameters: Arguments of the call that produced it
+            captured_at: Epoch seconds of the capture. Defaults to now.
+
+        Returns:
+            int: Record number in the log, counting from 0
+        """
+        captured_at = time.time() if captured_at is None else captured_at
+        record = {
+            "_metadata": {
+                "captured_at": datetime.fromtimestamp(captured_at, tz=timezone.utc).isoformat(),
+                "method": kind,
+                "parameters": parameters or {},
+            },
+            "data": data,
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n"
+        blob = gzip.compress(line, compresslevel=self.compress_level, mtime=0)
+        with self._lock, self._locked():
+            self._advance()
+            offset = os.fstat(self._data_fd).st_size
+            os.write(self._data_fd, blob)
+            number = self._base + os.fstat(self._index_fd).st_size // INDEX_ENTRY.size
+            os.write(self._index_fd, INDEX_ENTRY.pack(offset, len(blob), captured_at))
+        return number
+
+    def close(self) -> None:
+        """Close the open segment."""
+        with self._lock:
+            for fd in (self._data_fd, self._index_fd, self._lock_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._data_fd = self._index_fd = self._lock_fd = None
+
+    def __enter__(self) -> "CaptureLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _index_records(index_path: Path) -> int:
+    try:
+        return index_path.stat().st_size // INDEX_ENTRY.size
+    except FileNotFoundError:
+        return 0
+
+
+class CaptureReader:
+    """Reads records from a capture log directory."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a capture log for reading.
+
+        Args:
+            path: Log directory
+        """
+        self.path = Path(path)
+        if not self.path.is_dir():
+            raise FileNotFoundError(f"No capture log at {self.path}")
+        # Per record: segment, offset, length; kept in append order
+        self._entries: List[Tuple[int, int, int]] = []
+        self._times: List[float] = []
+        self._files: Dict[int, Any] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Pick up records appended since the log was opened."""
+        known = self._entries[-1][0] if self._entries else 0
+        counts: Dict[int, int] = {}
+        for segment, _, _ in self._entries:
+            counts[segment] = counts.get(segment, 0) + 1
+        for segment in _segment_numbers(self.path):
+            if segment < known:
+                continue
+            try:
+                with open(_segment_paths(self.path, segment)[1], "rb") as f:
+                    f.seek(counts.get(segment, 0) * INDEX_ENTRY.size)
+                    raw = f.read()
+            except FileNotFoundError:
+                # A segment being started by a writer
+                continue
+            for offset, length, captured_at in INDEX_ENTRY.iter_unpack(raw[:len(raw) - len(raw) % INDEX_ENTRY.size]):
+                self._entries.append((segment, offset, length))
+                self._times.append(captured_at)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def captured_at(self, number: int) -> float:
+        """Epoch seconds record ``number`` was captured, from the index."""
+        return self._times[number]
+
+    def read(self, number: int) -> Dict[str, Any]:
+        """
+        Read one record.
+
+        Args:
+            number: Record number, counting from 0
+
+        Returns:
+            Dict[str, Any]: The record, with ``_metadata`` and ``data``
+        """
+        segment, offset, length = self._entries[number]
+        if segment not in self._files:
+            self._files[segment] = open(_segment_paths(self.path, segment)[0], "rb")
+        f = self._files[segment]
+        # os.pread would skip the seek, but it does not exist on Windows
+        f.seek(offset)
+        return json.loads(gzip.decompress(f.read(length)))
+
+    def seek(self, at: float) -> int:
+        """
+        Find the first record captured at or after a time.
+
+        Records are in append order, which is capture order unless writers
+        passed their own ``captured_at``.
+
+        Args:
+            at: Epoch seconds
+
+        Returns:
+            int: Record number, or len(self) if every record is older
+        """
+        return bisect.bisect_left(self._times, at)
+
+    def records(self, since: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over records in append order.
+
+        Args:
+            since: Only records captured at or after this epoch time
+
+        Returns:
+            Iterator[Dict[str, Any]]: Records
+        """
+        for number in range(0 if since is None else self.seek(since), len(self)):
+            yield self.read(number)
+
+    def close(self) -> None:
+        """Close open segment files."""
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self) -> "CaptureReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Wagyu Sports ESPN Client
+
+This module provides an async client for ESPN's public site API (scoreboard,
+game summary and team endpoints, see old/espn_nonbetting_api) with per-endpoint
+caching, and a join index that links ESPN game IDs to Odds API event IDs by
+teams and start time. Each odds event is matched once; later lookups are a
+dictionary hit.
+"""
+import re
+import time
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from zoneinfo import ZoneInfo
+
+import httpx
+
+ESPN_BASE_URL = "https://site.api.espn.com/apis/site/v2/sports"
+
+# Odds API sport key -> ESPN sport/league path
+ESPN_SPORTS = {
+    "americanfootball_nfl": "football/nfl",
+    "americanfootball_ncaaf": "football/college-football",
+    "baseball_mlb": "baseball/mlb",
+    "basketball_nba": "basketball/nba",
+    "basketball_ncaab": "basketball/mens-college-basketball",
+    "basketball_wnba": "basketball/wnba",
+    "icehockey_nhl": "hockey/nhl",
+    "soccer_epl": "soccer/eng.1",
+    "soccer_usa_mls": "soccer/usa.1",
+}
+
+# Seconds each endpoint is served from cache
+DEFAULT_TTLS = {"scoreboard": 15.0, "summary": 30.0, "teams": 86400.0}
+
+# ESPN files games under their US Eastern date (EST or EDT)
+_ESPN_TIMEZONE = ZoneInfo("America/New_York")
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def normalize_team(name: str) -> str:
+    """
+    Normalize a team name for matching across providers.
+
+    Args:
+        name: Team name (e.g., 'St. Louis Blues')
+
+    Returns:
+        str: Lowercase name with punctuation removed (e.g., 'st louis blues')
+    """
+    return " ".join(re.sub(r"[^a-z0-9 ]", " ", name.lower()).split())
+
+
+def parse_scoreboard(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Flatten an ESPN scoreboard response into one dict per game.
+
+    Args:
+        data: Scoreboard JSON
+
+    Returns:
+        List[Dict[str, Any]]: Games with teams, scores, start time and status
+    """
+    games = []
+    for event in data.get("events", []):
+        competition = (event.get("competitions") or [{}])[0]
+        teams = {c.get("homeAway"): c for c in competition.get("competitors", [])}
+        if "home" not in teams or "away" not in teams:
+            continue
+        status = competition.get("status") or event.get("status") or {}
+        status_type = status.get("type", {})
+        games.append({
+            "id": str(event["id"]),
+            "name": event.get("name"),
+            "start": _parse_time(event.get("date")),
+            "home_team": teams["home"]["team"].get("displayName"),
+            "away_team": teams["away"]["team"].get("displayName"),
+            "home_score": teams["home"].get("score"),
+            "away_score": teams["away"].get("score"),
+            "status": {
+                "state": status_type.get("state"),
+                "completed": status_type.get("completed", False),
+                "detail": status_type.get("shortDetail") or status_type.get("detail"),
+                "period": status.get("period"),
+                "clock": status.get("displayClock"),
+            },
+        })
+    return games
+
+
+class EspnClient:
+    """Async client for the ESPN site API with per-endpoint caching."""
+
+    def __init__(self, base_url: str = ESPN_BASE_URL, ttls: Optional[Dict[str, float]] = None,
+                 timeout: float = 10.0, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: API root, overridable for a local stand-in
+            ttls: Cache lifetime in seconds per endpoint ('scoreboard', 'summary', 'teams')
+            timeout: Request timeout in seconds
+            transport: httpx transport, e.g. httpx.MockTransport in tests
+            clock: Time source for cache expiry
+        """
+        self.base_url = base_url.rstrip("/")
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.timeout = timeout
+        self.transport = transport
+        self.clock = clock
+        self._http: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.stats = {"requests": 0, "hits": 0}
+
+    async def _get(self, endpoint: str, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key)
+        if cached is not None and self.clock() - cached[0] <= self.ttls[endpoint]:
+            self.stats["hits"] += 1
+            return cached[1]
+        if key in self._inflight:
+            # Share a request already on its way
+            self.stats["hits"] += 1
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self._http is None:
+                self._http = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, transport=self.transport)
+            self.stats["requests"] += 1
+            response = await self._http.get(path, params=params)
+            response.raise_for_status()
+            data = response.json()
+            self._cache[key] = (self.clock(), data)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved for the case nobody waits
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    @staticmethod
+    def _league(sport: str) -> str:
+        if sport not in ESPN_SPORTS:
+            raise ValueError(f"No ESPN league known for sport '{sport}'")
+        return ESPN_SPORTS[sport]
+
+    async def get_scoreboard(self, sport: str, date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get the games on a day's scoreboard.
+
+        Args:
+            sport: Odds API sport key (e.g., 'basketball_nba')
+            date: Day as YYYYMMDD. Defaults to ESPN's current day.
+
+        Returns:
+            List[Dict[str, Any]]: Games as returned by parse_scoreboard()
+        """
+        params = {"dates": date} if date else None
+        return parse_scoreboard(await self._get("scoreboard", f"/{self._league(sport)}/scoreboard", params))
+
+    async def get_summary(self, sport: str, game_id: str) -> Dict[str, Any]:
+        """
+        Get ESPN's full game summary (box score, plays, leaders).
+
+        Args:
+            sport: Odds API sport key
+            game_id: ESPN game ID
+
+        Returns:
+            Dict[str, Any]: Summary JSON
+        """
+        return await self._get("summary", f"/{self._league(sport)}/summary", {"event": game_id})
+
+    async def get_teams(self, sport: str) -> Dict[str, Any]:
+        """
+        Get all teams of a league.
+
+        Args:
+            sport: Odds API sport key
+
+        Returns:
+            Dict[str, Any]: Teams JSON
+        """
+        return await self._get("teams", f"/{self._league(sport)}/teams")
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def espn_dates(events: List[Dict[str, Any]]) -> List[str]:
+    """
+    Get the ESPN scoreboard days covering a list of odds events.
+
+    Args:
+        events: Odds API events with ``commence_time``
+
+    Returns:
+        List[str]: Sorted YYYYMMDD days
+    """
+    days = set()
+    for event in events:
+        start = _parse_time(event.get("commence_time"))
+        if start is not None:
+            day = datetime.fromtimestamp(start, tz=_ESPN_TIMEZONE)
+            days.add(day.strftime("%Y%m%d"))
+    return sorted(days)
+
+
+class GameJoinIndex:
+    """
+    Links Odds API events to ESPN games.
+
+    Games are indexed by normalized full team names and by nicknames (the last
+    word, e.g. 'clippers' for both 'LA Clippers' and 'Los Angeles Clippers').
+    A match also needs start times within ``tolerance`` seconds. Results,
+    including misses, are remembered until new games are added.
+
+    Games that started more than ``tolerance`` seconds ago can no longer match
+    a listed event, so adding games evicts them, and the links to them, unless
+    they are still in progress.
+    """
+
+    def __init__(self, tolerance: float = 3 * 3600.0, clock: Callable[[], float] = time.time):
+        """
+        Initialize the index.
+
+        Args:
+            tolerance: Largest start time difference in seconds for a match
+            clock: Time source returning epoch seconds
+        """
+        self.tolerance = tolerance
+        self.clock = clock
+        self.games: Dict[str, Dict[str, Any]] = {}
+        self._by_teams: Dict[Tuple[str, str, str], List[str]] = {}
+        self._links: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _keys(sport: str, home: str, away: str) -> List[Tuple[str, str, str]]:
+        home, away = normalize_team(home), normalize_team(away)
+        keys = [(sport, home, away)]
+        nicknames = (sport, home.rsplit(" ", 1)[-1], away.rsplit(" ", 1)[-1])
+        if nicknames != keys[0]:
+            keys.append(nicknames)
+        return keys
+
+    def add_games(self, sport: str, games: List[Dict[str, Any]]) -> None:
+        """
+        Add or refresh ESPN games.
+
+        Args:
+            sport: Odds API sport key the games belong to
+            games: Games as returned by parse_scoreboard()
+        """
+        added = False
+        for game in games:
+            if game["id"] not in self.games:
+                added = True
+                for key in self._keys(sport, game["home_team"], game["away_team"]):
+                    self._by_teams.setdefault(key, []).append(game["id"])
+            self.games[game["id"]] = game
+        self._evict({game["id"] for game in games})
+        if added:
+            # Previously unmatched events may match a new game
+            self._links = {event_id: game_id for event_id, game_id in self._links.items() if game_id}
+
+    def _evict(self, current: set) -> None:
+        # Games of a scoreboard just fetched are kept; a scoreboard only lists its own day
+        cutoff = self.clock() - self.tolerance
+        stale = {game_id for game_id, game in self.games.items()
+                 if game_id not in current and (game["start"] is None or game["start"] < cutoff)
+                 and (game.get("status") or {}).get("state") != "in"}
+        if not stale:
+            return
+        for game_id in stale:
+            del self.games[game_id]
+        for key in list(self._by_teams):
+            kept = [game_id for game_id in self._by_teams[key] if game_id not in stale]
+            if kept:
+                self._by_teams[key] = kept
+            else:
+                del self._by_teams[key]
+        self._links = {event_id: game_id for event_id, game_id in self._links.items() if game_id not in stale}
+
+    def lookup(self, sport: str, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the ESPN game for an odds event.
+
+        Args:
+            sport: Odds API sport key
+            event: Odds API event with teams and ``commence_time``
+
+        Returns:
+            Optional[Dict[str, Any]]: Latest known ESPN game, or None
+        """
+        if event["id"] not in self._links:
+            self._links[event["id"]] = self._match(sport, event)
+        game_id = self._links[event["id"]]
+        return self.games[game_id] if game_id else None
+
+    def _match(self, sport: str, event: Dict[str, Any]) -> Optional[str]:
+        start = _parse_time(event.get("commence_time"))
+        for key in self._keys(sport, event["home_team"], event["away_team"]):
+            best, best_gap = None, self.tolerance
+            for game_id in self._by_teams.get(key, []):
+                game_start = self.games[game_id]["start"]
+                if start is None or game_start is None:
+                    # Without both start times, a stale game could pass for this one
+                    continue
+                gap = abs(game_start - start)
+                if gap <= best_gap:
+                    best, best_gap = game_id, gap
+            if best is not None:
+                return best
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get index size.
+
+        Returns:
+            Dict[str, int]: Games indexed and events linked or known to be unmatched
+        """
+        linked = sum(1 for game_id in self._links.values() if game_id)
+        return {"games": len(self.games), "linked": linked, "unmatched": len(self._links) - linked}
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Game Lines Module
+
+This module reduces the book-by-book odds of a game to one summary line,
+e.g. "Los Angeles Lakers -4.5, O/U 224.5, Los Angeles Lakers ML -190".
+
+Summaries are computed when odds are ingested, from the merged odds board
+restricted to the bookmakers of the snapshot's regions, and kept per region
+set and event:
+
+- spread and total: the main point is the one offered by the most books
+  (ties go to the point closest to the median), priced at the median
+  across the books offering it
+- moneyline: the median price of each outcome, plus the best price and the
+  book offering it
+- per book: each book's own spread, total and moneyline, used when a
+  preferred book is asked for
+
+Prices are stored as decimal odds and converted on output.
+"""
+import threading
+from collections import Counter
+from statistics import median
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    # When imported as a package
+    from .odds_format import convert_price
+    from .odds_projection import split_csv, join_csv, project_events
+except ImportError:
+    # When run directly
+    from odds_format import convert_price
+    from odds_projection import split_csv, join_csv, project_events
+
+# Markets a summary is built from
+SUMMARY_MARKETS = "h2h,spreads,totals"
+
+
+def _main_point(quotes: List[Tuple[float, Any]]) -> Tuple[float, List[Any]]:
+    """Pick the point most books offer and return it with the quotes at that point."""
+    counts = Counter(point for point, _ in quotes)
+    middle = median(point for point, _ in quotes)
+    main = max(counts, key=lambda point: (counts[point], -abs(point - middle)))
+    return main, [quote for point, quote in quotes if point == main]
+
+
+def _book_lines(event: Dict[str, Any], bookmaker: Dict[str, Any]) -> Dict[str, Any]:
+    """One book's spread, total and moneyline for an event."""
+    lines: Dict[str, Any] = {}
+    for market in bookmaker.get("markets", []):
+        outcomes = {outcome["name"]: outcome for outcome in market.get("outcomes", [])}
+        if market["key"] == "h2h":
+            lines["moneyline"] = {name: outcome["price"] for name, outcome in outcomes.items()}
+        elif market["key"] == "spreads" and event["home_team"] in outcomes and event["away_team"] in outcomes:
+            home, away = outcomes[event["home_team"]], outcomes[event["away_team"]]
+            if home.get("point") is not None:
+                lines["spread"] = {"home_point": home["point"], "home_price": home["price"],
+                                   "away_price": away["price"]}
+        elif market["key"] == "totals" and "Over" in outcomes and "Under" in outcomes:
+            if outcomes["Over"].get("point") is not None:
+                lines["total"] = {"point": outcomes["Over"]["point"], "over": outcomes["Over"]["price"],
+                                  "under": outcomes["Under"]["price"]}
+    return lines
+
+
+def summarize_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Summarize an event's odds across books.
+
+    Args:
+        event (Dict[str, Any]): Event in the /odds shape with decimal prices
+
+    Returns:
+        Dict[str, Any]: Event identity, ``consensus`` lines and per-book ``books`` lines
+    """
+    books = {bookmaker["key"]: _book_lines(event, bookmaker) for bookmaker in event.get("bookmakers", [])}
+    books = {key: lines for key, lines in books.items() if lines}
+    consensus: Dict[str, Any] = {}
+
+    spreads = [(lines["spread"]["home_point"], lines["spread"]) for lines in books.values() if "spread" in lines]
+    if spreads:
+        point, quotes = _main_point(spreads)
+        consensus["spread"] = {"home_point": point,
+                               "home_price": median(quote["home_price"] for quote in quotes),
+                               "away_price": median(quote["away_price"] for quote in quotes),
+                               "books": len(quotes)}
+
+    totals = [(lines["total"]["point"], lines["total"]) for lines in books.values() if "total" in lines]
+    if totals:
+        point, quotes = _main_point(totals)
+        consensus["total"] = {"point": point,
+                              "over": median(quote["over"] for quote in quotes),
+                              "under": median(quote["under"] for quote in quotes),
+                              "books": len(quotes)}
+
+    prices: Dict[str, List[Tuple[float, str]]] = {}
+    for key, lines in books.items():
+        for name, price in lines.get("moneyline", {}).items():
+            prices.setdefault(name, []).append((price, key))
+    if prices:
+        consensus["moneyline"] = {name: median(price for price, _ in quotes) for name, quotes in prices.items()}
+        consensus["best_moneyline"] = {name: {"price": best[0], "book": best[1]}
+                                       for name, best in ((name, max(quotes)) for name, quotes in prices.items())}
+
+    return {
+        "event_id": event["id"],
+        "commence_time": event.get("commence_time"),
+        "home_team": event["home_team"],
+        "away_team": event["away_team"],
+        "consensus": consensus,
+        "books": books,
+    }
+
+
+def summarize_events(events: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Summarize the games among a list of events.
+
+    Args:
+        events (List[Dict[str, Any]]): Events in the /odds shape with decimal prices
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Summaries by event ID; outright events (without a home and
+            away team) are skipped
+    """
+    return {event["id"]: summarize_event(event) for event in events
+            if event.get("home_team") and event.get("away_team")}
+
+
+def _price_text(price: Any) -> str:
+    if isinstance(price, int) and price > 0:
+        return f"+{price}"
+    return str(price)
+
+
+def _point_text(point: float) -> str:
+    return "PK" if point == 0 else f"{point:+g}"
+
+
+def render_game(summary: Dict[str, Any], odds_format: str = "american",
+                bookmaker: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Render a summary as a compact game line.
+
+    Args:
+        summary (Dict[str, Any]): Summary from summarize_event
+        odds_format (str): Format of output prices
+        bookmaker (str, optional): Preferred book; its lines replace the consensus for
+            every market it offers
+
+    Returns:
+        Dict[str, Any]: Game with a one-line ``line`` text, the spread, total and
+            moneyline it was built from, and the ``source`` of each
+    """
+    home, away = summary["home_team"], summary["away_team"]
+    preferred = summary["books"].get(bookmaker, {}) if bookmaker else {}
+    consensus = summary["consensus"]
+    price = lambda value: convert_price(value, odds_format)
+    game = {"event_id": summary["event_id"], "commence_time": summary["commence_time"],
+            "home_team": home, "away_team": away}
+    parts = []
+
+    spread = preferred.get("spread") or consensus.get("spread")
+    if spread:
+        # Quote the favourite: the side giving points
+        if spread["home_point"] <= 0:
+            team, point, team_price = home, spread["home_point"], spread["home_price"]
+        else:
+            team, point, team_price = away, -spread["home_point"], spread["away_price"]
+        game["spread"] = {"team": team, "point": point, "price": price(team_price),
+                          "source": bookmaker if "spread" in preferred else "consensus"}
+        parts.append(f"{team} {_point_text(point)}")
+
+    total = preferred.get("total") or consensus.get("total")
+    if total:
+        game["total"] = {"point": total["point"], "over": price(total["over"]), "under": price(total["under"]),
+                         "source": bookmaker if "total" in preferred else "consensus"}
+        parts.append(f"O/U {total['point']:g}")
+
+    moneyline = preferred.get("moneyline") or consensus.get("moneyline")
+    if moneyline:
+        game["moneyline"] = {name: price(value) for name, value in moneyline.items()}
+        game["moneyline_source"] = bookmaker if "moneyline" in preferred else "consensus"
+        if "best_moneyline" in consensus:
+            game["best_moneyline"] = {name: {"price": price(best["price"]), "book": best["book"]}
+                                      for name, best in consensus["best_moneyline"].items()}
+        sides = {name: value for name, value in moneyline.items() if name in (home, away)}
+        if sides:
+            favourite = min(sides, key=sides.get)
+            parts.append(f"{favourite} ML {_price_text(game['moneyline'][favourite])}")
+
+    game["line"] = ", ".join(parts)
+    return game
+
+
+class GameLinesIndex:
+    """Game line summaries per sport, region set and event, refreshed at ingestion."""
+
+    def __init__(self):
+        # sport -> canonical regions (e.g. 'uk,us') -> event id -> summary
+        self._sports: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, sport: str, events: List[Dict[str, Any]], regions: Optional[str] = None) -> None:
+        """
+        Recompute the summaries of ingested events for the regions they were fetched for.
+
+        Args:
+            sport (str): Sport key
+            events (List[Dict[str, Any]]): Events with their merged odds (see OddsBoard)
+            regions (str, optional): Comma-separated regions of the snapshot. Only books of
+                these regions are summarized. None keeps every book.
+        """
+        keep = split_csv(regions)
+        if keep:
+            # The board also holds books merged from fetches for other regions
+            events = project_events(events, regions=keep)
+        summaries = summarize_events(events)
+        with self._lock:
+            self._sports.setdefault(sport, {}).setdefault(join_csv(keep), {}).update(summaries)
+
+    def remove(self, sport: str, event_ids: List[str]) -> None:
+        """
+        Forget the summaries of events evicted from the odds board.
+
+        Args:
+            sport (str): Sport key
+            event_ids (List[str]): Events to forget
+        """
+        with self._lock:
+            for known in self._sports.get(sport, {}).values():
+                for event_id in event_ids:
+                    known.pop(event_id, None)
+
+    def get(self, sport: str, event_ids: Optional[List[str]] = None,
+            regions: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get stored summaries.
+
+        Args:
+            sport (str): Sport key
+            event_ids (List[str], optional): Events to return, in this order. Defaults to all.
+            regions (str, optional): Comma-separated regions the summaries were computed for.
+                None reads summaries of snapshots ingested without regions.
+
+        Returns:
+            List[Dict[str, Any]]: Summaries; unknown events are skipped
+        """
+        with self._lock:
+            known = self._sports.get(sport, {}).get(join_csv(split_csv(regions)), {})
+            if event_ids is None:
+                return list(known.values())
+            return [known[event_id] for event_id in event_ids if event_id in known]
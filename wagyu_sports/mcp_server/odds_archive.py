@@ -0,0 +1,666 @@
+#!/usr/bin/env python3
+"""
+Wagyu Sports Odds Archive
+
+This module provides an append-only, columnar on-disk archive for /odds
+snapshots. Every priced outcome becomes one row spread over fixed-width
+column files (timestamps, prices, points and dictionary-encoded event, book,
+market and outcome IDs). Readers memory-map the columns, so weeks of history
+can be scanned for backtests and line-movement queries without parsing JSON
+or loading the archive into memory.
+
+Archive layout (one directory)::
+
+    manifest.json        committed row, snapshot and dictionary byte counts
+    dictionaries.ndjson  one line per append that added strings: the new entries of
+                         the ID -> string tables and the new event and bookmaker metadata
+    rows.<column>        one fixed-width file per row column
+    snapshots.<column>   one fixed-width file per snapshot column
+
+Column and dictionary files are appended first and the manifest is replaced
+last, so a reader never sees a partially written snapshot. An append only
+writes what is new, so its cost does not grow with the archive. Archives
+written before the dictionaries became append-only (``dictionaries.json``)
+are converted when a writer opens them.
+"""
+import os
+import sys
+import json
+import math
+import mmap
+import time
+import bisect
+import threading
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Set, Union, Callable
+
+FORMAT_VERSION = 2
+
+# Row columns: one entry per priced outcome
+ROW_COLUMNS = {
+    "fetched_at": "d",    # epoch seconds the snapshot was fetched
+    "last_update": "d",   # epoch seconds the book last updated the market
+    "event": "I",
+    "book": "I",
+    "market": "I",
+    "outcome": "I",
+    "description": "I",  # 0 when the outcome has no description
+    "price": "d",
+    "point": "d",         # NaN when the market has no point
+}
+
+# Snapshot columns: one entry per archived /odds response
+SNAPSHOT_COLUMNS = {
+    "fetched_at": "d",
+    "sport": "I",
+    "start": "Q",         # first row of the snapshot
+    "end": "Q",           # one past the last row of the snapshot
+}
+
+DICTIONARIES = ("sport", "event", "book", "market", "outcome", "description")
+
+_EVENT_FIELDS = ("sport_key", "sport_title", "commence_time", "home_team", "away_team")
+
+# Metadata keyed by event ID and bookmaker key, stored next to the ID tables
+_METADATA = ("event_meta", "book_titles")
+
+
+def _empty_dictionaries() -> Dict[str, Any]:
+    dictionaries: Dict[str, Any] = {name: [] for name in DICTIONARIES}
+    dictionaries.update({name: {} for name in _METADATA})
+    return dictionaries
+
+
+def _apply_delta(dictionaries: Dict[str, Any], ids: Dict[str, Dict[str, int]], delta: Dict[str, Any]) -> None:
+    """Add the entries of one dictionaries.ndjson line."""
+    for name in DICTIONARIES:
+        table = dictionaries[name]
+        for value in delta.get(name, ()):
+            ids[name][value] = len(table)
+            table.append(value)
+    for name in _METADATA:
+        dictionaries[name].update(delta.get(name, {}))
+
+
+def _read_dictionaries(path: Path, manifest: Dict[str, Any], dictionaries: Dict[str, Any],
+                       ids: Dict[str, Dict[str, int]], offset: int) -> int:
+    """
+    Apply the committed dictionary lines from ``offset`` on.
+
+    Returns:
+        int: Offset of the end of the committed lines
+    """
+    if "dictionary_bytes" not in manifest:
+        # Written before the dictionaries became append-only
+        with open(path / "dictionaries.json") as f:
+            _apply_delta(dictionaries, ids, json.load(f))
+        return 0
+    end = manifest["dictionary_bytes"]
+    if end > offset:
+        with open(path / "dictionaries.ndjson", "rb") as f:
+            f.seek(offset)
+            for line in f.read(end - offset).splitlines():
+                _apply_delta(dictionaries, ids, json.loads(line))
+    return end
+
+
+def parse_timestamp(value: Union[str, float, int, None]) -> float:
+    """
+    Convert an ISO 8601 timestamp (as sent by the Odds API) to epoch seconds.
+
+    Args:
+        value: ISO string, epoch seconds, or None
+
+    Returns:
+        float: Epoch seconds, or NaN for None
+    """
+    if value is None:
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def _write_json(path: Path, data: Any) -> None:
+    # Write then rename so readers see either the old or the new file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ArchiveWriter:
+    """Appends /odds snapshots to an archive directory."""
+
+    def __init__(self, path: Union[str, Path], clock: Callable[[], float] = time.time):
+        """
+        Open an archive for appending, creating it if needed.
+
+        Args:
+            path: Archive directory
+            clock: Time source stamping snapshots appended without a fetch time
+        """
+        self.path = Path(path)
+        self.clock = clock
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        manifest_path = self.path / "manifest.json"
+        if manifest_path.exists():
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+            if self.manifest["byteorder"] != sys.byteorder:
+                raise ValueError(f"Archive {self.path} was written on a {self.manifest['byteorder']}-endian host")
+        else:
+            self.manifest = {"version": FORMAT_VERSION, "byteorder": sys.byteorder, "rows": 0, "snapshots": 0,
+                             "dictionary_bytes": 0}
+        self.dictionaries = _empty_dictionaries()
+        self._ids: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARIES}
+        committed = _read_dictionaries(self.path, self.manifest, self.dictionaries, self._ids, 0)
+        # Entries not yet written to dictionaries.ndjson
+        self._written = {name: 0 for name in DICTIONARIES}
+        self._new_metadata: Dict[str, Dict[str, Any]] = {name: {} for name in _METADATA}
+        if "dictionary_bytes" not in self.manifest:
+            # The first append writes the old dictionaries out as the first line
+            self._new_metadata = {name: dict(self.dictionaries[name]) for name in _METADATA}
+            self.manifest["dictionary_bytes"] = 0
+        else:
+            self._written = {name: len(self.dictionaries[name]) for name in DICTIONARIES}
+        if not self.dictionaries["description"]:
+            self._encode("description", "")
+
+        # Drop anything past the last committed snapshot (an interrupted append)
+        self._truncate("rows", ROW_COLUMNS, self.manifest["rows"])
+        self._truncate("snapshots", SNAPSHOT_COLUMNS, self.manifest["snapshots"])
+        with open(self.path / "dictionaries.ndjson", "ab") as f:
+            f.truncate(committed)
+
+    def _truncate(self, table: str, columns: Dict[str, str], count: int) -> None:
+        for name, typecode in columns.items():
+            column_path = self.path / f"{table}.{name}"
+            with open(column_path, "ab") as f:
+                f.truncate(count * array(typecode).itemsize)
+
+    def _encode(self, dictionary: str, value: str) -> int:
+        ids = self._ids[dictionary]
+        if value not in ids:
+            ids[value] = len(self.dictionaries[dictionary])
+            self.dictionaries[dictionary].append(value)
+        return ids[value]
+
+    def append(self, sport: str, events: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> int:
+        """
+        Append one /odds snapshot.
+
+        Args:
+            sport: Sport key the snapshot was requested for
+            events: Events from the /odds response
+            fetched_at: Epoch seconds the snapshot was fetched. Defaults to the writer's
+                clock, read under the writer lock so concurrent appends stay in order.
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            ValueError: If the snapshot is older than the last archived one
+        """
+        return self._append(sport, events, fetched_at)[0]
+
+    def _append(self, sport: str, events: List[Dict[str, Any]],
+                fetched_at: Optional[float]) -> Tuple[int, float]:
+        with self._lock:
+            if fetched_at is None:
+                fetched_at = self.clock()
+            # Readers bisect the time columns, so snapshots must arrive in fetch order
+            if fetched_at < self.manifest.get("last_fetched_at", -math.inf):
+                raise ValueError(f"Snapshot fetched at {fetched_at} is older than the last archived snapshot")
+            columns = {name: array(typecode) for name, typecode in ROW_COLUMNS.items()}
+            meta = self.dictionaries["event_meta"]
+            titles = self.dictionaries["book_titles"]
+            for event in events:
+                event_id = self._encode("event", event["id"])
+                if event["id"] not in meta:
+                    meta[event["id"]] = self._new_metadata["event_meta"][event["id"]] = {
+                        field: event.get(field) for field in _EVENT_FIELDS
+                    }
+                for bookmaker in event.get("bookmakers", []):
+                    book_id = self._encode("book", bookmaker["key"])
+                    if bookmaker["key"] not in titles:
+                        titles[bookmaker["key"]] = self._new_metadata["book_titles"][bookmaker["key"]] = \
+                            bookmaker.get("title")
+                    for market in bookmaker.get("markets", []):
+                        market_id = self._encode("market", market["key"])
+                        last_update = parse_timestamp(market.get("last_update") or bookmaker.get("last_update"))
+                        for outcome in market.get("outcomes", []):
+                            columns["fetched_at"].append(fetched_at)
+                            columns["last_update"].append(last_update)
+                            columns["event"].append(event_id)
+                            columns["book"].append(book_id)
+                            columns["market"].append(market_id)
+                            columns["outcome"].append(self._encode("outcome", outcome["name"]))
+                            columns["description"].append(self._encode("description", outcome.get("description") or ""))
+                            columns["price"].append(float(outcome["price"]))
+                            point = outcome.get("point")
+                            columns["point"].append(math.nan if point is None else float(point))
+
+            start = self.manifest["rows"]
+            count = len(columns["price"])
+            snapshot = {
+                "fetched_at": array("d", [fetched_at]),
+                "sport": array("I", [self._encode("sport", sport)]),
+                "start": array("Q", [start]),
+                "end": array("Q", [start + count]),
+            }
+            for table, values in (("rows", columns), ("snapshots", snapshot)):
+                for name, column in values.items():
+                    with open(self.path / f"{table}.{name}", "ab") as f:
+                        column.tofile(f)
+                        f.flush()
+                        os.fsync(f.fileno())
+
+            # Commit: new dictionary entries first, then the counts that make the rows visible
+            dictionary_bytes = self.manifest["dictionary_bytes"] + self._write_dictionary_delta()
+            self.manifest.update(version=FORMAT_VERSION, rows=start + count, dictionary_bytes=dictionary_bytes,
+                                 snapshots=self.manifest["snapshots"] + 1, last_fetched_at=fetched_at)
+            _write_json(self.path / "manifest.json", self.manifest)
+            self._written = {name: len(self.dictionaries[name]) for name in DICTIONARIES}
+            self._new_metadata = {name: {} for name in _METADATA}
+            return count, fetched_at
+
+    def _write_dictionary_delta(self) -> int:
+        """Append the dictionary entries added since the last commit; returns the bytes written."""
+        delta = {name: self.dictionaries[name][self._written[name]:] for name in DICTIONARIES}
+        delta.update(self._new_metadata)
+        delta = {name: entries for name, entries in delta.items() if entries}
+        if not delta:
+            return 0
+        line = json.dumps(delta).encode() + b"\n"
+        with open(self.path / "dictionaries.ndjson", "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(line)
+
+    def append_response(self, sport: str, response: Dict[str, Any], fetched_at: Optional[float] = None) -> float:
+        """
+        Append an OddsClient.get_odds response, ignoring error responses.
+
+        Args:
+            sport: Sport key
+            response: Response with a ``data`` list of events
+            fetched_at: Epoch seconds the response was fetched. Defaults to the writer's
+                clock, read under the writer lock (see append()).
+
+        Returns:
+            float: Fetch time the snapshot was archived with
+        """
+        data = response.get("data")
+        if not isinstance(data, list):
+            return self.clock() if fetched_at is None else fetched_at
+        return self._append(sport, data, fetched_at)[1]
+
+
+class _Table:
+    """Memory-mapped, read-only view of a set of column files."""
+
+    def __init__(self, path: Path, table: str, columns: Dict[str, str], count: int):
+        self.count = count
+        self.columns: Dict[str, Any] = {}
+        self._maps = []
+        for name, typecode in columns.items():
+            size = count * array(typecode).itemsize
+            if size == 0:
+                self.columns[name] = memoryview(array(typecode))
+                continue
+            with open(path / f"{table}.{name}", "rb") as f:
+                mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+            self._maps.append(mapped)
+            self.columns[name] = memoryview(mapped).cast(typecode)
+
+    def close(self) -> None:
+        for view in self.columns.values():
+            view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+
+class ArchiveReader:
+    """
+    Memory-mapped reader for an archive directory.
+
+    The reader sees the snapshots committed when it was opened; call
+    ``refresh()`` to pick up later appends.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open an archive for reading.
+
+        Args:
+            path: Archive directory
+        """
+        self.path = Path(path)
+        self.rows: Optional[_Table] = None
+        self.snapshots: Optional[_Table] = None
+        self.dictionaries = _empty_dictionaries()
+        self._ids: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARIES}
+        self._dictionary_bytes = 0
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Re-read the manifest and map any newly committed rows."""
+        with open(self.path / "manifest.json") as f:
+            manifest = json.load(f)
+        if manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"Archive {self.path} was written on a {manifest['byteorder']}-endian host")
+        if "dictionary_bytes" not in manifest or self._dictionary_bytes == 0:
+            # Nothing to build on (an archive that still has dictionaries.json is read whole)
+            self.dictionaries = _empty_dictionaries()
+            self._ids = {name: {} for name in DICTIONARIES}
+        # Only the lines committed since the last refresh are read
+        self._dictionary_bytes = _read_dictionaries(self.path, manifest, self.dictionaries, self._ids,
+                                                    self._dictionary_bytes)
+        self.close()
+        self.rows = _Table(self.path, "rows", ROW_COLUMNS, manifest["rows"])
+        self.snapshots = _Table(self.path, "snapshots", SNAPSHOT_COLUMNS, manifest["snapshots"])
+
+    def close(self) -> None:
+        """Unmap the column files."""
+        for table in (self.rows, self.snapshots):
+            if table is not None:
+                table.close()
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows.count
+
+    def column(self, name: str) -> memoryview:
+        """
+        Get a zero-copy view of a row column.
+
+        Args:
+            name: One of ROW_COLUMNS
+
+        Returns:
+            memoryview: Typed view over the mapped column
+        """
+        return self.rows.columns[name]
+
+    def decode(self, dictionary: str, value_id: int) -> str:
+        """Look up the string for a dictionary-encoded ID."""
+        return self.dictionaries[dictionary][value_id]
+
+    def encode(self, dictionary: str, value: str) -> Optional[int]:
+        """Look up the ID of a string, or None if it never appears in the archive."""
+        return self._ids[dictionary].get(value)
+
+    def list_snapshots(self, sport: Optional[str] = None) -> Iterator[Tuple[str, float, int]]:
+        """
+        Iterate over archived snapshots in the order they were written.
+
+        Args:
+            sport: Only yield snapshots of this sport key
+
+        Yields:
+            Tuple[str, float, int]: Sport key, fetch time and snapshot index
+        """
+        columns = self.snapshots.columns
+        sport_id = None if sport is None else self.encode("sport", sport)
+        if sport is not None and sport_id is None:
+            return
+        for i in range(self.snapshots.count):
+            if sport_id is None or columns["sport"][i] == sport_id:
+                yield self.decode("sport", columns["sport"][i]), columns["fetched_at"][i], i
+
+    def snapshot_at(self, sport: str, at: float) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild the latest snapshot of a sport fetched at or before a given time.
+
+        Args:
+            sport: Sport key
+            at: Epoch seconds
+
+        Returns:
+            Optional[Dict[str, Any]]: ``{"data": events, "fetched_at": epoch}`` in the
+                /odds response shape, or None if nothing was archived by then
+        """
+        sport_id = self.encode("sport", sport)
+        if sport_id is None:
+            return None
+        columns = self.snapshots.columns
+        # Snapshots are appended in fetch order, so the candidates end at the bisection point
+        last = bisect.bisect_right(columns["fetched_at"], at)
+        for i in range(last - 1, -1, -1):
+            if columns["sport"][i] == sport_id:
+                return self.snapshot(i)
+        return None
+
+    def snapshot(self, index: int) -> Dict[str, Any]:
+        """
+        Rebuild one snapshot from its own rows.
+
+        Args:
+            index: Snapshot index from list_snapshots()
+
+        Returns:
+            Dict[str, Any]: ``{"data": events, "fetched_at": epoch}`` in the /odds response shape
+        """
+        columns = self.snapshots.columns
+        return {"data": self._events(columns["start"][index], columns["end"][index]),
+                "fetched_at": columns["fetched_at"][index]}
+
+    def snapshot_contents(self, index: int) -> Tuple[Set[str], Set[str]]:
+        """
+        Get the bookmakers and markets of a snapshot from its row columns, without
+        rebuilding its events.
+
+        Args:
+            index: Snapshot index from list_snapshots()
+
+        Returns:
+            Tuple[Set[str], Set[str]]: Bookmaker keys and market keys present
+        """
+        start, end = self.snapshots.columns["start"][index], self.snapshots.columns["end"][index]
+        rows = self.rows.columns
+        return ({self.decode("book", book_id) for book_id in set(rows["book"][start:end])},
+                {self.decode("market", market_id) for market_id in set(rows["market"][start:end])})
+
+    def _events(self, start: int, end: int) -> List[Dict[str, Any]]:
+        rows = self.rows.columns
+        events: Dict[int, Dict[str, Any]] = {}
+        books: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        markets: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+        for i in range(start, end):
+            event_id, book_id, market_id = rows["event"][i], rows["book"][i], rows["market"][i]
+            event = events.get(event_id)
+            if event is None:
+                key = self.decode("event", event_id)
+                event = events[event_id] = dict({"id": key}, **self.dictionaries["event_meta"][key], bookmakers=[])
+            book = books.get((event_id, book_id))
+            if book is None:
+                key = self.decode("book", book_id)
+                book = books[event_id, book_id] = {"key": key, "title": self.dictionaries["book_titles"].get(key),
+                                                   "last_update": None, "markets": []}
+                event["bookmakers"].append(book)
+            market = markets.get((event_id, book_id, market_id))
+            if market is None:
+                market = markets[event_id, book_id, market_id] = {
+                    "key": self.decode("market", market_id),
+                    "last_update": _isoformat(rows["last_update"][i]),
+                    "outcomes": [],
+                }
+                book["markets"].append(market)
+                # A book's update time is that of its most recently updated market
+                if market["last_update"] and (book["last_update"] or "") < market["last_update"]:
+                    book["last_update"] = market["last_update"]
+            outcome = {"name": self.decode("outcome", rows["outcome"][i]), "price": rows["price"][i]}
+            if rows["description"][i]:
+                outcome["description"] = self.decode("description", rows["description"][i])
+            if not math.isnan(rows["point"][i]):
+                outcome["point"] = rows["point"][i]
+            market["outcomes"].append(outcome)
+        return list(events.values())
+
+    def line_history(self, event_id: str, market: str = "h2h", book: Optional[str] = None,
+                     outcome: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the price movement of an event's market across snapshots.
+
+        Only the snapshot time range and the encoded ID columns are scanned; no
+        JSON is parsed.
+
+        Args:
+            event_id: Odds API event ID
+            market: Market key
+            book: Only this bookmaker key
+            outcome: Only this outcome name
+            since: Earliest fetch time in epoch seconds
+            until: Latest fetch time in epoch seconds
+
+        Returns:
+            List[Dict[str, Any]]: One entry per archived price, oldest first
+        """
+        ids = [self.encode("event", event_id), self.encode("market", market)]
+        if book is not None:
+            ids.append(self.encode("book", book))
+        if outcome is not None:
+            ids.append(self.encode("outcome", outcome))
+        if None in ids:
+            return []
+        event_code, market_code = ids[0], ids[1]
+        book_code = ids[2] if book is not None else None
+        outcome_code = ids[-1] if outcome is not None else None
+
+        rows = self.rows.columns
+        fetched_at = rows["fetched_at"]
+        start = 0 if since is None else bisect.bisect_left(fetched_at, since)
+        end = self.rows.count if until is None else bisect.bisect_right(fetched_at, until)
+        events, markets, books, outcomes = rows["event"], rows["market"], rows["book"], rows["outcome"]
+
+        history = []
+        for i in range(start, end):
+            if events[i] != event_code or markets[i] != market_code:
+                continue
+            if book_code is not None and books[i] != book_code:
+                continue
+            if outcome_code is not None and outcomes[i] != outcome_code:
+                continue
+            entry = {
+                "fetched_at": fetched_at[i],
+                "book": self.decode("book", books[i]),
+                "outcome": self.decode("outcome", outcomes[i]),
+                "price": rows["price"][i],
+            }
+            if not math.isnan(rows["point"][i]):
+                entry["point"] = rows["point"][i]
+            history.append(entry)
+        return history
+
+
+def _isoformat(timestamp: float) -> Optional[str]:
+    if math.isnan(timestamp):
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def read_capture(capture_file: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Read an /odds capture written by capture_live_responses.py.
+
+    Args:
+        capture_file: JSON capture, optionally with ``_metadata``
+
+    Returns:
+        Optional[Dict[str, Any]]: ``sport``, ``fetched_at``, ``options`` and ``events``,
+            or None if the file holds no odds
+    """
+    with open(capture_file) as f:
+        capture = json.load(f)
+    return parse_capture(capture, lambda: os.path.getmtime(capture_file))
+
+
+def parse_capture(capture: Any, default_time: Callable[[], float]) -> Optional[Dict[str, Any]]:
+    """
+    Extract the odds of a capture file or capture log record.
+
+    Args:
+        capture: Parsed capture, optionally with ``_metadata``
+        default_time: Returns the fetch time when the capture does not record one
+
+    Returns:
+        Optional[Dict[str, Any]]: ``sport``, ``fetched_at``, ``options`` and ``events``,
+            or None if the capture holds no odds
+    """
+    if not isinstance(capture, dict):
+        return None
+    metadata = capture.get("_metadata", {})
+    data = capture.get("data")
+    if isinstance(data, dict):
+        # Captures wrap the full client response
+        data = data.get("data")
+    if not isinstance(data, list) or not data or "bookmakers" not in data[0]:
+        return None
+    parameters = metadata.get("parameters", {})
+    captured_at = metadata.get("captured_at")
+    return {
+        "sport": parameters.get("sport") or data[0].get("sport_key"),
+        "fetched_at": parse_timestamp(captured_at) if captured_at else default_time(),
+        # capture_live_responses.py nests the options; the mocks_live files list them flat
+        "options": parameters.get("options") or {
+            key: parameters[key] for key in ("regions", "markets", "bookmakers") if key in parameters
+        },
+        "events": data,
+    }
+
+
+def import_capture(writer: ArchiveWriter, capture_file: Union[str, Path]) -> int:
+    """
+    Append a JSON capture to an archive.
+
+    Args:
+        writer: Archive to append to
+        capture_file: Capture readable by read_capture()
+
+    Returns:
+        int: Number of rows written (0 if the file holds no odds)
+    """
+    capture = read_capture(capture_file)
+    if capture is None:
+        return 0
+    return writer.append(capture["sport"], capture["events"], capture["fetched_at"])
+
+
+def main():
+    """Import JSON captures into an archive or summarize one."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Wagyu Sports odds archive")
+    parser.add_argument("archive", help="Archive directory")
+    parser.add_argument("captures", nargs="*", help="JSON captures to append, oldest first")
+    args = parser.parse_args()
+
+    if args.captures:
+        writer = ArchiveWriter(args.archive)
+        for capture_file in args.captures:
+            print(f"{capture_file}: {import_capture(writer, capture_file)} rows")
+
+    with ArchiveReader(args.archive) as reader:
+        sports: Dict[str, int] = {}
+        for sport, _, _ in reader.list_snapshots():
+            sports[sport] = sports.get(sport, 0) + 1
+        print(f"{len(reader)} rows in {reader.snapshots.count} snapshots")
+        for sport, count in sorted(sports.items()):
+            print(f"  {sport}: {count} snapshots")
+
+if __name__ == "__main__":
+    main()
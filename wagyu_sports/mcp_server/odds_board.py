@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Odds Board Module
+
+This module keeps the latest known odds of every event, merged across
+snapshots. A snapshot only replaces the bookmaker markets it contains, so an
+h2h/us refresh does not erase spreads fetched earlier for the uk.
+
+Entries are evicted as refreshes show them to be gone:
+
+- a market a refresh asked for, from a book in its regions, that the refresh
+  no longer carries is removed (and the book once it has no markets left)
+- an event missing from a refresh of its sport is dropped once it has
+  started more than a grace period ago, or after several missed refreshes
+- an event of any sport is dropped once both its start and its last refresh
+  are more than a grace period old
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+try:
+    # When imported as a package
+    from .odds_projection import split_csv, BOOKMAKER_REGIONS, DEFAULT_MARKETS
+except ImportError:
+    # When run directly
+    from odds_projection import split_csv, BOOKMAKER_REGIONS, DEFAULT_MARKETS
+
+# Seconds after commence a game is assumed to be over
+DEFAULT_GRACE = 4 * 3600.0
+
+# Refreshes of its sport an event may be missing from before it is dropped
+DEFAULT_MAX_MISSED = 3
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class OddsBoard:
+    """Latest odds per event, merged by bookmaker and market."""
+
+    def __init__(self, grace: float = DEFAULT_GRACE, max_missed: int = DEFAULT_MAX_MISSED):
+        """
+        Initialize the board.
+
+        Args:
+            grace (float): Seconds after commence an event is assumed to be over
+            max_missed (int): Refreshes of its sport an event may be missing from before it is dropped
+        """
+        # sport -> event id -> {"event": metadata, "books": {book: {"title", "last_update", "markets": {key: market}}},
+        #                       "updated_at", "commence", "missed"}
+        self._sports: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.grace = grace
+        self.max_missed = max_missed
+
+    def update(self, sport: str, events: List[Dict[str, Any]], fetched_at: float,
+               options: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+        """
+        Merge a snapshot into the board and evict what it shows to be gone.
+
+        Args:
+            sport (str): Sport key
+            events (List[Dict[str, Any]]): Events from an /odds response
+            fetched_at (float): Epoch seconds the snapshot was fetched
+            options (Dict[str, Any], optional): Options the snapshot was fetched with. Without them
+                no markets are removed, since the snapshot's coverage is unknown.
+
+        Returns:
+            Dict[str, List[str]]: IDs of the evicted events by sport
+        """
+        markets = regions = bookmakers = None
+        if options is not None:
+            markets = split_csv(options.get("markets")) or DEFAULT_MARKETS
+            regions = split_csv(options.get("regions"))
+            bookmakers = split_csv(options.get("bookmakers"))
+        with self._lock:
+            board = self._sports.setdefault(sport, {})
+            for event in events:
+                entry = board.setdefault(event["id"], {"event": {}, "books": {}})
+                entry["event"] = {key: value for key, value in event.items() if key != "bookmakers"}
+                entry["updated_at"] = fetched_at
+                entry["commence"] = _parse_time(event.get("commence_time"))
+                entry["missed"] = 0
+                fresh = {}
+                for bookmaker in event.get("bookmakers", []):
+                    book = entry["books"].setdefault(bookmaker["key"], {"markets": {}})
+                    book["title"] = bookmaker.get("title")
+                    book["last_update"] = bookmaker.get("last_update")
+                    for market in bookmaker.get("markets", []):
+                        book["markets"][market["key"]] = market
+                    fresh[bookmaker["key"]] = {market["key"] for market in bookmaker.get("markets", [])}
+                if markets is not None:
+                    self._remove_missing_markets(entry, fresh, markets, regions, bookmakers)
+            return self._evict(sport, {event["id"] for event in events}, fetched_at)
+
+    @staticmethod
+    def _remove_missing_markets(entry: Dict[str, Any], fresh: Dict[str, set], markets: frozenset,
+                                regions: frozenset, bookmakers: frozenset) -> None:
+        """Remove the markets a refresh covered for a book but no longer carries."""
+        for key in list(entry["books"]):
+            # Books outside the refresh's regions (or unattributable ones) were not asked about
+            covered = key in bookmakers if bookmakers else bool(BOOKMAKER_REGIONS.get(key, frozenset()) & regions)
+            if not covered:
+                continue
+            book = entry["books"][key]
+            for market_key in markets - fresh.get(key, set()):
+                book["markets"].pop(market_key, None)
+            if not book["markets"]:
+                del entry["books"][key]
+
+    def _evict(self, sport: str, refreshed: set, now: float) -> Dict[str, List[str]]:
+        """Drop events that are over or no longer listed. Called with the lock held."""
+        evicted: Dict[str, List[str]] = {}
+        for board_sport, board in list(self._sports.items()):
+            for event_id, entry in list(board.items()):
+                if event_id in refreshed:
+                    continue
+                over = entry["commence"] is not None and entry["commence"] + self.grace <= now
+                if board_sport == sport:
+                    entry["missed"] += 1
+                    gone = over or entry["missed"] >= self.max_missed
+                else:
+                    # Long-running events (e.g. futures) stay while their own sport keeps listing them
+                    gone = over and entry["updated_at"] + self.grace <= now
+                if gone:
+                    del board[event_id]
+                    evicted.setdefault(board_sport, []).append(event_id)
+            if not board:
+                del self._sports[board_sport]
+        return evicted
+
+    def event(self, sport: str, event_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an event's latest odds.
+
+        Args:
+            sport (str): Sport key
+            event_id (str): Odds API event ID
+
+        Returns:
+            Optional[Dict[str, Any]]: Event in the /odds shape, or None if never seen
+        """
+        with self._lock:
+            entry = self._sports.get(sport, {}).get(event_id)
+            return None if entry is None else self._render(entry)
+
+    def events(self, sport: str) -> List[Dict[str, Any]]:
+        """
+        Get the latest odds of every known event of a sport.
+
+        Args:
+            sport (str): Sport key
+
+        Returns:
+            List[Dict[str, Any]]: Events in the /odds shape
+        """
+        with self._lock:
+            return [self._render(entry) for entry in self._sports.get(sport, {}).values()]
+
+    @staticmethod
+    def _render(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(entry["event"], bookmakers=[
+            {"key": key, "title": book["title"], "last_update": book["last_update"],
+             "markets": list(book["markets"].values())}
+            for key, book in entry["books"].items()
+        ])
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Odds Cache Module
+
+This module provides a containment-aware cache for /odds responses. A cached
+response fetched for a broad set of markets, regions or bookmakers answers
+any narrower request for the same sport by projection.
+"""
+import time
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Callable, FrozenSet, Tuple
+
+try:
+    # When imported as a package
+    from .odds_projection import split_csv, project_events, BOOKMAKER_REGIONS, DEFAULT_MARKETS
+except ImportError:
+    # When run directly
+    from odds_projection import split_csv, project_events, BOOKMAKER_REGIONS, DEFAULT_MARKETS
+
+# Parameters that describe what is covered rather than how it is presented
+_COVERAGE_PARAMS = ("markets", "regions", "bookmakers", "apiKey")
+
+
+class _Coverage:
+    """The markets and bookmakers an /odds request asks for."""
+
+    def __init__(self, options: Dict[str, Any]):
+        self.markets = split_csv(options.get("markets")) or DEFAULT_MARKETS
+        self.bookmakers: Optional[FrozenSet[str]] = split_csv(options.get("bookmakers")) or None
+        # The API ignores regions when bookmakers are given
+        self.regions = frozenset() if self.bookmakers else split_csv(options.get("regions"))
+
+    @property
+    def cacheable(self) -> bool:
+        """Whether the request names regions or bookmakers, as the API requires."""
+        return bool(self.regions or self.bookmakers)
+
+    def covers(self, other: "_Coverage") -> bool:
+        """Whether a response for this coverage contains everything ``other`` asks for."""
+        if not other.markets <= self.markets:
+            return False
+        if other.bookmakers is not None:
+            if self.bookmakers is not None:
+                return other.bookmakers <= self.bookmakers
+            return all(BOOKMAKER_REGIONS.get(book, frozenset()) & self.regions for book in other.bookmakers)
+        # A bookmaker list can never prove it holds every book in a region
+        return self.bookmakers is None and other.regions <= self.regions
+
+
+class CacheEntry:
+    """A cached upstream /odds response."""
+
+    def __init__(self, sport: str, options: Dict[str, Any], response: Dict[str, Any], fetched_at: float):
+        self.sport = sport
+        self.options = dict(options)
+        self.coverage = _Coverage(options)
+        self.response = response
+        self.fetched_at = fetched_at
+
+
+def cache_key(sport: str, options: Dict[str, Any]) -> Tuple:
+    """
+    Build the lookup key shared by all coverages of the same query.
+
+    Args:
+        sport (str): Sport key
+        options (Dict[str, Any]): Request options
+
+    Returns:
+        Tuple: Sport plus every option that is not a coverage parameter
+    """
+    return (sport, tuple(sorted((k, v) for k, v in options.items() if k not in _COVERAGE_PARAMS)))
+
+
+class OddsCache:
+    """
+    Containment-aware cache for /odds responses.
+
+    Entries are grouped by sport and presentation options (e.g. oddsFormat).
+    A lookup is answered by the freshest entry whose markets, regions and
+    bookmakers contain the request, so freshness is that of the broader fetch.
+    Storing an entry drops older entries it fully covers.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 256,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (float): Seconds an entry is considered fresh
+            max_entries (int): Maximum number of entries kept (least recently used are evicted)
+            clock (Callable[[], float]): Time source returning epoch seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[int, CacheEntry]" = OrderedDict()
+        self._by_key: Dict[Tuple, List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "projected_hits": 0, "misses": 0, "stores": 0, "superseded": 0}
+
+    def get(self, sport: str, options: Optional[Dict[str, Any]] = None,
+            max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Look up a response covering the request.
+
+        Args:
+            sport (str): Sport key
+            options (Dict[str, Any], optional): Request options
+            max_age (float, optional): Maximum acceptable age in seconds. Defaults to the cache TTL.
+                Pass ``float('inf')`` to accept stale entries.
+
+        Returns:
+            Optional[Dict[str, Any]]: Response projected to the request, with a ``cache``
+                section describing its age, or None when nothing fresh enough covers it
+        """
+        options = options or {}
+        wanted = _Coverage(options)
+        max_age = self.ttl if max_age is None else max_age
+        now = self.clock()
+        if not wanted.cacheable:
+            return None
+
+        with self._lock:
+            best = self._best(sport, options, wanted, now - max_age, now)
+            if best is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best)
+            entry = self._entries[best]
+            exact = (entry.coverage.markets == wanted.markets and entry.coverage.regions == wanted.regions
+                     and entry.coverage.bookmakers == wanted.bookmakers)
+            self._stats["hits"] += 1
+            if not exact:
+                self._stats["projected_hits"] += 1
+
+        data = entry.response.get("data")
+        if not exact and isinstance(data, list):
+            data = project_events(
+                data,
+                markets=wanted.markets,
+                regions=wanted.regions or None,
+                source_regions=entry.coverage.regions,
+                bookmakers=wanted.bookmakers,
+            )
+        return dict(entry.response, data=data, cache=self._describe(entry, now))
+
+    def _best(self, sport: str, options: Dict[str, Any], wanted: "_Coverage",
+              oldest: float, now: float) -> Optional[int]:
+        # Called with the lock held
+        best = None
+        for entry_id in self._by_key.get(cache_key(sport, options), []):
+            entry = self._entries[entry_id]
+            # Entries from the future only exist under a simulated clock (replay)
+            if not oldest <= entry.fetched_at <= now or not entry.coverage.covers(wanted):
+                continue
+            if best is None or entry.fetched_at > self._entries[best].fetched_at:
+                best = entry_id
+        return best
+
+    def covers(self, sport: str, options: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Whether a fresh entry covers a request, without counting a hit or miss.
+
+        Args:
+            sport (str): Sport key
+            options (Dict[str, Any], optional): Request options
+
+        Returns:
+            bool: True if get() would answer the request from the cache
+        """
+        options = options or {}
+        wanted = _Coverage(options)
+        if not wanted.cacheable:
+            return False
+        now = self.clock()
+        with self._lock:
+            return self._best(sport, options, wanted, now - self.ttl, now) is not None
+
+    def put(self, sport: str, options: Dict[str, Any], response: Dict[str, Any],
+            fetched_at: Optional[float] = None) -> None:
+        """
+        Store an upstream response.
+
+        Args:
+            sport (str): Sport key
+            options (Dict[str, Any]): Options the response was fetched with
+            response (Dict[str, Any]): Response in the OddsClient format
+            fetched_at (float, optional): Epoch seconds the data was fetched. Defaults to now.
+        """
+        entry = CacheEntry(sport, options, response, self.clock() if fetched_at is None else fetched_at)
+        if not entry.coverage.cacheable:
+            return
+        key = cache_key(sport, options)
+
+        with self._lock:
+            ids = self._by_key.setdefault(key, [])
+            for entry_id in list(ids):
+                old = self._entries[entry_id]
+                if old.fetched_at <= entry.fetched_at and entry.coverage.covers(old.coverage):
+                    self._remove(entry_id)
+                    self._stats["superseded"] += 1
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            self._by_key.setdefault(key, []).append(entry_id)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        key = cache_key(entry.sport, entry.options)
+        ids = self._by_key.get(key, [])
+        ids.remove(entry_id)
+        if not ids:
+            del self._by_key[key]
+
+    def _describe(self, entry: CacheEntry, now: float) -> Dict[str, Any]:
+        age = max(now - entry.fetched_at, 0.0)
+        return {
+            "hit": True,
+            "fetched_at": datetime.fromtimestamp(entry.fetched_at, tz=timezone.utc).isoformat(),
+            "age_seconds": round(age, 3),
+            "stale": age > self.ttl,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, Any]: Hit, miss and store counters plus the current entry count
+        """
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
@@ -8,61 +8,256 @@ functionality through the Model Context Protocol.
 import os
 import sys
 import json
+import time
 import asyncio
-from typing import Dict, Any, Optional, List, Union
+import importlib
+import threading
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from functools import cached_property, wraps
+from typing import Dict, Any, Optional, List, Union, Awaitable, Callable
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
-from mcp.server.stdio import stdio_server
-import mcp.types as types
 
-try:
-    # When imported as a package
-    from .odds_client import OddsClient
-except ImportError:
+
+def _local(name: str):
+    """
+    Import a sibling module on first use.
+    
+    Every assistant session starts a fresh server, so the HTTP stack and the
+    planning, caching and formatting modules are only loaded once a tool needs them.
+    
+    Args:
+        name: Module name inside the mcp_server package
+        
+    Returns:
+        The imported module
+    """
+    if __package__:
+        # When imported as a package
+        return importlib.import_module(f".{name}", __package__)
     # When run directly
-    from odds_client import OddsClient
+    return importlib.import_module(name)
+
+# Transports accepted by OddsMcpServer.run()
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+# Stands in for profiling phases while profiling is off
+_NO_PHASE = nullcontext()
 
 class OddsMcpServer:
     """MCP server for Wagyu Sports odds API."""
     
-    def __init__(self, api_key: Optional[str] = None, test_mode: bool = False):
+    def __init__(self, api_key: Optional[str] = None, test_mode: bool = False,
+                 planner_window: float = 0.05, cache_ttl: float = 60.0,
+                 deadline_ms: Optional[float] = 10000.0, hedge_percentile: Optional[float] = None,
+                 shared_cache: Optional[str] = None, archive: Optional[str] = None,
+                 snapshots: Optional[str] = None, offline: bool = False, clock: Callable[[], float] = time.time,
+                 poll: Optional[Dict[str, Dict[str, Any]]] = None, poll_budget: float = 60.0,
+                 profile: Optional[str] = None, profile_rate: Optional[float] = None,
+                 max_concurrent: Optional[int] = None, max_queue: int = 32, max_session_queue: int = 4,
+                 prefetch: Optional[float] = None, seed: Optional[List[str]] = None, stream_json: bool = False):
         """
         Initialize the MCP server.
         
         Args:
-            api_key (str, optional): API key for the Odds API. If not provided,
-                                    will try to get from environment variable.
+            api_key (str, optional): API key for the Odds API, or several comma-separated
+                                    keys to use as a pool. If not provided, will try to
+                                    get from environment variable.
             test_mode (bool): Whether to use mock data instead of real API calls.
+            planner_window (float): Seconds to collect get_odds requests before
+                                    merging them into upstream calls.
+            cache_ttl (float): Seconds a cached odds response is served without
+                               refetching.
+            deadline_ms (float, optional): Default time budget for live tool calls in
+                                           milliseconds. None waits indefinitely.
+            hedge_percentile (float, optional): Latency percentile after which the client
+                                                sends a hedged duplicate request. None disables hedging.
+            shared_cache (str, optional): Unix socket of the shared cache daemon, started on
+                                          first use. None keeps the cache local to this process.
+            archive (str, optional): Directory of a columnar odds archive that every
+                                     fetched odds snapshot is appended to.
+            snapshots (str, optional): Directory of a content-addressed snapshot store that
+                                       every fetched odds snapshot is added to.
+            offline (bool): Serve only odds passed to ingest_odds() and never call the
+                            Odds API (used by the replay engine).
+            clock (Callable[[], float]): Time source returning epoch seconds. The replay
+                                         engine passes its simulated clock.
+            poll (Dict[str, Dict[str, Any]], optional): Sports to refresh in the background,
+                                                        mapped to the /odds options to poll with.
+            poll_budget (float): Quota requests per hour the background polling may spend.
+            profile (str, optional): Directory to write profiles of sampled tool calls to.
+                                     Defaults to $WAGYU_PROFILE_DIR; profiling is off without either.
+            profile_rate (float, optional): Fraction of tool calls to profile. Defaults to
+                                            $WAGYU_PROFILE_RATE or 1.0.
+            max_concurrent (int, optional): Calls of each odds tool that may run at once,
+                                            queued fairly across sessions beyond that.
+                                            None disables admission control.
+            max_queue (int): Calls of each odds tool that may wait before new ones are shed.
+            max_session_queue (int): Calls of each odds tool one session may have waiting.
+            prefetch (float, optional): Fraction of the quota headroom that speculative
+                                        prefetching of likely next requests may spend.
+                                        None disables prefetching.
+            seed (List[str], optional): Recorded snapshot sources (mocks_live, capture files or
+                                        directories, capture logs, snapshot stores or archives)
+                                        whose newest snapshots seed the cache at startup. They
+                                        are served, labeled with their age, when a live fetch
+                                        fails. Without an API key the server then runs offline.
+            stream_json (bool): Parse response bodies incrementally as they arrive. This lowers
+                                peak memory on very large responses but parses more slowly.
         """
         # Get API key from environment if not provided
         self.api_key = api_key or os.environ.get("ODDS_API_KEY")
-        if not self.api_key and not test_mode:
-            raise ValueError("API key is required when not in test mode")
+        if not self.api_key and not test_mode and not offline:
+            if not seed:
+                raise ValueError("API key is required when not in test mode")
+            # Nothing can be fetched, but the seeded snapshots can still be served
+            offline = True
             
         self.test_mode = test_mode
+        self.offline = offline
+        self.clock = clock
+        self.deadline_ms = deadline_ms
         self.mock_data_dir = Path(__file__).parent / "mocks_live"
         
-        # Initialize client
-        self.client = OddsClient(self.api_key) if not test_mode else None
+        # The client, cache and planner are created on first use (see the properties below)
+        self.planner_window = planner_window
+        self.cache_ttl = cache_ttl
+        self.hedge_percentile = hedge_percentile
+        self.stream_json = stream_json
+        self.shared_cache_path = shared_cache
+        # Opened up front: fetches run on worker threads and must share one writer
+        self.archive = _local("odds_archive").ArchiveWriter(archive, clock=clock) if archive else None
+        self.snapshot_store = _local("snapshot_store").SnapshotStore(snapshots) if snapshots else None
+        self._mock_data: Dict[str, str] = {}
+        self.sports_seen: Dict[str, str] = {}
+        # Sports flagged has_outrights by /sports; shared with the client, which adds live ones
+        self.outright_sports: set = set()
+        # Ingestion objects, created on first use (see _shared)
+        self._shared_objects: Dict[str, Any] = {}
+        self._shared_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.scheduler = _local("poll_scheduler").PollScheduler(poll, poll_budget, clock=clock) if poll else None
+        # The profiling module is only imported when profiling is on
+        self.profiler = None
+        if profile or os.environ.get("WAGYU_PROFILE_DIR"):
+            self.profiler = _local("profiling").profiler_from_env(profile, profile_rate)
+        self.admission = None
+        if max_concurrent is not None:
+            self.admission = _local("admission").AdmissionController(max_concurrent, max_queue, max_session_queue)
+        # Prefetching spends quota, so it only runs against the live API
+        self.prefetcher = None
+        if prefetch and not test_mode and not offline:
+            self.prefetcher = _local("prefetch").Prefetcher(prefetch, ttl=cache_ttl, clock=clock)
+        self._prefetches = set()
+        # Seeded before any tool can run
+        self.seed = _local("warm_start").seed_server(self, seed) if seed else None
         
         # Initialize server with FastMCP
         self.server = FastMCP("wagyu-sports-mcp")
+        self.http_server = None
         
         # Register tools
         self.register_tools()
+        self.register_resources()
+    
+    @cached_property
+    def client(self):
+        """OddsClient for live calls, or None in test and offline mode."""
+        if self.test_mode or self.offline:
+            return None
+        return _local("odds_client").OddsClient(self.api_key, timeout=10.0, hedge_percentile=self.hedge_percentile,
+                                                stream_json=self.stream_json, outright_sports=self.outright_sports,
+                                                on_phase=self.profiler.record if self.profiler else None)
+    
+    @cached_property
+    def cache(self):
+        """Containment-aware cache for live odds responses."""
+        return _local("odds_cache").OddsCache(ttl=self.cache_ttl, clock=self.clock)
+    
+    @cached_property
+    def shared_cache(self):
+        """Client for the shared cache daemon, or None when running local-only."""
+        if not self.shared_cache_path or self.client is None:
+            return None
+        return _local("cache_daemon").SharedCacheClient(self.shared_cache_path)
+    
+    def _shared(self, name: str, create: Callable[[], Any]) -> Any:
+        """
+        Get an object shared by the event loop and ingestion threads, creating it once.
+        
+        Args:
+            name: Name of the object
+            create: Builds the object on first use
+            
+        Returns:
+            The object
+        """
+        shared = self._shared_objects.get(name)
+        if shared is None:
+            # Fetches ingest on worker threads, which must not each build their own
+            with self._shared_lock:
+                shared = self._shared_objects.get(name)
+                if shared is None:
+                    shared = self._shared_objects[name] = create()
+        return shared
+    
+    @property
+    def board(self):
+        """Latest odds per event, merged across snapshots."""
+        return self._shared("board", lambda: _local("odds_board").OddsBoard())
+    
+    @property
+    def subscriptions(self):
+        """Odds resource subscriptions of every session."""
+        return self._shared("subscriptions", lambda: _local("odds_subscriptions").SubscriptionRegistry())
+    
+    @property
+    def alerts(self):
+        """Alert rules checked against every ingested snapshot."""
+        return self._shared("alerts", lambda: _local("alert_rules").AlertEngine(clock=self.clock))
+    
+    @property
+    def game_lines(self):
+        """Game line summaries refreshed at ingestion."""
+        return self._shared("game_lines", lambda: _local("game_lines").GameLinesIndex())
+    
+    @cached_property
+    def espn(self):
+        """Async ESPN client used for live scores."""
+        return _local("espn_client").EspnClient()
+    
+    @cached_property
+    def games(self):
+        """Join index from Odds API events to ESPN games."""
+        return _local("espn_client").GameJoinIndex(clock=self.clock)
+    
+    @cached_property
+    def planner(self):
+        """Query planner merging live get_odds calls, or None without a client."""
+        if self.client is None:
+            return None
+        # Losing hedged /odds requests are paid for too
+        return _local("query_planner").QueryPlanner(
+            self._fetch_odds, window=self.planner_window,
+            extra_cost=lambda: sum(cost for endpoint, cost in self.client.hedge_cost.items()
+                                   if endpoint.endswith("/odds"))
+        )
     
     def register_tools(self):
         """Register MCP tools."""
         
-        @self.server.tool()
-        async def get_sports(all_sports: bool = False, use_test_mode: Optional[bool] = None) -> str:
+        @self._tool(gated=True)
+        async def get_sports(all_sports: bool = False, use_test_mode: Optional[bool] = None,
+                             deadline_ms: Optional[float] = None) -> str:
             """
             Get a list of available sports.
             
             Args:
                 all_sports: Include out-of-season sports if True
                 use_test_mode: Override server test_mode setting (True for mock data, False for real API)
+                deadline_ms: Time budget in milliseconds; when it expires the last good answer is returned
                 
             Returns:
                 JSON string with sports data
@@ -71,17 +266,40 @@ class OddsMcpServer:
             test_mode = use_test_mode if use_test_mode is not None else self.test_mode
             
             if test_mode:
-                return await self._get_mock_data("sports_list_live.json")
+                mock_data = await self._get_mock_data("sports_list_live.json")
+                self._note_outright_sports(json.loads(mock_data))
+                return mock_data
+            
+            if self.offline:
+                result = self._seeded_sports("offline")
+                if result is not None:
+                    self._note_outright_sports(result)
+                    return json.dumps(result, indent=2)
+                return json.dumps({"data": [
+                    {"key": key, "title": title, "active": True} for key, title in sorted(self.sports_seen.items())
+                ]}, indent=2)
             
-            result = self.client.get_sports(all_sports=all_sports)
+            try:
+                result = await self._with_deadline(
+                    asyncio.to_thread(self.client.get_sports, all_sports=all_sports), deadline_ms
+                )
+            except Exception as e:
+                params = {"all": "true"} if all_sports else {}
+                result = self.client.last_good_response("/sports", params, reason=str(e))
+                if result is None:
+                    result = self._seeded_sports(str(e))
+                if result is None:
+                    return json.dumps({"error": f"Error fetching sports: {str(e)}"})
+                self._note_outright_sports(result)
             return json.dumps(result, indent=2)
         
-        @self.server.tool()
+        @self._tool(gated=True, shed=self._shed_odds)
         async def get_odds(sport: str, regions: Optional[str] = None, 
                           markets: Optional[str] = None, 
                           odds_format: Optional[str] = None,
                           date_format: Optional[str] = None,
-                          use_test_mode: Optional[bool] = None) -> str:
+                          use_test_mode: Optional[bool] = None,
+                          deadline_ms: Optional[float] = None) -> str:
             """
             Get odds for a specific sport.
             
@@ -89,36 +307,252 @@ class OddsMcpServer:
                 sport: Sport key (e.g., 'basketball_nba')
                 regions: Comma-separated list of regions (e.g., 'us,uk')
                 markets: Comma-separated list of markets (e.g., 'h2h,spreads')
-                odds_format: Format for odds ('decimal' or 'american')
+                odds_format: Format for odds ('decimal', 'american', 'fractional', 'implied' or 'hongkong')
                 date_format: Format for dates ('unix' or 'iso')
                 use_test_mode: Override server test_mode setting (True for mock data, False for real API)
+                deadline_ms: Time budget in milliseconds; when it expires the best cached answer is returned
                 
             Returns:
                 JSON string with odds data
             """
             # Determine if we should use test mode
             test_mode = use_test_mode if use_test_mode is not None else self.test_mode
+            odds_format = odds_format or _local("odds_format").CANONICAL_FORMAT
+            result = await self._odds_result(sport, regions, markets, odds_format, date_format, test_mode, deadline_ms)
+            if "error" in result:
+                return json.dumps(result)
+            return self._format_odds(result, odds_format)
+        
+        @self._tool(gated=True)
+        async def get_odds_with_scores(sport: str, regions: Optional[str] = None,
+                                       markets: Optional[str] = None,
+                                       odds_format: Optional[str] = None,
+                                       use_test_mode: Optional[bool] = None,
+                                       deadline_ms: Optional[float] = None) -> str:
+            """
+            Get odds for a sport together with each game's live ESPN score and status.
+            
+            Args:
+                sport: Sport key (e.g., 'basketball_nba')
+                regions: Comma-separated list of regions (e.g., 'us,uk')
+                markets: Comma-separated list of markets (e.g., 'h2h,spreads')
+                odds_format: Format for odds ('decimal', 'american', 'fractional', 'implied' or 'hongkong')
+                use_test_mode: Override server test_mode setting (True for mock odds, False for real API)
+                deadline_ms: Time budget in milliseconds for the odds request
+                
+            Returns:
+                JSON string with odds data; each event has an ``espn`` section (None if no game matched)
+            """
+            # Determine if we should use test mode
+            test_mode = use_test_mode if use_test_mode is not None else self.test_mode
+            odds_format = odds_format or _local("odds_format").CANONICAL_FORMAT
+            result = await self._odds_result(sport, regions, markets, odds_format, None, test_mode, deadline_ms)
+            if "error" in result:
+                return json.dumps(result)
             
-            if test_mode:
-                if sport == "basketball_nba":
-                    return await self._get_mock_data("nba_games_live.json")
-                # Fall back to nba_games_live.json since we don't have a live version of game_odds_all_books.json
-                return await self._get_mock_data("nba_games_live.json")
-            
-            options = {}
-            if regions:
-                options["regions"] = regions
-            if markets:
-                options["markets"] = markets
-            if odds_format:
-                options["oddsFormat"] = odds_format
-            if date_format:
-                options["dateFormat"] = date_format
+            espn = _local("espn_client")
+            events = result.get("data") or []
+            try:
+                with self._phase("espn"):
+                    scoreboards = await asyncio.gather(
+                        *(self.espn.get_scoreboard(sport, day) for day in espn.espn_dates(events))
+                    )
+            except Exception as e:
+                # Odds are still worth returning without scores
+                result = dict(result, espn_error=str(e))
+            else:
+                for games in scoreboards:
+                    self.games.add_games(sport, games)
+            result = dict(result, data=[dict(event, espn=self.games.lookup(sport, event)) for event in events])
+            return self._format_odds(result, odds_format)
+        
+        @self._tool(gated=True, shed=self._shed_game_lines)
+        async def get_game_lines(sport: str, bookmaker: Optional[str] = None, regions: Optional[str] = None,
+                                 odds_format: Optional[str] = None, use_test_mode: Optional[bool] = None,
+                                 deadline_ms: Optional[float] = None) -> str:
+            """
+            Get one summary line per game, e.g. "Los Angeles Lakers -4.5, O/U 224.5, Los Angeles Lakers ML -190".
+            
+            Spread and total use the point offered by the most books at the median price,
+            and the moneyline is the median price with the best price and its book.
+            
+            Args:
+                sport: Sport key (e.g., 'basketball_nba')
+                bookmaker: Preferred bookmaker key; its lines replace the consensus where it has them
+                regions: Comma-separated list of regions (default 'us')
+                odds_format: Format for prices (default 'american')
+                use_test_mode: Override server test_mode setting (True for mock data, False for real API)
+                deadline_ms: Time budget in milliseconds for the odds request
                 
-            result = self.client.get_odds(sport, options=options)
-            return json.dumps(result, indent=2)
+            Returns:
+                JSON string with one entry per game
+            """
+            test_mode = use_test_mode if use_test_mode is not None else self.test_mode
+            odds_format = odds_format or "american"
+            game_lines = _local("game_lines")
+            if odds_format not in _local("odds_format").SUPPORTED_FORMATS:
+                return json.dumps({"error": f"Unsupported odds format '{odds_format}'"})
+            
+            if self.offline and not test_mode:
+                # Whatever markets were ingested for these regions have already been summarized
+                summaries = self.game_lines.get(sport, regions=regions or "us")
+                if not summaries:
+                    return json.dumps({"error": f"No odds for {sport} have been ingested"})
+            else:
+                result = await self._odds_result(sport, regions or "us", game_lines.SUMMARY_MARKETS,
+                                                  odds_format, None, test_mode, deadline_ms)
+                if "error" in result:
+                    return json.dumps(result)
+                events = result.get("data") or []
+                if test_mode:
+                    summaries = [game_lines.summarize_event(event) for event in events]
+                else:
+                    stored = {summary["event_id"]: summary for summary in
+                              self.game_lines.get(sport, [event["id"] for event in events], regions or "us")}
+                    # Events answered from a fetch for other regions (e.g. a wider cached one) were
+                    # not summarized for these regions; the response is already projected to them
+                    missing = [event for event in events if event["id"] not in stored]
+                    if missing:
+                        stored.update(game_lines.summarize_events(missing))
+                    summaries = [stored[event["id"]] for event in events if event["id"] in stored]
+            
+            with self._phase("transform"):
+                games = [game_lines.render_game(summary, odds_format, bookmaker) for summary in summaries]
+            with self._phase("serialize"):
+                return json.dumps({"sport": sport, "games": games}, indent=2)
+        
+        @self._tool(gated=True)
+        async def compare_outrights(sport: str, regions: Optional[str] = None, odds_format: Optional[str] = None,
+                                    limit: Optional[int] = None, use_test_mode: Optional[bool] = None,
+                                    deadline_ms: Optional[float] = None) -> str:
+            """
+            Compare futures odds across books, e.g. who pays most on each Super Bowl contender.
+            
+            Every contender is ranked by consensus probability with its best price, the books
+            offering it, the worst price and the spread between them.
+            
+            Args:
+                sport: Outright sport key (e.g., 'americanfootball_nfl_super_bowl_winner')
+                regions: Comma-separated list of regions (default 'us')
+                odds_format: Format for prices ('decimal', 'american', 'fractional', 'implied' or 'hongkong')
+                limit: Contenders to return per event, favourites first (default all)
+                use_test_mode: Override server test_mode setting (True for mock data, False for real API)
+                deadline_ms: Time budget in milliseconds for the odds request
+                
+            Returns:
+                JSON string with the ranked contenders of each outright event
+            """
+            test_mode = use_test_mode if use_test_mode is not None else self.test_mode
+            odds_format = odds_format or _local("odds_format").CANONICAL_FORMAT
+            outrights = _local("outrights")
+            result = await self._odds_result(sport, regions or "us", outrights.OUTRIGHTS_MARKET,
+                                              odds_format, None, test_mode, deadline_ms)
+            if "error" in result:
+                return json.dumps(result)
+            
+            with self._phase("transform"):
+                events = outrights.compare_outrights(result.get("data") or [], limit=limit)
+                if odds_format != _local("odds_format").CANONICAL_FORMAT:
+                    convert = _local("odds_format").convert_price
+                    for event in events:
+                        for contender in event["ranked"]:
+                            contender["best_price"] = convert(contender["best_price"], odds_format)
+                            contender["worst_price"] = convert(contender["worst_price"], odds_format)
+            with self._phase("serialize"):
+                return json.dumps({"sport": sport, "events": events}, indent=2)
+        
+        @self._tool()
+        async def add_alert_rule(market: str, outcome: Optional[str] = None, event_id: Optional[str] = None,
+                                 bookmaker: Optional[str] = None, sport: Optional[str] = None,
+                                 field: str = "price", above: Optional[float] = None,
+                                 below: Optional[float] = None, move: Optional[float] = None,
+                                 window_minutes: float = 30.0, odds_format: Optional[str] = None) -> str:
+            """
+            Add a standing alert rule, checked whenever odds are fetched.
+            
+            Give above and/or below for a level rule, which fires when the line
+            crosses into the range and again after it leaves and re-enters.
+            Give move for a movement rule, which fires when the line moves by at
+            least that much within window_minutes.
+            
+            Args:
+                market: Market key (e.g., 'h2h', 'spreads', 'totals')
+                outcome: Outcome name (e.g., 'Golden State Warriors', 'Over'; 'Over|<player>' for player
+                    props), or any outcome if omitted
+                event_id: Event ID, or any event if omitted
+                bookmaker: Bookmaker key, or any bookmaker if omitted
+                sport: Sport key, or any sport if omitted
+                field: 'price' or 'point'
+                above: Fire when the value goes above this level
+                below: Fire when the value goes below this level
+                move: Fire when the value moves at least this much (either direction)
+                window_minutes: Time window for move
+                odds_format: Format of price levels, 'decimal' (default) or 'american'
+                
+            Returns:
+                JSON string with the new rule
+            """
+            if odds_format not in (None, "decimal", "american"):
+                return json.dumps({"error": "Alert price levels must be 'decimal' or 'american'"})
+            if odds_format == "american" and field == "price":
+                if move is not None:
+                    return json.dumps({"error": "Price moves are measured in decimal odds"})
+                to_decimal = _local("odds_format").american_to_decimal
+                try:
+                    above = None if above is None else to_decimal(int(above))
+                    below = None if below is None else to_decimal(int(below))
+                except ValueError as e:
+                    return json.dumps({"error": str(e)})
+            try:
+                rule = self.alerts.add_rule(market, outcome=outcome, event_id=event_id, bookmaker=bookmaker,
+                                            sport=sport, field=field, above=above, below=below, move=move,
+                                            window=window_minutes * 60)
+            except ValueError as e:
+                return json.dumps({"error": str(e)})
+            return json.dumps(rule.describe(), indent=2)
+        
+        @self._tool()
+        async def list_alert_rules() -> str:
+            """
+            List the standing alert rules.
+            
+            Returns:
+                JSON string with the rules and evaluation statistics
+            """
+            return json.dumps({
+                "rules": [rule.describe() for rule in self.alerts.rules()],
+                "stats": dict(self.alerts.stats),
+            }, indent=2)
         
-        @self.server.tool()
+        @self._tool()
+        async def remove_alert_rule(rule_id: int) -> str:
+            """
+            Remove an alert rule.
+            
+            Args:
+                rule_id: ID returned by add_alert_rule
+                
+            Returns:
+                JSON string confirming the removal
+            """
+            if not self.alerts.remove_rule(rule_id):
+                return json.dumps({"error": f"No alert rule with id {rule_id}"})
+            return json.dumps({"removed": rule_id})
+        
+        @self._tool()
+        async def get_triggered_alerts(since_id: int = 0) -> str:
+            """
+            Get alerts triggered by fetched odds, oldest first.
+            
+            Args:
+                since_id: Only return alerts with a larger ID (pass the last ID seen to poll)
+                
+            Returns:
+                JSON string with triggered alerts
+            """
+            return json.dumps(self.alerts.get_alerts(since_id), indent=2)
+        
+        @self._tool()
         async def get_quota_info(use_test_mode: Optional[bool] = None) -> str:
             """
             Get API quota information.
@@ -135,11 +569,482 @@ class OddsMcpServer:
             if test_mode:
                 return await self._get_mock_data("quota_info_live.json")
             
+            admission = self.admission.metrics() if self.admission else None
+            seeded = self.seed["snapshots"] if self.seed else None
+            if self.offline:
+                return json.dumps({
+                    "offline": True,
+                    "cache": self.cache.stats(),
+                    "polling": self.scheduler.plan() if self.scheduler else None,
+                    "admission": admission,
+                    "seeded": seeded,
+                }, indent=2)
+            
             return json.dumps({
                 "remaining_requests": self.client.remaining_requests,
-                "used_requests": self.client.used_requests
+                "polling": self.scheduler.plan() if self.scheduler else None,
+                "used_requests": self.client.used_requests,
+                "planner": self.planner.stats(),
+                "cache": self.cache.stats(),
+                "circuits": {endpoint: breaker.state for endpoint, breaker in self.client.breakers.items()},
+                "hedging": self.client.hedge_stats,
+                "keys": self.client.key_pool.usage(),
+                "shared_ledger": self.shared_cache.ledger() if self.shared_cache else None,
+                "admission": admission,
+                "prefetch": self.prefetcher.metrics() if self.prefetcher else None,
+                "seeded": seeded,
             }, indent=2)
     
+    def _tool(self, gated: bool = False, shed: Optional[Callable[..., Optional[str]]] = None):
+        """
+        Decorator registering a tool.
+        
+        Args:
+            gated: Put the tool behind admission control, when it is on
+            shed: Answers a shed call from what the server already has. Called with the
+                  reason and the tool's arguments; returning None sends a busy response.
+        """
+        register = self.server.tool()
+        
+        def decorate(fn):
+            if gated and self.prefetcher is not None:
+                # Gated tools are the ones that reach the upstream. Inside admission, so shed
+                # calls neither teach the prefetcher nor trigger it.
+                fn = self._prefetching(fn)
+            if gated and self.admission is not None:
+                fn = self._admitted(fn, shed)
+            if self.profiler is not None:
+                fn = self.profiler.wrap(fn)
+            return register(fn)
+        return decorate
+    
+    def _admitted(self, fn: Callable, shed: Optional[Callable[..., Optional[str]]]) -> Callable:
+        """Wrap a tool so each call waits for a slot from its admission gate."""
+        gate = self.admission.gate(fn.__name__)
+        Shed = _local("admission").Shed
+        
+        @wraps(fn)
+        async def admitted(*args, **kwargs):
+            try:
+                with self._phase("queue"):
+                    await gate.acquire(self._session_key())
+            except Shed as e:
+                answer = shed(str(e), **kwargs) if shed is not None else None
+                return answer if answer is not None else json.dumps({"error": str(e), "busy": True})
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                gate.release()
+        return admitted
+    
+    def _prefetching(self, fn: Callable) -> Callable:
+        """Wrap a tool so each call teaches the prefetcher and triggers its predictions."""
+        tool = fn.__name__
+        gate = self.admission.gate(tool) if self.admission is not None else None
+        
+        @wraps(fn)
+        async def prefetching(*args, **kwargs):
+            result = await fn(*args, **kwargs)
+            if not kwargs.get("use_test_mode"):
+                for sport, options in self.prefetcher.observe(self._session_key(), tool,
+                                                              self._fetch_of(tool, kwargs)):
+                    task = asyncio.ensure_future(self._prefetch(sport, options, gate))
+                    self._prefetches.add(task)
+                    task.add_done_callback(self._prefetches.discard)
+            return result
+        return prefetching
+    
+    def _fetch_of(self, tool: str, arguments: Dict[str, Any]) -> Optional[tuple]:
+        """The sport and /odds options a tool call needs, or None if it needs no odds."""
+        sport = arguments.get("sport")
+        if sport is None:
+            return None
+        if tool in ("get_odds", "get_odds_with_scores"):
+            markets = arguments.get("markets")
+        elif tool == "get_game_lines":
+            markets = _local("game_lines").SUMMARY_MARKETS
+        elif tool == "compare_outrights":
+            markets = _local("outrights").OUTRIGHTS_MARKET
+        else:
+            return None
+        regions = arguments.get("regions") or (None if tool.startswith("get_odds") else "us")
+        return sport, self._odds_options(sport, regions, markets, arguments.get("date_format"))
+    
+    async def _prefetch(self, sport: str, options: Dict[str, Any], gate: Optional[Any] = None) -> None:
+        """
+        Fetch a predicted request into the cache if the prefetch budget allows it.
+        
+        Args:
+            sport: Sport key
+            options: /odds options of the predicted request
+            gate: Admission gate of the tool that triggered the prediction, if admission is on.
+                  The prefetch runs in a free slot of it, and is skipped when there is none.
+        """
+        projection = _local("odds_projection")
+        cost = projection.estimate_cost(projection.split_csv(options.get("markets")) or projection.DEFAULT_MARKETS,
+                                        projection.split_csv(options.get("regions")))
+        admitted = gate is None or gate.try_acquire()
+        if not self.prefetcher.allow(cost, self.client.key_pool.total_remaining(),
+                                     cached=self.cache.covers(sport, options), busy=not admitted):
+            if admitted and gate is not None:
+                gate.release()
+            return
+        self.prefetcher.prefetched(sport, options)
+        try:
+            await self.planner.get_odds(sport, options)
+        except Exception as e:
+            # Nobody is waiting for a prefetch
+            self.prefetcher.failed(e)
+        finally:
+            if gate is not None:
+                gate.release()
+    
+    def _session_key(self) -> Any:
+        """The MCP session of the current tool call, or None outside a request."""
+        request_context = self.server.get_context().request_context
+        return request_context.session if request_context is not None else None
+    
+    def _shed_odds(self, reason: str, sport: str, regions: Optional[str] = None, markets: Optional[str] = None,
+                   odds_format: Optional[str] = None, date_format: Optional[str] = None,
+                   use_test_mode: Optional[bool] = None, deadline_ms: Optional[float] = None) -> Optional[str]:
+        """Answer a shed get_odds call from the cache, however old."""
+        formats = _local("odds_format")
+        odds_format = odds_format or formats.CANONICAL_FORMAT
+        if odds_format not in formats.SUPPORTED_FORMATS:
+            return None
+        result = self.cache.get(sport, self._odds_options(sport, regions, markets, date_format),
+                                max_age=float("inf"))
+        if result is None:
+            return None
+        return self._format_odds(self._mark_stale(result, reason, busy=True), odds_format)
+    
+    def _shed_game_lines(self, reason: str, sport: str, bookmaker: Optional[str] = None,
+                         regions: Optional[str] = None, odds_format: Optional[str] = None,
+                         **kwargs) -> Optional[str]:
+        """Answer a shed get_game_lines call from the stored summaries for its regions."""
+        summaries = self.game_lines.get(sport, regions=regions or "us")
+        odds_format = odds_format or "american"
+        if not summaries or odds_format not in _local("odds_format").SUPPORTED_FORMATS:
+            return None
+        games = [_local("game_lines").render_game(summary, odds_format, bookmaker) for summary in summaries]
+        return json.dumps({"sport": sport, "games": games, "stale": {"reason": reason, "busy": True}}, indent=2)
+    
+    def _phase(self, name: str):
+        """Time a block as a phase of the current tool call's profile."""
+        return _NO_PHASE if self.profiler is None else self.profiler.phase(name)
+    
+    def register_resources(self):
+        """Register odds resources and their subscription handlers."""
+        
+        @self.server.resource("odds://{sport}/{event_id}", name="event_odds", mime_type="application/json",
+                              description="Latest odds of one event. Subscribe with ?price=X&point=Y to be "
+                                          "notified only when a price or point moves by at least that much.")
+        def event_odds(sport: str, event_id: str) -> str:
+            event = self.board.event(sport, event_id.split("?", 1)[0])
+            if event is None:
+                return json.dumps({"error": f"No odds known for event {event_id} of {sport}"})
+            return json.dumps(event, indent=2)
+        
+        @self.server.resource("odds://{sport}", name="sport_odds", mime_type="application/json",
+                              description="Latest odds of every known event of a sport. Accepts the same "
+                                          "subscription thresholds as event_odds.")
+        def sport_odds(sport: str) -> str:
+            return json.dumps(self.board.events(sport.split("?", 1)[0]), indent=2)
+        
+        lowlevel = self.server._mcp_server
+        
+        @lowlevel.subscribe_resource()
+        async def subscribe(uri) -> None:
+            self._loop = asyncio.get_running_loop()
+            sport = _local("odds_subscriptions").parse_odds_uri(str(uri))[0]
+            self.subscriptions.subscribe(lowlevel.request_context.session, str(uri), self.board.events(sport))
+        
+        @lowlevel.unsubscribe_resource()
+        async def unsubscribe(uri) -> None:
+            self.subscriptions.unsubscribe(lowlevel.request_context.session, str(uri))
+        
+        # The low-level server always advertises subscribe=False
+        get_capabilities = lowlevel.get_capabilities
+        
+        def capabilities(*args, **kwargs):
+            result = get_capabilities(*args, **kwargs)
+            if result.resources is not None:
+                result.resources.subscribe = True
+            return result
+        
+        lowlevel.get_capabilities = capabilities
+    
+    def _notify(self, subscription) -> None:
+        """
+        Send a resource updated notification from any thread.
+        
+        Args:
+            subscription: Subscription whose threshold was crossed
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        
+        async def send():
+            try:
+                await subscription.session.send_resource_updated(subscription.uri)
+            except Exception:
+                # The session has gone away
+                self.subscriptions.drop_session(subscription.session)
+        
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._loop.create_task(send())
+        else:
+            asyncio.run_coroutine_threadsafe(send(), self._loop)
+    
+    async def _odds_result(self, sport: str, regions: Optional[str], markets: Optional[str],
+                           odds_format: str, date_format: Optional[str], test_mode: bool,
+                           deadline_ms: Optional[float]) -> Dict[str, Any]:
+        """
+        Get odds with decimal prices from mocks, the cache or the upstream API.
+        
+        Args:
+            sport: Sport key
+            regions: Comma-separated regions
+            markets: Comma-separated markets
+            odds_format: Requested output format, validated here
+            date_format: Format for dates ('unix' or 'iso')
+            test_mode: Whether to use mock data
+            deadline_ms: Time budget in milliseconds for the upstream call
+            
+        Returns:
+            Response in the OddsClient format, or a dict with an ``error`` message
+        """
+        # Odds are always fetched and cached as decimal, then converted locally
+        formats = _local("odds_format")
+        if odds_format not in formats.SUPPORTED_FORMATS:
+            return {
+                "error": f"Unsupported odds format '{odds_format}', expected one of {', '.join(formats.SUPPORTED_FORMATS)}"
+            }
+        
+        if test_mode:
+            if sport == "basketball_nba":
+                mock_data = await self._get_mock_data("nba_games_live.json")
+            else:
+                # Fall back to nba_games_live.json since we don't have a live version of game_odds_all_books.json
+                mock_data = await self._get_mock_data("nba_games_live.json")
+            return json.loads(mock_data)
+        
+        options = self._odds_options(sport, regions, markets, date_format)
+        
+        if self.offline:
+            # The newest ingested snapshot is what the odds looked like at this time
+            with self._phase("cache"):
+                result = self.cache.get(sport, options, max_age=float("inf"))
+            if result is None:
+                return {"error": f"No odds for {sport} have been ingested for this request"}
+            if "seed" in result:
+                # Seeded rather than replayed: the server has no API key
+                self._mark_stale(result, "offline")
+            return result
+        
+        with self._phase("cache"):
+            result = self.cache.get(sport, options)
+        if result is not None and self.prefetcher is not None:
+            self.prefetcher.served(sport, options)
+        if result is None:
+            try:
+                with self._phase("upstream"):
+                    result = await self._with_deadline(self.planner.get_odds(sport, options), deadline_ms)
+            except Exception as e:
+                # Fall back to the newest cached answer, however old
+                result = self.cache.get(sport, options, max_age=float("inf"))
+                if result is None:
+                    return {"error": f"Error fetching odds: {str(e)}"}
+                self._mark_stale(result, str(e))
+        return result
+    
+    @staticmethod
+    def _mark_stale(result: Dict[str, Any], reason: str, **label) -> Dict[str, Any]:
+        """Label a cached response served past its TTL with the reason and its age."""
+        result["stale"] = {"reason": reason, **label, **result["cache"]}
+        if "seed" in result:
+            result["stale"]["seeded_from"] = result.pop("seed")["source"]
+        return result
+    
+    def _seeded_sports(self, reason: str) -> Optional[Dict[str, Any]]:
+        """The seeded sports list, labeled with its age, or None without one."""
+        if self.seed is None or self.seed["sports_list"] is None:
+            return None
+        source, fetched_at, response = self.seed["sports_list"]
+        age = max(self.clock() - fetched_at, 0.0)
+        return dict(response, stale={
+            "reason": reason,
+            "fetched_at": datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat(),
+            "age_seconds": round(age, 3),
+            "seeded_from": source,
+        })
+    
+    def _odds_options(self, sport: str, regions: Optional[str], markets: Optional[str],
+                      date_format: Optional[str]) -> Dict[str, Any]:
+        """Build the /odds options of a tool call, with decimal prices."""
+        if not markets and _local("outrights").is_outright_sport(sport, self.outright_sports):
+            # Outright sports reject the API's default market
+            markets = _local("outrights").OUTRIGHTS_MARKET
+        
+        options = {"oddsFormat": _local("odds_format").CANONICAL_FORMAT}
+        if regions:
+            options["regions"] = regions
+        if markets:
+            options["markets"] = markets
+        if date_format:
+            options["dateFormat"] = date_format
+        return options
+    
+    async def _with_deadline(self, call: Awaitable, deadline_ms: Optional[float] = None) -> Any:
+        """
+        Await an upstream call within a time budget.
+        
+        The call keeps running after the deadline so its result still reaches
+        the caches; only this caller stops waiting for it.
+        
+        Args:
+            call: Awaitable performing the upstream call
+            deadline_ms: Budget in milliseconds. Defaults to the server deadline.
+            
+        Returns:
+            Result of the call
+            
+        Raises:
+            TimeoutError: If the deadline expires first
+        """
+        deadline_ms = self.deadline_ms if deadline_ms is None else deadline_ms
+        task = asyncio.ensure_future(call)
+        if deadline_ms is None:
+            return await task
+        # Retrieve a late failure so it is not reported as never retrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline_ms / 1000)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Deadline of {deadline_ms:g} ms exceeded")
+    
+    def _fetch_odds(self, sport: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fetch odds from the upstream API and store them in the cache.
+        
+        With a shared cache daemon attached, a snapshot fetched by another server
+        process is reused, and concurrent fetches of the same query across
+        processes are collapsed into one upstream call.
+        
+        Args:
+            sport: Sport key
+            options: Options passed to OddsClient.get_odds
+            
+        Returns:
+            Response from OddsClient.get_odds
+        """
+        fetched_at = None
+        fetched = True
+        if self.shared_cache is None:
+            result = self.client.get_odds(sport, options=options)
+        else:
+            result, fetched_at, fetched = self.shared_cache.single_flight(
+                json.dumps(_local("odds_cache").cache_key(sport, options)),
+                lambda: self.client.get_odds(sport, options=options),
+                max_age=self.cache.ttl
+            )
+            if fetched and "stale" not in result:
+                try:
+                    spent = int(float(result["headers"]["x-requests-last"]))
+                except (KeyError, TypeError, ValueError):
+                    spent = 0
+                self.shared_cache.record_quota(self.client.key_pool.usage(), spent)
+        
+        # A stale fallback from the client is not fresh data
+        if "stale" not in result:
+            # A snapshot fetched here is stamped when it is ingested
+            self.ingest_odds(sport, options, result, fetched_at=None if fetched else fetched_at, archive=fetched)
+        return result
+    
+    def ingest_odds(self, sport: str, options: Dict[str, Any], response: Dict[str, Any],
+                    fetched_at: Optional[float] = None, archive: bool = True) -> None:
+        """
+        Ingest an odds snapshot so tools can serve it.
+        
+        Live fetches and replayed snapshots both enter the server here.
+        
+        Args:
+            sport: Sport key
+            options: Options the snapshot was fetched with
+            response: Response in the OddsClient format
+            fetched_at: Epoch seconds the snapshot was fetched. Defaults to the server clock.
+            archive: Append the snapshot to the archive, if one is configured
+        """
+        with self._phase("ingest"):
+            self._ingest(sport, options, response, fetched_at, archive)
+    
+    def _ingest(self, sport: str, options: Dict[str, Any], response: Dict[str, Any],
+                fetched_at: Optional[float], archive: bool) -> None:
+        if isinstance(response.get("data"), list):
+            # Every retained snapshot then shares one copy of each repeated string
+            _local("symbols").intern_events(response["data"])
+        if archive and self.archive is not None:
+            try:
+                # Archived first: without a fetch time the archive stamps it under its lock,
+                # so concurrent ingests reach it in time order
+                fetched_at = self.archive.append_response(sport, response, fetched_at)
+            except (OSError, ValueError) as e:
+                # Losing history must not fail the tool call
+                print(f"Could not archive {sport} odds: {e}", file=sys.stderr)
+        if fetched_at is None:
+            fetched_at = self.clock()
+        self.cache.put(sport, options, response, fetched_at=fetched_at)
+        if isinstance(response.get("data"), list):
+            evicted = self.board.update(sport, response["data"], fetched_at, options)
+            for evicted_sport, event_ids in evicted.items():
+                self.game_lines.remove(evicted_sport, event_ids)
+                self.alerts.forget_events(event_ids)
+            # Summarized from the merged board, so markets fetched separately still combine
+            self.game_lines.update(sport, [self.board.event(sport, event["id"]) for event in response["data"]],
+                                   options.get("regions"))
+            # One refresh fans out to every subscriber whose threshold it crosses
+            for subscription in self.subscriptions.changes(sport, response["data"]):
+                self._notify(subscription)
+            if self.scheduler is not None:
+                self.scheduler.observe(sport, response["data"], fetched_at)
+            self.alerts.process(sport, response["data"], fetched_at)
+        for event in response.get("data") or []:
+            if isinstance(event, dict) and "sport_key" in event:
+                self.sports_seen.setdefault(event["sport_key"], event.get("sport_title", event["sport_key"]))
+        if archive and self.snapshot_store is not None:
+            try:
+                self.snapshot_store.put_response(sport, response, fetched_at, options)
+            except (OSError, ValueError) as e:
+                print(f"Could not store {sport} odds snapshot: {e}", file=sys.stderr)
+    
+    def _note_outright_sports(self, result: Dict[str, Any]) -> None:
+        """Remember the sports a mock or seeded /sports response flags as outright markets."""
+        for sport in result.get("data") or []:
+            if isinstance(sport, dict) and sport.get("has_outrights"):
+                self.outright_sports.add(sport["key"])
+    
+    def _format_odds(self, result: Dict[str, Any], odds_format: str) -> str:
+        """
+        Serialize an odds response, converting decimal prices to the requested format.
+        
+        Args:
+            result: Response with decimal prices
+            odds_format: One of SUPPORTED_FORMATS
+            
+        Returns:
+            JSON string with odds data
+        """
+        formats = _local("odds_format")
+        if odds_format != formats.CANONICAL_FORMAT and isinstance(result.get("data"), list):
+            with self._phase("transform"):
+                result = dict(result, data=formats.convert_events(result["data"], odds_format))
+        with self._phase("serialize"):
+            return json.dumps(result, indent=2)
+    
     async def _get_mock_data(self, filename: str) -> str:
         """
         Get mock data from a JSON file.
@@ -150,6 +1055,8 @@ class OddsMcpServer:
         Returns:
             JSON string with mock data
         """
+        if filename in self._mock_data:
+            return self._mock_data[filename]
         try:
             mock_file = self.mock_data_dir / filename
             if not mock_file.exists():
@@ -158,28 +1065,180 @@ class OddsMcpServer:
             with open(mock_file, "r") as f:
                 data = json.load(f)
                 
-            return json.dumps(data, indent=2)
+            # Fixtures never change while the server runs; load each one once
+            self._mock_data[filename] = json.dumps(data, indent=2)
+            return self._mock_data[filename]
         except Exception as e:
             return json.dumps({"error": f"Error loading mock data: {str(e)}"})
     
-    async def run(self):
-        """Run the MCP server."""
-        # FastMCP has a different API for running the server
-        # We need to use the run_stdio_async method directly
-        await self.server.run_stdio_async()
+    async def run(self, transport: str = "stdio", host: str = "127.0.0.1", port: int = 8000,
+                  max_connections: Optional[int] = None, shutdown_timeout: float = 10.0):
+        """
+        Run the MCP server.
+        
+        Network transports let many assistant sessions share this process, and
+        with it one warm cache and one quota ledger.
+        
+        Args:
+            transport: 'stdio', 'sse' or 'streamable-http'
+            host: Interface to bind for network transports
+            port: Port to bind for network transports
+            max_connections: Maximum concurrent HTTP connections; further
+                             connections are answered with 503. None is unlimited.
+            shutdown_timeout: Seconds to let open connections finish on shutdown
+        """
+        polling = None
+        if self.scheduler is not None and self.planner is not None:
+            # The planner fetches upstream (bypassing the cache) and ingests the result
+            polling = asyncio.create_task(self.scheduler.run(self.planner.get_odds))
+        try:
+            await self._serve(transport, host, port, max_connections, shutdown_timeout)
+        finally:
+            if polling is not None:
+                polling.cancel()
+    
+    async def _serve(self, transport: str, host: str, port: int, max_connections: Optional[int],
+                     shutdown_timeout: float):
+        if transport == "stdio":
+            # FastMCP has a different API for running the server
+            # We need to use the run_stdio_async method directly
+            await self.server.run_stdio_async()
+            return
+        
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport '{transport}', expected one of {', '.join(TRANSPORTS)}")
+        
+        import uvicorn
+        
+        self.server.settings.host = host
+        self.server.settings.port = port
+        security = self.server.settings.transport_security
+        if security is not None and f"{host}:*" not in security.allowed_hosts:
+            security.allowed_hosts.append(f"{host}:*")
+            security.allowed_origins.append(f"http://{host}:*")
+        
+        app = self.server.sse_app() if transport == "sse" else self.server.streamable_http_app()
+        config = uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level=self.server.settings.log_level.lower(),
+            limit_concurrency=max_connections,
+            timeout_graceful_shutdown=shutdown_timeout,
+        )
+        # uvicorn handles SIGINT/SIGTERM by draining connections before exiting
+        self.http_server = uvicorn.Server(config)
+        await self.http_server.serve()
+    
+    def shutdown(self):
+        """Ask a running network transport to shut down gracefully."""
+        if self.http_server is not None:
+            self.http_server.should_exit = True
             
 def main():
     """Run the MCP server as a standalone process."""
     # Parse arguments
     import argparse
     parser = argparse.ArgumentParser(description="Wagyu Sports MCP Server")
-    parser.add_argument("--api-key", help="API key for the Odds API")
+    parser.add_argument("--api-key", help="API key for the Odds API (comma-separate several keys to pool them)")
     parser.add_argument("--test-mode", action="store_true", help="Use mock data instead of real API calls")
+    parser.add_argument("--cache-ttl", type=float, default=60.0,
+                        help="Seconds to serve cached odds before refetching (default: 60)")
+    parser.add_argument("--deadline-ms", type=float, default=10000.0,
+                        help="Default time budget for live tool calls in milliseconds (default: 10000)")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="Send a hedged duplicate request after this latency percentile (e.g. 95)")
+    parser.add_argument("--planner-window", type=float, default=0.05,
+                        help="Seconds to collect get_odds requests before merging them (default: 0.05)")
+    parser.add_argument("--shared-cache", nargs="?", const=True, default=None, metavar="SOCKET",
+                        help="Attach to the shared cache daemon, starting it if needed "
+                             "(default socket: $WAGYU_CACHE_SOCKET or a per-user temp file)")
+    parser.add_argument("--archive", default=None, metavar="DIR",
+                        help="Append every fetched odds snapshot to the columnar archive in DIR")
+    parser.add_argument("--snapshots", default=None, metavar="DIR",
+                        help="Keep every fetched odds snapshot in the content-addressed store in DIR")
+    parser.add_argument("--replay", action="append", default=None, metavar="SOURCE",
+                        help="Serve recorded snapshots offline on a simulated clock (capture file, "
+                             "capture directory, capture log, snapshot store or archive; repeatable)")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Simulated seconds per real second for --replay; 0 replays as fast as possible (default: 1)")
+    parser.add_argument("--poll", action="append", default=None, metavar="SPORT",
+                        help="Refresh a sport's odds in the background on an adaptive schedule (repeatable)")
+    parser.add_argument("--poll-regions", default="us", help="Regions to poll with (default: us)")
+    parser.add_argument("--poll-markets", default="h2h", help="Markets to poll with (default: h2h)")
+    parser.add_argument("--poll-budget", type=float, default=60.0,
+                        help="Quota requests per hour background polling may spend (default: 60)")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Write CPU, allocation and phase profiles of sampled tool calls to DIR "
+                             "(default: $WAGYU_PROFILE_DIR, off if unset)")
+    parser.add_argument("--profile-rate", type=float, default=None, metavar="FRACTION",
+                        help="Fraction of tool calls to profile (default: $WAGYU_PROFILE_RATE or 1.0)")
+    parser.add_argument("--max-concurrent", type=int, default=None, metavar="N",
+                        help="Calls of each odds tool that may run at once, queued fairly across sessions "
+                             "beyond that (default: unlimited)")
+    parser.add_argument("--max-queue", type=int, default=32,
+                        help="Calls of each odds tool that may wait before new ones are shed (default: 32)")
+    parser.add_argument("--max-session-queue", type=int, default=4,
+                        help="Calls of each odds tool one session may have waiting (default: 4)")
+    parser.add_argument("--prefetch", type=float, default=None, metavar="FRACTION",
+                        help="Prefetch likely next odds requests, spending at most this fraction of the "
+                             "quota headroom (default: off)")
+    parser.add_argument("--seed", action="append", default=None, metavar="SOURCE",
+                        help="Seed the cache with the newest recorded snapshots in SOURCE (mocks_live, capture "
+                             "file or directory, capture log, snapshot store or archive; repeatable), served "
+                             "with their age when live fetches fail")
+    parser.add_argument("--stream-json", action="store_true",
+                        help="Parse odds responses incrementally to lower peak memory on very large "
+                             "responses, at some parsing speed (default: off)")
+    parser.add_argument("--transport", choices=TRANSPORTS, default="stdio",
+                        help="Transport to serve on (default: stdio)")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to bind for network transports (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind for network transports (default: 8000)")
+    parser.add_argument("--max-connections", type=int, default=None,
+                        help="Maximum concurrent connections for network transports (default: unlimited)")
+    parser.add_argument("--shutdown-timeout", type=float, default=10.0,
+                        help="Seconds to let connections finish on shutdown (default: 10)")
     args = parser.parse_args()
+    if args.shared_cache is True:
+        # Resolved after parsing so startup only loads the daemon module when it is used
+        args.shared_cache = _local("cache_daemon").default_socket_path()
     
     # Create and run server
-    server = OddsMcpServer(api_key=args.api_key, test_mode=args.test_mode)
-    asyncio.run(server.run())
+    poll = None
+    if args.poll:
+        poll = {sport: {"regions": args.poll_regions, "markets": args.poll_markets, "oddsFormat": "decimal"}
+                for sport in args.poll}
+    replay = None
+    if args.replay:
+        replay = _local("replay").create_replay(args.replay, speed=args.replay_speed or None,
+                                                cache_ttl=args.cache_ttl, deadline_ms=args.deadline_ms,
+                                                profile=args.profile, profile_rate=args.profile_rate)
+        server = replay.server
+    else:
+        server = OddsMcpServer(api_key=args.api_key, test_mode=args.test_mode,
+                               planner_window=args.planner_window, cache_ttl=args.cache_ttl,
+                               deadline_ms=args.deadline_ms, hedge_percentile=args.hedge_percentile,
+                               shared_cache=args.shared_cache, archive=args.archive,
+                               snapshots=args.snapshots, poll=poll, poll_budget=args.poll_budget,
+                               profile=args.profile, profile_rate=args.profile_rate,
+                               max_concurrent=args.max_concurrent, max_queue=args.max_queue,
+                               max_session_queue=args.max_session_queue, prefetch=args.prefetch,
+                               seed=args.seed, stream_json=args.stream_json)
+    
+    async def serve():
+        replay_task = None
+        if replay is not None:
+            replay_task = asyncio.create_task(replay.run())
+        try:
+            await server.run(transport=args.transport, host=args.host, port=args.port,
+                             max_connections=args.max_connections, shutdown_timeout=args.shutdown_timeout)
+        finally:
+            if replay_task is not None:
+                replay_task.cancel()
+                # Let the replay unwind before the loop closes
+                await asyncio.gather(replay_task, return_exceptions=True)
+    
+    asyncio.run(serve())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Odds Format Module
+
+This module converts decimal prices, the canonical format fetched from the
+Odds API, into the other odds formats offered by the MCP server.
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from fractions import Fraction
+from typing import Dict, List, Any, Callable, Union
+
+CANONICAL_FORMAT = "decimal"
+SUPPORTED_FORMATS = ("decimal", "american", "fractional", "implied", "hongkong")
+
+_CENT = Decimal("0.01")
+
+
+def _to_decimal(price: Union[int, float, str]) -> Decimal:
+    # Going through str() keeps the two-decimal value the API sent, not its binary float
+    try:
+        d = Decimal(str(price))
+    except InvalidOperation:
+        raise ValueError(f"Malformed price {price!r}")
+    if not d.is_finite():
+        raise ValueError(f"Malformed price {price!r}")
+    return d
+
+
+def _to_price(price: Union[int, float, str]) -> Decimal:
+    d = _to_decimal(price)
+    if d <= 1:
+        raise ValueError(f"Decimal price must be greater than 1.0, got {price}")
+    return d
+
+
+def decimal_to_american(price: float) -> int:
+    """
+    Convert a decimal price to American odds.
+
+    Uses the same rule as the Odds API: prices of 2.0 and above become
+    positive odds ``(price - 1) * 100``, shorter prices become ``-100 / (price - 1)``,
+    both rounded half away from zero to a whole number.
+
+    Args:
+        price (float): Decimal price greater than 1.0
+
+    Returns:
+        int: American odds
+
+    Raises:
+        ValueError: If the price is not greater than 1.0
+    """
+    d = _to_price(price)
+    if d >= 2:
+        american = (d - 1) * 100
+    else:
+        american = Decimal(-100) / (d - 1)
+    return int(american.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def american_to_decimal(odds: int) -> float:
+    """
+    Convert American odds to a decimal price rounded to two places.
+
+    Args:
+        odds (int): American odds (e.g., -110 or 150)
+
+    Returns:
+        float: Decimal price
+
+    Raises:
+        ValueError: If the odds are between -100 and 100 exclusive
+    """
+    a = _to_decimal(odds)
+    if -100 < a < 100:
+        raise ValueError(f"American odds must be <= -100 or >= 100, got {odds}")
+    if a > 0:
+        d = 1 + a / 100
+    else:
+        d = 1 + Decimal(100) / -a
+    return float(d.quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+def decimal_to_fractional(price: float) -> str:
+    """
+    Convert a decimal price to exact, reduced fractional odds.
+
+    Args:
+        price (float): Decimal price greater than 1.0
+
+    Returns:
+        str: Fractional odds (e.g., '1/2' for 1.5)
+
+    Raises:
+        ValueError: If the price is not greater than 1.0
+    """
+    profit = Fraction(_to_price(price)) - 1
+    return f"{profit.numerator}/{profit.denominator}"
+
+
+def decimal_to_implied(price: float) -> float:
+    """
+    Convert a decimal price to an implied probability rounded to four places.
+
+    Args:
+        price (float): Decimal price greater than 1.0
+
+    Returns:
+        float: Implied probability between 0 and 1
+
+    Raises:
+        ValueError: If the price is not greater than 1.0
+    """
+    return float((1 / _to_price(price)).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP))
+
+
+def decimal_to_hongkong(price: float) -> float:
+    """
+    Convert a decimal price to Hong Kong odds (profit per unit staked).
+
+    Args:
+        price (float): Decimal price greater than 1.0
+
+    Returns:
+        float: Hong Kong odds
+
+    Raises:
+        ValueError: If the price is not greater than 1.0
+    """
+    return float((_to_price(price) - 1).quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+_CONVERTERS: Dict[str, Callable[[float], Any]] = {
+    "american": decimal_to_american,
+    "fractional": decimal_to_fractional,
+    "implied": decimal_to_implied,
+    "hongkong": decimal_to_hongkong,
+}
+
+
+def convert_price(price: float, odds_format: str) -> Any:
+    """
+    Convert a single decimal price.
+
+    Args:
+        price (float): Decimal price
+        odds_format (str): One of ``SUPPORTED_FORMATS``
+
+    Returns:
+        Any: Price in the requested format
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if odds_format == CANONICAL_FORMAT:
+        return price
+    if odds_format not in _CONVERTERS:
+        raise ValueError(f"Unsupported odds format '{odds_format}', expected one of {', '.join(SUPPORTED_FORMATS)}")
+    return _CONVERTERS[odds_format](price)
+
+
+def convert_events(events: List[Dict[str, Any]], odds_format: str) -> List[Dict[str, Any]]:
+    """
+    Convert every outcome price in a list of /odds events.
+
+    Each distinct price is converted once, since a slate repeats the same
+    handful of prices across books and markets.
+
+    Args:
+        events (List[Dict[str, Any]]): Events with decimal prices
+        odds_format (str): One of ``SUPPORTED_FORMATS``
+
+    Returns:
+        List[Dict[str, Any]]: New event list; the input is not modified
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if odds_format == CANONICAL_FORMAT:
+        return events
+    convert = _CONVERTERS.get(odds_format)
+    if convert is None:
+        raise ValueError(f"Unsupported odds format '{odds_format}', expected one of {', '.join(SUPPORTED_FORMATS)}")
+
+    memo: Dict[float, Any] = {}
+
+    def price_of(price):
+        if price not in memo:
+            memo[price] = convert(price)
+        return memo[price]
+
+    return [
+        dict(event, bookmakers=[
+            dict(bookmaker, markets=[
+                dict(market, outcomes=[
+                    dict(outcome, price=price_of(outcome["price"])) if "price" in outcome else outcome
+                    for outcome in market.get("outcomes", [])
+                ])
+                for market in bookmaker.get("markets", [])
+            ])
+            for bookmaker in event.get("bookmakers", [])
+        ])
+        for event in events
+    ]
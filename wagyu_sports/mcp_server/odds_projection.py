@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Odds Projection Module
+
+This module provides helpers for reasoning about /odds request parameters:
+quota cost estimation, bookmaker region lookup, and projecting a broad
+response down to the markets and regions a narrower request asked for.
+"""
+from typing import Dict, List, Optional, Any, FrozenSet, Iterable
+
+
+# Bookmaker keys by region, as listed in The Odds API v4 documentation.
+# A few books are offered in more than one region.
+_REGION_BOOKMAKERS = {
+    "us": [
+        "betonlineag", "betmgm", "betrivers", "betus", "bovada", "draftkings",
+        "fanatics", "fanduel", "lowvig", "mybookieag", "williamhill_us",
+    ],
+    "us2": [
+        "ballybet", "betanysports", "betparx", "espnbet", "fliff",
+        "hardrockbet", "windcreek",
+    ],
+    "uk": [
+        "betfair_ex_uk", "betfair_sb_uk", "betvictor", "betway", "boylesports",
+        "casumo", "coral", "grosvenor", "ladbrokes_uk", "leovegas",
+        "livescorebet", "matchbook", "paddypower", "skybet", "smarkets",
+        "sport888", "unibet_uk", "virginbet", "williamhill",
+    ],
+    "eu": [
+        "betanysports", "betclic_fr", "betfair_ex_eu", "betonlineag", "betsson",
+        "coolbet", "everygame", "gtbets", "marathonbet", "matchbook",
+        "mybookieag", "nordicbet", "onexbet", "pinnacle", "suprabets",
+        "tipico_de", "unibet_fr", "unibet_it", "unibet_nl", "williamhill",
+        "winamax_de", "winamax_fr",
+    ],
+    "au": [
+        "betfair_ex_au", "betr_au", "betright", "bet365_au", "boombet",
+        "dabble_au", "ladbrokes_au", "neds", "playup", "pointsbetau",
+        "sportsbet", "tab", "tabtouch", "unibet",
+    ],
+}
+
+BOOKMAKER_REGIONS: Dict[str, FrozenSet[str]] = {}
+for _region, _books in _REGION_BOOKMAKERS.items():
+    for _book in _books:
+        BOOKMAKER_REGIONS[_book] = BOOKMAKER_REGIONS.get(_book, frozenset()) | {_region}
+
+# Market requested by the API when the markets parameter is omitted
+DEFAULT_MARKETS = frozenset({"h2h"})
+
+
+def split_csv(value: Optional[str]) -> FrozenSet[str]:
+    """
+    Split a comma-separated query parameter into a set of values.
+
+    Args:
+        value (str, optional): Comma-separated value (e.g., 'h2h,spreads')
+
+    Returns:
+        FrozenSet[str]: Stripped, non-empty values
+    """
+    if not value:
+        return frozenset()
+    return frozenset(part.strip() for part in str(value).split(",") if part.strip())
+
+
+def join_csv(values: Iterable[str]) -> str:
+    """
+    Join values into a canonical (sorted) comma-separated parameter.
+
+    Args:
+        values (Iterable[str]): Values to join
+
+    Returns:
+        str: Comma-separated string
+    """
+    return ",".join(sorted(values))
+
+
+def estimate_cost(markets: Iterable[str], regions: Iterable[str]) -> int:
+    """
+    Estimate the quota cost of an /odds request.
+
+    The Odds API charges one request per market per region.
+
+    Args:
+        markets (Iterable[str]): Requested markets
+        regions (Iterable[str]): Requested regions
+
+    Returns:
+        int: Estimated number of quota requests consumed
+    """
+    return max(len(set(markets)), 1) * max(len(set(regions)), 1)
+
+
+def project_events(events: List[Dict[str, Any]],
+                   markets: Optional[Iterable[str]] = None,
+                   regions: Optional[Iterable[str]] = None,
+                   source_regions: Optional[Iterable[str]] = None,
+                   bookmakers: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Project a list of events down to a subset of markets, regions and bookmakers.
+
+    Bookmakers are only filtered by region when ``regions`` is narrower than
+    ``source_regions``; in that case bookmakers missing from
+    ``BOOKMAKER_REGIONS`` are dropped because they cannot be attributed.
+    Bookmakers left without any markets are removed, events are always kept.
+
+    Args:
+        events (List[Dict[str, Any]]): Events as returned by the /odds endpoint
+        markets (Iterable[str], optional): Markets to keep. None keeps all.
+        regions (Iterable[str], optional): Regions to keep. None keeps all.
+        source_regions (Iterable[str], optional): Regions the events were fetched for
+        bookmakers (Iterable[str], optional): Bookmaker keys to keep. None keeps all.
+
+    Returns:
+        List[Dict[str, Any]]: New event list; the input is not modified
+    """
+    keep_markets = frozenset(markets) if markets is not None else None
+    keep_regions = frozenset(regions) if regions is not None else None
+    keep_bookmakers = frozenset(bookmakers) if bookmakers is not None else None
+    if keep_regions is not None and source_regions is not None and keep_regions >= frozenset(source_regions):
+        keep_regions = None
+
+    projected = []
+    for event in events:
+        kept = []
+        for bookmaker in event.get("bookmakers", []):
+            if keep_bookmakers is not None and bookmaker.get("key") not in keep_bookmakers:
+                continue
+            if keep_regions is not None and not (BOOKMAKER_REGIONS.get(bookmaker.get("key"), frozenset()) & keep_regions):
+                continue
+            book_markets = bookmaker.get("markets", [])
+            if keep_markets is not None:
+                book_markets = [m for m in book_markets if m.get("key") in keep_markets]
+                if not book_markets:
+                    continue
+            kept.append(dict(bookmaker, markets=book_markets))
+        projected.append(dict(event, bookmakers=kept))
+    return projected
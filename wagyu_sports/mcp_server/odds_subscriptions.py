@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Odds Subscriptions Module
+
+This module tracks MCP resource subscriptions to odds, such as
+``odds://basketball_nba/<event_id>?price=0.05&point=0.5``. Each subscription
+remembers the prices and points it was last notified about. An incoming
+snapshot fires a subscription only when one of its lines has moved by at
+least the subscriber's threshold since then. Subscriptions are indexed by
+sport and event, so a snapshot only visits the subscriptions it touches.
+
+URI forms:
+
+- ``odds://{sport}/{event_id}``: one event
+- ``odds://{sport}``: every event of a sport
+
+Query parameters ``price`` (decimal price change) and ``point`` (spread or
+total change) set the thresholds. Without them, any change fires.
+"""
+import threading
+from urllib.parse import urlsplit, parse_qs
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    # When imported as a package
+    from . import symbols
+except ImportError:
+    # When run directly
+    import symbols
+
+
+def parse_odds_uri(uri: str) -> Tuple[str, Optional[str], float, float]:
+    """
+    Parse an odds resource URI.
+
+    Args:
+        uri (str): Resource URI
+
+    Returns:
+        Tuple[str, Optional[str], float, float]: Sport, event ID (None for the whole
+            sport), price threshold and point threshold
+
+    Raises:
+        ValueError: If the URI is not an odds:// URI
+    """
+    parts = urlsplit(uri)
+    if parts.scheme != "odds" or not parts.netloc:
+        raise ValueError(f"Not an odds resource URI: {uri}")
+    query = parse_qs(parts.query)
+    event_id = parts.path.strip("/") or None
+    return (parts.netloc, event_id,
+            float(query.get("price", ["0"])[0]), float(query.get("point", ["0"])[0]))
+
+
+def _lines(event: Dict[str, Any]) -> Dict[symbols.Line, Tuple[float, Optional[float]]]:
+    return {line: (outcome["price"], outcome.get("point")) for line, outcome in symbols.iter_lines(event)}
+
+
+class Subscription:
+    """One session's subscription to an odds URI."""
+
+    def __init__(self, session: Any, uri: str):
+        self.session = session
+        self.uri = uri
+        self.sport, self.event_id, self.price_threshold, self.point_threshold = parse_odds_uri(uri)
+        self.baseline: Dict[symbols.Line, Tuple[float, Optional[float]]] = {}
+
+    def crossed(self, lines: Dict[symbols.Line, Tuple[float, Optional[float]]]) -> bool:
+        """Whether any line moved by at least a threshold since the last notification."""
+        for line, (price, point) in lines.items():
+            known = self.baseline.get(line)
+            if known is None:
+                return True
+            price_move = abs(price - known[0])
+            if price_move and price_move >= self.price_threshold:
+                return True
+            if point is not None and known[1] is not None:
+                point_move = abs(point - known[1])
+                if point_move and point_move >= self.point_threshold:
+                    return True
+        return False
+
+
+class SubscriptionRegistry:
+    """Subscriptions indexed by sport and event."""
+
+    def __init__(self):
+        self._by_target: Dict[Tuple[str, Optional[str]], Dict[Tuple[int, str], Subscription]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"notifications": 0}
+
+    def subscribe(self, session: Any, uri: str, events: Optional[List[Dict[str, Any]]] = None) -> Subscription:
+        """
+        Add or replace a session's subscription.
+
+        Args:
+            session: MCP session to notify
+            uri (str): Odds resource URI
+            events (List[Dict[str, Any]], optional): Current odds of the sport, used as the
+                starting point for thresholds
+
+        Returns:
+            Subscription: The subscription
+        """
+        subscription = Subscription(session, uri)
+        for event in events or []:
+            if subscription.event_id in (None, event["id"]):
+                subscription.baseline.update(_lines(event))
+        with self._lock:
+            target = self._by_target.setdefault((subscription.sport, subscription.event_id), {})
+            target[id(session), uri] = subscription
+        return subscription
+
+    def unsubscribe(self, session: Any, uri: str) -> None:
+        """
+        Remove a session's subscription.
+
+        Args:
+            session: MCP session
+            uri (str): Odds resource URI it subscribed to
+        """
+        sport, event_id, _, _ = parse_odds_uri(uri)
+        with self._lock:
+            target = self._by_target.get((sport, event_id), {})
+            target.pop((id(session), uri), None)
+            if not target:
+                self._by_target.pop((sport, event_id), None)
+
+    def drop_session(self, session: Any) -> None:
+        """
+        Remove every subscription of a closed session.
+
+        Args:
+            session: MCP session
+        """
+        with self._lock:
+            for key in list(self._by_target):
+                target = self._by_target[key]
+                for sub_key in [k for k in target if k[0] == id(session)]:
+                    del target[sub_key]
+                if not target:
+                    del self._by_target[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(target) for target in self._by_target.values())
+
+    def changes(self, sport: str, events: List[Dict[str, Any]]) -> List[Subscription]:
+        """
+        Find the subscriptions a snapshot should notify, and move their baselines.
+
+        Args:
+            sport (str): Sport key
+            events (List[Dict[str, Any]]): Events from the snapshot
+
+        Returns:
+            List[Subscription]: Subscriptions to notify, each at most once
+        """
+        fired: Dict[Tuple[int, str], Subscription] = {}
+        with self._lock:
+            sport_wide = list(self._by_target.get((sport, None), {}).items())
+            for event in events:
+                candidates = sport_wide + list(self._by_target.get((sport, event["id"]), {}).items())
+                if not candidates:
+                    continue
+                lines = _lines(event)
+                for key, subscription in candidates:
+                    if subscription.crossed(lines):
+                        fired[key] = subscription
+                        subscription.baseline.update(lines)
+            self.stats["notifications"] += len(fired)
+        return list(fired.values())
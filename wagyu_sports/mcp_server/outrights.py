@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Outrights Module
+
+This module compares futures (outright) odds across books, e.g. every
+team's price to win the Super Bowl. Outright markets list dozens to
+hundreds of contenders per book, and books list them in different orders,
+so matching contenders by scanning each book's outcome list is quadratic.
+
+Instead, one pass over every book's outcomes folds each price into an entry
+indexed by outcome name. An entry keeps the best and worst price, the books
+offering them, and the sum of implied probabilities, which is enough to
+rank every contender by consensus and report the cross-book spread without
+revisiting any book.
+
+Prices are decimal; higher is better for the bettor.
+"""
+from typing import Dict, List, Optional, Any
+
+# The only market offered for outright sports
+OUTRIGHTS_MARKET = "outrights"
+
+
+def is_outright_sport(sport: str, known: Optional[set] = None) -> bool:
+    """
+    Whether a sport key is a futures market.
+
+    Args:
+        sport (str): Sport key (e.g., 'basketball_nba_championship_winner')
+        known (set, optional): Sport keys flagged ``has_outrights`` by /sports
+
+    Returns:
+        bool: True for outright sports
+    """
+    return sport.endswith("_winner") or (known is not None and sport in known)
+
+
+class Contender:
+    """Running cross-book figures for one outcome of an outright market."""
+
+    __slots__ = ("name", "best_price", "best_books", "worst_price", "worst_book", "books", "implied_total")
+
+    def __init__(self, name: str, price: float, book: str):
+        self.name = name
+        self.best_price = price
+        self.best_books = [book]
+        self.worst_price = price
+        self.worst_book = book
+        self.books = 1
+        self.implied_total = 1 / price
+
+    def add(self, price: float, book: str) -> None:
+        """Fold in another book's price."""
+        if price > self.best_price:
+            self.best_price = price
+            self.best_books = [book]
+        elif price == self.best_price:
+            self.best_books.append(book)
+        if price < self.worst_price:
+            self.worst_price = price
+            self.worst_book = book
+        self.books += 1
+        self.implied_total += 1 / price
+
+    @property
+    def consensus_probability(self) -> float:
+        """Mean implied probability across the books offering this contender."""
+        return self.implied_total / self.books
+
+    def describe(self) -> Dict[str, Any]:
+        """
+        Describe the contender with decimal prices.
+
+        Returns:
+            Dict[str, Any]: Best and worst price with their books, the number of books,
+                the consensus probability and the spread between best and worst price
+                (``spread_pct``: how much more the best price pays than the worst)
+        """
+        return {
+            "name": self.name,
+            "best_price": self.best_price,
+            "best_books": self.best_books,
+            "worst_price": self.worst_price,
+            "worst_book": self.worst_book,
+            "books": self.books,
+            "consensus_probability": round(self.consensus_probability, 4),
+            "spread_pct": round((self.best_price / self.worst_price - 1) * 100, 1),
+        }
+
+
+def compare_event(event: Dict[str, Any], market: str = OUTRIGHTS_MARKET) -> List[Contender]:
+    """
+    Compare a market's prices across every book of an event in one pass.
+
+    Args:
+        event (Dict[str, Any]): Event in the /odds shape with decimal prices
+        market (str): Market key to compare
+
+    Returns:
+        List[Contender]: Contenders ranked by consensus probability, favourite first
+    """
+    contenders: Dict[str, Contender] = {}
+    for bookmaker in event.get("bookmakers", []):
+        book = bookmaker["key"]
+        for book_market in bookmaker.get("markets", []):
+            if book_market["key"] != market:
+                continue
+            for outcome in book_market.get("outcomes", []):
+                price = outcome.get("price")
+                if not price or price <= 1:
+                    continue
+                contender = contenders.get(outcome["name"])
+                if contender is None:
+                    contenders[outcome["name"]] = Contender(outcome["name"], price, book)
+                else:
+                    contender.add(price, book)
+    return sorted(contenders.values(), key=lambda contender: (-contender.consensus_probability, contender.name))
+
+
+def compare_outrights(events: List[Dict[str, Any]], market: str = OUTRIGHTS_MARKET,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Rank every contender of each event's outright market.
+
+    Args:
+        events (List[Dict[str, Any]]): Events from an /odds response with decimal prices
+        market (str): Market key to compare
+        limit (int, optional): Contenders to keep per event, favourites first. Defaults to all.
+
+    Returns:
+        List[Dict[str, Any]]: Per event, its identity, the number of books quoting it and
+            the ranked contenders (each with a 1-based ``rank``); events without the
+            market are left out
+    """
+    compared = []
+    for event in events:
+        contenders = compare_event(event, market)
+        if not contenders:
+            continue
+        ranked = []
+        for rank, contender in enumerate(contenders[:limit], 1):
+            ranked.append(dict(contender.describe(), rank=rank))
+        compared.append({
+            "event_id": event["id"],
+            "sport_key": event.get("sport_key"),
+            "sport_title": event.get("sport_title"),
+            "commence_time": event.get("commence_time"),
+            "books": sum(1 for bookmaker in event.get("bookmakers", [])
+                         if any(m["key"] == market for m in bookmaker.get("markets", []))),
+            "contenders": len(contenders),
+            "ranked": ranked,
+        })
+    return compared
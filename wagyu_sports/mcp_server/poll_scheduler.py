@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Wagyu Sports Polling Scheduler
+
+This module decides how often to refresh the odds of each polled sport. A
+sport's interval follows its most urgent event: games in progress are polled
+fastest, then games about to start, while slates days away are polled rarely.
+Recently observed price movement shortens the interval further. The whole
+plan is stretched to fit a global quota budget per hour.
+"""
+import sys
+import time
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Callable, Awaitable, Tuple
+
+try:
+    # When imported as a package
+    from .odds_projection import split_csv, estimate_cost
+    from . import symbols
+except ImportError:
+    # When run directly
+    from odds_projection import split_csv, estimate_cost
+    import symbols
+
+# (seconds until commence, polling interval in seconds), most urgent first
+COMMENCE_TIERS = [
+    (3600.0, 60.0),
+    (6 * 3600.0, 300.0),
+    (24 * 3600.0, 900.0),
+    (72 * 3600.0, 3600.0),
+]
+IN_PLAY_INTERVAL = 30.0
+IDLE_INTERVAL = 6 * 3600.0
+
+# How long after commence a game is treated as in play
+DEFAULT_GAME_LENGTH = 4 * 3600.0
+
+# Mean move in implied probability per snapshot that doubles the polling rate
+VOLATILITY_REFERENCE = 0.01
+MAX_VOLATILITY_SPEEDUP = 4.0
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class PollTarget:
+    """A sport being polled and what it has been observed to contain."""
+
+    def __init__(self, sport: str, options: Dict[str, Any]):
+        self.sport = sport
+        self.options = dict(options)
+        self.cost = estimate_cost(split_csv(options.get("markets")), split_csv(options.get("regions")))
+        self.commence_times: List[float] = []
+        self.volatility = 0.0
+        self.prices: Dict[symbols.Line, float] = {}
+        self.last_polled: Optional[float] = None
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+
+class PollScheduler:
+    """Adaptive refresh plan for a set of sports under a quota budget."""
+
+    def __init__(self, targets: Dict[str, Dict[str, Any]], budget_per_hour: float = 60.0,
+                 min_interval: float = 15.0, game_length: float = DEFAULT_GAME_LENGTH,
+                 smoothing: float = 0.3, clock: Callable[[], float] = time.time):
+        """
+        Initialize the scheduler.
+
+        Args:
+            targets: Sport key -> /odds options to poll it with (regions, markets)
+            budget_per_hour: Quota requests the plan may spend per hour
+            min_interval: Shortest interval in seconds for any sport
+            game_length: Seconds after commence a game counts as in play
+            smoothing: Weight of the newest observation in the volatility average
+            clock: Time source returning epoch seconds
+        """
+        self.targets = {sport: PollTarget(sport, options) for sport, options in targets.items()}
+        self.budget_per_hour = budget_per_hour
+        self.min_interval = min_interval
+        self.game_length = game_length
+        self.smoothing = smoothing
+        self.clock = clock
+        self.polls = 0
+        self.failures = 0
+
+    def observe(self, sport: str, events: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> None:
+        """
+        Record a fresh snapshot of a sport, however it was fetched.
+
+        Args:
+            sport: Sport key
+            events: Events from the /odds response
+            fetched_at: Epoch seconds the snapshot was fetched. Defaults to now.
+        """
+        target = self.targets.get(sport)
+        if target is None:
+            return
+        target.last_polled = self.clock() if fetched_at is None else fetched_at
+        target.commence_times = [t for t in (_parse_time(e.get("commence_time")) for e in events) if t is not None]
+
+        prices = {}
+        moves = []
+        for event in events:
+            for line, outcome in symbols.iter_lines(event):
+                prices[line] = outcome["price"]
+                if line in target.prices:
+                    moves.append(abs(1 / outcome["price"] - 1 / target.prices[line]))
+        if moves:
+            move = sum(moves) / len(moves)
+            target.volatility += self.smoothing * (move - target.volatility)
+        target.prices = prices
+
+    def _base_interval(self, target: PollTarget, now: float) -> Tuple[float, str]:
+        upcoming = []
+        for commence in target.commence_times:
+            if commence <= now < commence + self.game_length:
+                return IN_PLAY_INTERVAL, "in play"
+            if commence > now:
+                upcoming.append(commence - now)
+        if not upcoming:
+            return IDLE_INTERVAL, "no upcoming events"
+        soonest = min(upcoming)
+        for horizon, interval in COMMENCE_TIERS:
+            if soonest <= horizon:
+                return interval, f"next event in {soonest / 3600:.1f}h"
+        return IDLE_INTERVAL, f"next event in {soonest / 3600:.1f}h"
+
+    def plan(self) -> Dict[str, Any]:
+        """
+        Get the current polling plan.
+
+        Returns:
+            Dict[str, Any]: Per-sport interval, reason, next due time, quota burn and
+                failed polls, plus the total estimated burn per hour against the budget
+                and the background polls run and failed so far
+        """
+        now = self.clock()
+        entries = {}
+        for sport, target in self.targets.items():
+            interval, reason = self._base_interval(target, now)
+            speedup = min(1 + target.volatility / VOLATILITY_REFERENCE, MAX_VOLATILITY_SPEEDUP)
+            entries[sport] = {"interval": max(interval / speedup, self.min_interval), "reason": reason,
+                              "volatility": round(target.volatility, 5), "failures": target.failures,
+                              "last_error": target.last_error}
+
+        burn = sum(self.targets[s].cost * 3600 / e["interval"] for s, e in entries.items())
+        stretch = max(burn / self.budget_per_hour, 1.0) if self.budget_per_hour > 0 else float("inf")
+        total = 0.0
+        for sport, entry in entries.items():
+            target = self.targets[sport]
+            entry["interval"] = entry["interval"] * stretch
+            entry["cost"] = target.cost
+            entry["burn_per_hour"] = round(target.cost * 3600 / entry["interval"], 2)
+            entry["next_due"] = now if target.last_polled is None else target.last_polled + entry["interval"]
+            total += entry["burn_per_hour"]
+        return {
+            "sports": entries,
+            "burn_per_hour": round(total, 2),
+            "budget_per_hour": self.budget_per_hour,
+            "throttled": stretch > 1.0,
+            "polls": self.polls,
+            "failures": self.failures,
+        }
+
+    def due(self) -> List[str]:
+        """
+        Get the sports whose refresh is due now, most overdue first.
+
+        Returns:
+            List[str]: Sport keys
+        """
+        now = self.clock()
+        entries = self.plan()["sports"]
+        due = [sport for sport, entry in entries.items() if entry["next_due"] <= now]
+        return sorted(due, key=lambda sport: entries[sport]["next_due"])
+
+    async def run(self, poll: Callable[[str, Dict[str, Any]], Awaitable[Any]]) -> None:
+        """
+        Poll sports as they fall due until cancelled.
+
+        The poll callback is expected to feed its result back through observe()
+        (OddsMcpServer does this in its ingestion path).
+
+        Args:
+            poll: Coroutine function fetching a sport with the given options
+        """
+        while True:
+            for sport in self.due():
+                target = self.targets[sport]
+                started = self.clock()
+                try:
+                    await poll(sport, dict(target.options))
+                except Exception as e:
+                    target.failures += 1
+                    target.last_error = str(e) or type(e).__name__
+                    self.failures += 1
+                    print(f"Background poll of {sport} odds failed: {target.last_error}", file=sys.stderr)
+                self.polls += 1
+                # A failed poll also waits a full interval rather than spinning
+                target.last_polled = max(target.last_polled or started, started)
+            next_due = min((entry["next_due"] for entry in self.plan()["sports"].values()), default=None)
+            delay = 60.0 if next_due is None else next_due - self.clock()
+            await asyncio.sleep(min(max(delay, 1.0), 60.0))
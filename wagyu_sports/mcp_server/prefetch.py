@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Prefetch Module
+
+This module learns which /odds request a session usually makes next and
+warms the cache for it while the assistant is still reading the previous
+answer.
+
+Each tool call is reduced to a state: the tool plus the markets it asked
+for (``get_sports``, ``get_odds:h2h``, ...). For every state, the module
+counts the /odds requests that followed it in the same session. A request
+on the same sport as the previous call is counted as "same sport", so the
+pattern generalizes from one sport to the next:
+
+- after ``get_sports``: ``basketball_nba`` h2h/us, seen 12 times out of 20
+- after ``get_odds:h2h``: same sport, h2h,spreads,totals/us, seen 9 times out of 15
+
+Once a state has been left often enough, the requests that followed it
+often enough are predicted. Prefetching spends real quota, so the caller
+only prefetches while prefetches have used less than ``quota_slice`` of the
+quota headroom seen, and, under admission control, only when a tool slot is
+free with no call waiting for one. A prefetch counts as a hit when a later tool call is
+answered from the cache by it before it expires.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Hashable, Tuple
+
+try:
+    # When imported as a package
+    from .odds_projection import split_csv, DEFAULT_MARKETS
+except ImportError:
+    # When run directly
+    from odds_projection import split_csv, DEFAULT_MARKETS
+
+# Marks a predicted request on the same sport as the call it follows
+SAME_SPORT = "="
+
+# Sessions whose last call is remembered
+MAX_SESSIONS = 1024
+
+
+def _options_key(options: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(options.items()))
+
+
+class Prefetcher:
+    """Transition counts between tool calls, prefetch budget and hit rate."""
+
+    def __init__(self, quota_slice: float = 0.05, min_count: int = 3, min_probability: float = 0.3,
+                 max_predictions: int = 2, ttl: float = 60.0, clock: Callable[[], float] = time.time):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            quota_slice (float): Largest fraction of the quota headroom that prefetches may spend
+            min_count (int): Times a state must have been left before predicting from it
+            min_probability (float): Share of a state's next requests a request needs to be predicted
+            max_predictions (int): Requests predicted after one call
+            ttl (float): Seconds a prefetched response stays fresh (the cache TTL)
+            clock (Callable[[], float]): Time source returning epoch seconds
+        """
+        if not 0 < quota_slice <= 1:
+            raise ValueError(f"Quota slice must be between 0 and 1, got {quota_slice}")
+        self.quota_slice = quota_slice
+        self.min_count = min_count
+        self.min_probability = min_probability
+        self.max_predictions = max_predictions
+        self.ttl = ttl
+        self.clock = clock
+        # state -> Counter of (sport or SAME_SPORT, options key)
+        self.transitions: Dict[str, Counter] = {}
+        # session -> (state, sport) of its last call
+        self._last: "OrderedDict[Hashable, Tuple[str, Optional[str]]]" = OrderedDict()
+        # Prefetched and not yet used: (sport, markets, regions, fetched at)
+        self._pending: List[Tuple[str, frozenset, frozenset, float]] = []
+        self.spent = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self.stats = {"observed": 0, "predicted": 0, "prefetched": 0, "skipped_cached": 0,
+                      "skipped_budget": 0, "skipped_busy": 0, "failed": 0, "hits": 0, "expired": 0}
+
+    def observe(self, session: Hashable, tool: str, fetch: Optional[Tuple[str, Dict[str, Any]]]
+                ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Learn from a finished tool call and predict the session's next request.
+
+        Args:
+            session (Hashable): Key of the calling session
+            tool (str): Tool name
+            fetch (Tuple[str, Dict[str, Any]], optional): Sport and /odds options the call
+                needed, or None for a call without odds (e.g. get_sports)
+
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: Predicted (sport, options) requests, most likely first
+        """
+        sport, options = fetch if fetch is not None else (None, None)
+        state = tool if options is None else f"{tool}:{options.get('markets', '')}"
+        with self._lock:
+            self.stats["observed"] += 1
+            previous = self._last.pop(session, None)
+            if previous is not None and fetch is not None:
+                previous_state, previous_sport = previous
+                target = SAME_SPORT if sport == previous_sport else sport
+                self.transitions.setdefault(previous_state, Counter())[(target, _options_key(options))] += 1
+            self._last[session] = (state, sport)
+            while len(self._last) > MAX_SESSIONS:
+                self._last.popitem(last=False)
+
+            counts = self.transitions.get(state)
+            if not counts:
+                return []
+            total = sum(counts.values())
+            if total < self.min_count:
+                return []
+            predictions = []
+            for (target, options_key), count in counts.most_common():
+                if len(predictions) == self.max_predictions or count / total < self.min_probability:
+                    break
+                if target == SAME_SPORT:
+                    if sport is None:
+                        continue
+                    target = sport
+                predictions.append((target, dict(options_key)))
+            self.stats["predicted"] += len(predictions)
+            return predictions
+
+    def allow(self, cost: int, remaining: Optional[int], cached: bool = False, busy: bool = False) -> bool:
+        """
+        Reserve quota for a prefetch if it is needed and the budget allows it.
+
+        Args:
+            cost (int): Estimated quota cost of the request
+            remaining (int, optional): Quota remaining upstream; None when unknown
+            cached (bool): Whether the cache already answers the request
+            busy (bool): Whether tool calls are using or waiting for every admission slot
+
+        Returns:
+            bool: True if the prefetch may be sent (its cost is then counted as spent)
+        """
+        with self._lock:
+            if busy:
+                self.stats["skipped_busy"] += 1
+                return False
+            if cached:
+                self.stats["skipped_cached"] += 1
+                return False
+            # Prefetches may use quota_slice of the headroom there was before they started
+            if remaining is None or self.spent + cost > self.quota_slice * (remaining + self.spent):
+                self.stats["skipped_budget"] += 1
+                return False
+            self.spent += cost
+            return True
+
+    def prefetched(self, sport: str, options: Dict[str, Any]) -> None:
+        """Record a request sent ahead of time."""
+        with self._lock:
+            self.stats["prefetched"] += 1
+            self._pending.append((sport, split_csv(options.get("markets")) or DEFAULT_MARKETS,
+                                  split_csv(options.get("regions")), self.clock()))
+
+    def failed(self, error: Exception) -> None:
+        """Record a prefetch that failed; nobody is waiting for it, so it is only counted."""
+        with self._lock:
+            self.stats["failed"] += 1
+            self.last_error = str(error)
+
+    def served(self, sport: str, options: Dict[str, Any]) -> bool:
+        """
+        Record a request answered from the cache, counting a hit if a prefetch covered it.
+
+        Args:
+            sport (str): Sport key
+            options (Dict[str, Any]): Request options
+
+        Returns:
+            bool: True if a prefetch was used
+        """
+        markets = split_csv(options.get("markets")) or DEFAULT_MARKETS
+        regions = split_csv(options.get("regions"))
+        now = self.clock()
+        with self._lock:
+            live = [entry for entry in self._pending if now - entry[3] <= self.ttl]
+            self.stats["expired"] += len(self._pending) - len(live)
+            self._pending = live
+            for i, (prefetched_sport, prefetched_markets, prefetched_regions, _) in enumerate(live):
+                if prefetched_sport == sport and markets <= prefetched_markets and regions <= prefetched_regions:
+                    del live[i]
+                    self.stats["hits"] += 1
+                    return True
+        return False
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get prefetch metrics.
+
+        Returns:
+            Dict[str, Any]: Counters, quota spent, the last failure and the hit rate over
+                prefetches that were used or expired
+        """
+        with self._lock:
+            settled = self.stats["hits"] + self.stats["expired"]
+            return dict(self.stats, quota_spent=self.spent, quota_slice=self.quota_slice, last_error=self.last_error,
+                        hit_rate=round(self.stats["hits"] / settled, 3) if settled else None)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Profiling Module
+
+This module profiles a sample of MCP tool calls. Each profiled call writes
+artifacts to a directory:
+
+- ``<call>.json``: tool name and arguments, wall time, a breakdown of wall
+  time by phase (e.g. ``upstream``, ``network``, ``parse``, ``transform``,
+  ``serialize``), peak traced memory and the top allocation sites
+- ``<call>.prof``: a cProfile CPU profile, readable with ``pstats`` or snakeviz
+
+Phases are recorded with ``Profiler.phase()`` around the code they time, or
+``Profiler.record()`` from code that times itself (the Odds API client runs
+in worker threads). Phases may nest: ``upstream`` covers waiting for the
+merged upstream call, which includes its ``network`` and ``parse`` phases.
+
+cProfile and tracemalloc are process-wide, so while one call holds them,
+other sampled calls overlapping it record phases only. Time other tasks
+spend on the event loop during a profiled call also shows up in its CPU
+profile.
+
+The server only imports this module when profiling is switched on, and
+without it every hook is a shared no-op context manager.
+"""
+import cProfile
+import contextvars
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional, Any, Callable, Union
+
+# Allocation sites listed per call
+TOP_ALLOCATIONS = 15
+
+_current: contextvars.ContextVar = contextvars.ContextVar("wagyu_profile", default=None)
+
+# Shared no-op for phases of calls that are not profiled
+_NO_PHASE = nullcontext()
+
+
+class CallProfile:
+    """Measurements of one profiled tool call."""
+
+    def __init__(self, tool: str, arguments: Dict[str, Any]):
+        self.tool = tool
+        self.arguments = arguments
+        self.started_at = time.time()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase."""
+        with self._lock:
+            entry = self.phases.setdefault(phase, {"ms": 0.0, "count": 0})
+            entry["ms"] += seconds * 1000
+            entry["count"] += 1
+
+
+class Profiler:
+    """Samples tool calls and writes their profiles to a directory."""
+
+    def __init__(self, directory: Union[str, Path], sample_rate: float = 1.0, cpu: bool = True,
+                 memory: bool = True, rng: Callable[[], float] = random.random):
+        """
+        Initialize the profiler.
+
+        Args:
+            directory (Union[str, Path]): Directory for profile artifacts, created if missing
+            sample_rate (float): Fraction of tool calls to profile, between 0 and 1
+            cpu (bool): Record a cProfile CPU profile
+            memory (bool): Track allocations with tracemalloc
+            rng (Callable[[], float]): Source of uniform random numbers in [0, 1)
+        """
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {sample_rate}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = sample_rate
+        self.cpu = cpu
+        self.memory = memory
+        self.rng = rng
+        # Held by the call using cProfile and tracemalloc
+        self._exclusive = threading.Lock()
+        self._sequence = 0
+        self._sequence_lock = threading.Lock()
+        self.stats = {"calls": 0, "profiled": 0}
+
+    def wrap(self, fn: Callable) -> Callable:
+        """
+        Wrap an async tool function so a sample of its calls is profiled.
+
+        Args:
+            fn (Callable): Async tool function
+
+        Returns:
+            Callable: Wrapper with the same signature
+        """
+        @wraps(fn)
+        async def profiled(*args, **kwargs):
+            self.stats["calls"] += 1
+            if _current.get() is not None or self.rng() >= self.sample_rate:
+                return await fn(*args, **kwargs)
+            profile = CallProfile(fn.__name__, kwargs)
+            token = _current.set(profile)
+            exclusive = (self.cpu or self.memory) and self._exclusive.acquire(blocking=False)
+            cpu = cProfile.Profile() if exclusive and self.cpu else None
+            tracing = exclusive and self.memory and not tracemalloc.is_tracing()
+            if tracing:
+                tracemalloc.start()
+            if cpu is not None:
+                cpu.enable()
+            start = time.perf_counter()
+            result, error = None, None
+            try:
+                result = await fn(*args, **kwargs)
+                return result
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                wall = time.perf_counter() - start
+                if cpu is not None:
+                    cpu.disable()
+                memory = None
+                if tracing:
+                    memory = self._allocations()
+                    tracemalloc.stop()
+                if exclusive:
+                    self._exclusive.release()
+                _current.reset(token)
+                self._write(profile, wall, cpu, memory, error,
+                            len(result) if isinstance(result, str) else None)
+        return profiled
+
+    def phase(self, name: str):
+        """
+        Time a block as a phase of the current call.
+
+        Args:
+            name (str): Phase name
+
+        Returns:
+            A context manager; a no-op when the current call is not profiled
+        """
+        profile = _current.get()
+        if profile is None:
+            return _NO_PHASE
+        return _timed(profile, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Add time measured elsewhere to a phase of the current call.
+
+        Args:
+            name (str): Phase name
+            seconds (float): Time spent
+        """
+        profile = _current.get()
+        if profile is not None:
+            profile.record(name, seconds)
+
+    @staticmethod
+    def _allocations() -> Dict[str, Any]:
+        _, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]).statistics("lineno")[:TOP_ALLOCATIONS]
+        return {
+            "peak_kb": round(peak / 1024, 1),
+            "top": [{"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                     "size_kb": round(stat.size / 1024, 1), "count": stat.count} for stat in top],
+        }
+
+    def _write(self, profile: CallProfile, wall: float, cpu: Optional[cProfile.Profile],
+               memory: Optional[Dict[str, Any]], error: Optional[BaseException],
+               result_bytes: Optional[int]) -> None:
+        with self._sequence_lock:
+            self._sequence += 1
+            sequence = self._sequence
+        stamp = datetime.fromtimestamp(profile.started_at, tz=timezone.utc).strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{sequence:06d}-{re.sub(r'[^A-Za-z0-9_]', '_', profile.tool)}"
+        summary = {
+            "tool": profile.tool,
+            "arguments": profile.arguments,
+            "started_at": datetime.fromtimestamp(profile.started_at, tz=timezone.utc).isoformat(),
+            "wall_ms": round(wall * 1000, 3),
+            "phases": {phase: {"ms": round(entry["ms"], 3), "count": entry["count"]}
+                       for phase, entry in profile.phases.items()},
+            "result_bytes": result_bytes,
+            "error": None if error is None else repr(error),
+            "memory": memory,
+            "cpu_profile": None,
+        }
+        try:
+            if cpu is not None:
+                cpu.dump_stats(self.directory / f"{name}.prof")
+                summary["cpu_profile"] = f"{name}.prof"
+            with open(self.directory / f"{name}.json", "w") as f:
+                json.dump(summary, f, indent=2, default=str)
+        except OSError as e:
+            # A full disk must not fail the tool call
+            print(f"Could not write profile {name}: {e}", file=sys.stderr)
+            return
+        self.stats["profiled"] += 1
+
+
+@contextmanager
+def _timed(profile: CallProfile, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(name, time.perf_counter() - start)
+
+
+def profiler_from_env(directory: Optional[str] = None, sample_rate: Optional[float] = None) -> Optional[Profiler]:
+    """
+    Create a profiler from arguments, falling back to the environment.
+
+    ``WAGYU_PROFILE_DIR`` switches profiling on and ``WAGYU_PROFILE_RATE``
+    sets the sampled fraction of calls (default 1.0).
+
+    Args:
+        directory (str, optional): Artifact directory
+        sample_rate (float, optional): Fraction of calls to profile
+
+    Returns:
+        Optional[Profiler]: Profiler, or None when profiling is off
+    """
+    directory = directory or os.environ.get("WAGYU_PROFILE_DIR")
+    if not directory:
+        return None
+    if sample_rate is None:
+        sample_rate = float(os.environ.get("WAGYU_PROFILE_RATE", "1.0"))
+    return Profiler(directory, sample_rate)
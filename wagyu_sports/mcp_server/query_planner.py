@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Query Planner Module
+
+This module batches pending get_odds requests over a short window and merges
+them into the fewest, cheapest upstream calls. Each caller receives its own
+projection of the merged response.
+"""
+import asyncio
+from typing import Dict, List, Optional, Any, Callable, Tuple, FrozenSet
+
+try:
+    # When imported as a package
+    from .odds_projection import split_csv, join_csv, estimate_cost, project_events, DEFAULT_MARKETS
+except ImportError:
+    # When run directly
+    from odds_projection import split_csv, join_csv, estimate_cost, project_events, DEFAULT_MARKETS
+
+
+class _PendingRequest:
+    """A get_odds request waiting for the current batch window to close."""
+
+    def __init__(self, markets: FrozenSet[str], regions: FrozenSet[str], future: asyncio.Future):
+        self.markets = markets
+        self.regions = regions
+        self.future = future
+
+
+def _fail(requests: List[_PendingRequest], error: Exception) -> None:
+    for request in requests:
+        if not request.future.done():
+            request.future.set_exception(error)
+
+
+def _group_cost(requests: List[_PendingRequest], group: List[int]) -> int:
+    markets = frozenset().union(*(requests[i].markets for i in group))
+    regions = frozenset().union(*(requests[i].regions for i in group))
+    return estimate_cost(markets, regions)
+
+
+def _region_projections(requests: List[_PendingRequest], group: List[int]) -> int:
+    """Requests of a group whose answer must be filtered down to fewer regions."""
+    regions = frozenset().union(*(requests[i].regions for i in group))
+    return sum(1 for i in group if requests[i].regions != regions)
+
+
+def _partitions(items: List[int]):
+    """Yield every set partition of ``items``."""
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in _partitions(rest):
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+        yield [[first]] + partition
+
+
+def plan_groups(requests: List[_PendingRequest], max_exact: int = 8) -> List[List[int]]:
+    """
+    Partition requests into upstream call groups.
+
+    The plan minimizes total estimated quota cost first, then the number of
+    requests answered by filtering a broader region set, then the number of
+    upstream calls. Requests for different regions are therefore only merged
+    when that is strictly cheaper, since filtering by region drops books that
+    cannot be attributed to one. Small batches are solved exactly; larger
+    ones use greedy pairwise merging.
+
+    Args:
+        requests (List[_PendingRequest]): Requests sharing all other parameters
+        max_exact (int): Largest batch size solved by exhaustive search
+
+    Returns:
+        List[List[int]]: Groups of request indexes
+    """
+    indexes = list(range(len(requests)))
+
+    def score(partition):
+        return (sum(_group_cost(requests, g) for g in partition),
+                sum(_region_projections(requests, g) for g in partition), len(partition))
+
+    if len(indexes) <= max_exact:
+        return min(_partitions(indexes), key=score)
+
+    groups = [[i] for i in indexes]
+    while len(groups) > 1:
+        best = None
+        for a in range(len(groups)):
+            for b in range(a + 1, len(groups)):
+                merged = groups[a] + groups[b]
+                gain = (_group_cost(requests, groups[a]) + _group_cost(requests, groups[b])
+                        - _group_cost(requests, merged))
+                # A free merge is only taken when it needs no region filtering
+                if gain < 0 or (gain == 0 and _region_projections(requests, merged)):
+                    continue
+                if best is None or gain > best[0]:
+                    best = (gain, a, b)
+        if best is None:
+            break
+        _, a, b = best
+        groups[a] = groups[a] + groups[b]
+        del groups[b]
+    return groups
+
+
+class QueryPlanner:
+    """
+    Batching planner that sits between the MCP server and OddsClient.
+
+    Requests for the same sport with identical non-merged parameters
+    (e.g. oddsFormat, dateFormat) that arrive within ``window`` seconds are
+    planned together. Requests without ``regions`` or with an explicit
+    ``bookmakers`` filter are passed through unmerged.
+    """
+
+    def __init__(self, fetch: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+                 window: float = 0.05, max_exact: int = 8,
+                 extra_cost: Optional[Callable[[], int]] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            fetch (Callable): Blocking function ``fetch(sport, options)`` that
+                performs the upstream call (usually ``OddsClient.get_odds``)
+            window (float): Seconds to collect requests before planning
+            max_exact (int): Largest batch size planned by exhaustive search
+            extra_cost (Callable[[], int], optional): Returns quota spent by upstream calls
+                beyond what their responses report (e.g. by losing hedged duplicates)
+        """
+        self.fetch = fetch
+        self.window = window
+        self.max_exact = max_exact
+        self.extra_cost = extra_cost
+        self._pending: Dict[Tuple, List[_PendingRequest]] = {}
+        # Running flushes, referenced so they are not garbage collected mid-flight
+        self._flushes: set = set()
+        self._stats = {
+            "requests": 0,
+            "upstream_calls": 0,
+            "estimated_cost_unplanned": 0,
+            "estimated_cost_planned": 0,
+            "actual_cost": 0,
+            "actual_cost_unknown_calls": 0,
+        }
+
+    async def get_odds(self, sport: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get odds for a sport, possibly sharing an upstream call with other callers.
+
+        Args:
+            sport (str): Sport key (e.g., 'basketball_nba')
+            options (Dict[str, Any], optional): Options as accepted by OddsClient.get_odds
+
+        Returns:
+            Dict[str, Any]: Response in the OddsClient format, projected to this request
+
+        Raises:
+            Exception: Whatever the upstream fetch raised for this request's group
+        """
+        options = dict(options or {})
+        self._stats["requests"] += 1
+
+        if not options.get("regions") or options.get("bookmakers"):
+            return await self._call_upstream(sport, options, estimated_cost=None)
+
+        markets = split_csv(options.pop("markets", None)) or DEFAULT_MARKETS
+        regions = split_csv(options.pop("regions"))
+        self._stats["estimated_cost_unplanned"] += estimate_cost(markets, regions)
+
+        key = (sport, tuple(sorted(options.items())))
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append(_PendingRequest(markets, regions, future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_later(self.window, self._schedule_flush, key)
+        return await future
+
+    def _schedule_flush(self, key: Tuple) -> None:
+        task = asyncio.ensure_future(self._flush(key))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, key: Tuple) -> None:
+        sport, extra = key
+        requests = self._pending.pop(key, [])
+        if not requests:
+            return
+        try:
+            groups = plan_groups(requests, self.max_exact)
+        except Exception as e:
+            # Planning failed: nobody may be left waiting for their deadline
+            _fail(requests, e)
+            return
+        # Each group settles its own futures, so one group's failure never reaches another's callers
+        await asyncio.gather(*(self._run_group(sport, dict(extra), [requests[i] for i in g]) for g in groups))
+
+    async def _run_group(self, sport: str, options: Dict[str, Any], group: List[_PendingRequest]) -> None:
+        try:
+            markets = frozenset().union(*(r.markets for r in group))
+            regions = frozenset().union(*(r.regions for r in group))
+            options["markets"] = join_csv(markets)
+            options["regions"] = join_csv(regions)
+            estimated = estimate_cost(markets, regions)
+            self._stats["estimated_cost_planned"] += estimated
+            result = await self._call_upstream(sport, options, estimated_cost=estimated)
+        except Exception as e:
+            _fail(group, e)
+            return
+
+        for request in group:
+            if request.future.done():
+                continue
+            try:
+                data = result.get("data")
+                if isinstance(data, list) and (request.markets != markets or request.regions != regions):
+                    data = project_events(data, request.markets, request.regions, source_regions=regions)
+            except Exception as e:
+                # A response this request cannot be projected from fails this request only
+                request.future.set_exception(e)
+                continue
+            request.future.set_result(dict(result, data=data))
+
+    async def _call_upstream(self, sport: str, options: Dict[str, Any],
+                             estimated_cost: Optional[int]) -> Dict[str, Any]:
+        self._stats["upstream_calls"] += 1
+        result = await asyncio.to_thread(self.fetch, sport, options)
+        if estimated_cost is None:
+            return result
+
+        # Prefer the cost reported by the API; fall back to the estimate
+        last = (result.get("headers") or {}).get("x-requests-last")
+        try:
+            self._stats["actual_cost"] += int(float(last))
+        except (TypeError, ValueError):
+            self._stats["actual_cost"] += estimated_cost
+            self._stats["actual_cost_unknown_calls"] += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get planner statistics.
+
+        Returns:
+            Dict[str, Any]: Request and call counts plus estimated and actual quota saved
+        """
+        stats = dict(self._stats)
+        if self.extra_cost is not None:
+            stats["actual_cost"] += self.extra_cost()
+        stats["estimated_quota_saved"] = stats["estimated_cost_unplanned"] - stats["estimated_cost_planned"]
+        stats["actual_quota_saved"] = stats["estimated_cost_unplanned"] - stats["actual_cost"]
+        return stats
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Wagyu Sports Replay Engine
+
+This module replays recorded odds snapshots (mocks_live captures, JSON
+capture directories, capture logs, snapshot stores and columnar archives)
+through an OddsMcpServer. The server runs offline on a simulated clock, and
+each snapshot enters through the same ingestion path as live data once the
+clock reaches its fetch time. Tools therefore see the odds as they looked at
+simulated time T.
+
+A replay runs at 1x, accelerated, or as fast as possible (``speed=None``),
+so a whole game night can be run deterministically in seconds.
+"""
+import time
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, NamedTuple, Union
+
+try:
+    # When imported as a package
+    from .odds_archive import ArchiveReader, read_capture, parse_capture
+    from .capture_log import CaptureReader, is_capture_log
+    from .snapshot_store import SnapshotReader, is_snapshot_store
+    from .odds_projection import BOOKMAKER_REGIONS, join_csv
+except ImportError:
+    # When run directly
+    from odds_archive import ArchiveReader, read_capture, parse_capture
+    from capture_log import CaptureReader, is_capture_log
+    from snapshot_store import SnapshotReader, is_snapshot_store
+    from odds_projection import BOOKMAKER_REGIONS, join_csv
+
+
+class Snapshot(NamedTuple):
+    """A recorded /odds response."""
+    fetched_at: float
+    sport: str
+    options: Dict[str, Any]
+    response: Dict[str, Any]
+
+
+class SimulatedClock:
+    """
+    Time source for a replay.
+
+    With a speed, simulated time runs that many times faster than real time.
+    Without one, time only moves when ``advance_to()`` is called.
+    """
+
+    def __init__(self, start: float, speed: Optional[float] = 1.0):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Simulated epoch seconds to start at
+            speed: Simulated seconds per real second. None steps from snapshot to snapshot.
+        """
+        self.speed = speed
+        self._base = start
+        self._real = time.monotonic()
+
+    def __call__(self) -> float:
+        if not self.speed:
+            return self._base
+        return self._base + (time.monotonic() - self._real) * self.speed
+
+    def restart(self) -> None:
+        """Count real time from now, as if the clock had just been created."""
+        self._real = time.monotonic()
+
+    def advance_to(self, at: float) -> None:
+        """
+        Jump forward to a simulated time. Moving backwards is ignored.
+
+        Args:
+            at: Simulated epoch seconds
+        """
+        if at > self():
+            self._base = at
+            self._real = time.monotonic()
+
+
+def derive_options(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Work out the /odds options a snapshot answers when they were not recorded.
+
+    Markets are the ones present. Regions are the fewest regions that contain
+    every bookmaker present; unknown books are listed as bookmakers instead.
+
+    Args:
+        events: Events from an /odds response
+
+    Returns:
+        Dict[str, Any]: Options for OddsMcpServer.ingest_odds
+    """
+    markets, books = set(), set()
+    for event in events:
+        for bookmaker in event.get("bookmakers", []):
+            books.add(bookmaker["key"])
+            markets.update(market["key"] for market in bookmaker.get("markets", []))
+    return options_for(books, markets)
+
+
+def options_for(books: Iterable[str], markets: Iterable[str]) -> Dict[str, Any]:
+    """
+    Work out the /odds options of a snapshot from the bookmakers and markets it holds.
+
+    Args:
+        books: Bookmaker keys present
+        markets: Market keys present
+
+    Returns:
+        Dict[str, Any]: Options for OddsMcpServer.ingest_odds (see derive_options)
+    """
+    books, markets = set(books), set(markets)
+    options: Dict[str, Any] = {"oddsFormat": "decimal"}
+    if markets:
+        options["markets"] = join_csv(markets)
+    if any(book not in BOOKMAKER_REGIONS for book in books):
+        options["bookmakers"] = join_csv(books)
+        return options
+    regions: set = set()
+    # Books offered in a single region decide first
+    for book in sorted(books, key=lambda b: (len(BOOKMAKER_REGIONS[b]), b)):
+        if not BOOKMAKER_REGIONS[book] & regions:
+            regions.add(min(BOOKMAKER_REGIONS[book]))
+    if regions:
+        options["regions"] = join_csv(regions)
+    return options
+
+
+def load_snapshots(sources: Iterable[Union[str, Path]]) -> List[Snapshot]:
+    """
+    Load recorded snapshots in fetch order.
+
+    Args:
+        sources: JSON capture files, directories of captures, capture logs, snapshot stores or archive directories
+
+    Returns:
+        List[Snapshot]: Snapshots sorted by fetch time
+    """
+    snapshots = []
+    for source in sources:
+        source = Path(source)
+        if (source / "manifest.json").exists():
+            with ArchiveReader(source) as archive:
+                for sport, fetched_at, index in archive.list_snapshots():
+                    events = archive.snapshot(index)["data"]
+                    snapshots.append(Snapshot(fetched_at, sport, derive_options(events), {"data": events}))
+            continue
+        if is_snapshot_store(source):
+            store = SnapshotReader(source)
+            for entry in store.list_snapshots():
+                events = store.load(entry["root"])
+                options = entry["options"] or derive_options(events)
+                snapshots.append(Snapshot(entry["fetched_at"], entry["sport"], options, {"data": events}))
+            continue
+        if is_capture_log(source):
+            with CaptureReader(source) as log:
+                captures = [parse_capture(log.read(n), lambda: log.captured_at(n)) for n in range(len(log))]
+        else:
+            captures = [read_capture(capture_file)
+                        for capture_file in (sorted(source.glob("*.json")) if source.is_dir() else [source])]
+        snapshots.extend(capture_snapshot(capture) for capture in captures if capture is not None)
+    return sorted(snapshots, key=lambda snapshot: snapshot.fetched_at)
+
+
+def capture_snapshot(capture: Dict[str, Any]) -> Snapshot:
+    """
+    Turn the odds of a capture into a snapshot.
+
+    Args:
+        capture: Result of read_capture or parse_capture
+
+    Returns:
+        Snapshot: The capture's odds, with its recorded options or ones derived from its events
+    """
+    options = {"oddsFormat": "decimal", **capture["options"]} if capture["options"] else derive_options(capture["events"])
+    return Snapshot(capture["fetched_at"], capture["sport"], options, {"data": capture["events"]})
+
+
+class ReplayEngine:
+    """Feeds recorded snapshots to an offline OddsMcpServer on a simulated clock."""
+
+    def __init__(self, server: Any, snapshots: List[Snapshot]):
+        """
+        Initialize the engine.
+
+        Args:
+            server: OddsMcpServer created with ``offline=True`` and a SimulatedClock
+            snapshots: Snapshots sorted by fetch time
+        """
+        self.server = server
+        self.clock: SimulatedClock = server.clock
+        self.snapshots = snapshots
+        self.position = 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether every snapshot has been ingested."""
+        return self.position >= len(self.snapshots)
+
+    def _ingest_next(self) -> None:
+        snapshot = self.snapshots[self.position]
+        self.server.ingest_odds(snapshot.sport, snapshot.options, snapshot.response,
+                                fetched_at=snapshot.fetched_at, archive=False)
+        self.position += 1
+
+    def seek(self, at: float) -> int:
+        """
+        Advance the clock to a simulated time, ingesting every snapshot fetched by then.
+
+        Args:
+            at: Simulated epoch seconds
+
+        Returns:
+            int: Number of snapshots ingested
+        """
+        start = self.position
+        while not self.finished and self.snapshots[self.position].fetched_at <= at:
+            self.clock.advance_to(self.snapshots[self.position].fetched_at)
+            self._ingest_next()
+        self.clock.advance_to(at)
+        return self.position - start
+
+    async def run(self) -> None:
+        """Ingest the remaining snapshots as the simulated clock reaches them."""
+        while not self.finished:
+            due = self.snapshots[self.position].fetched_at
+            if self.clock.speed:
+                delay = (due - self.clock()) / self.clock.speed
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                # Let tool calls in flight see this snapshot before the next one lands
+                await asyncio.sleep(0)
+            self.seek(due)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get replay progress.
+
+        Returns:
+            Dict[str, Any]: Simulated time, snapshots ingested and remaining
+        """
+        return {
+            "simulated_time": self.clock(),
+            "ingested": self.position,
+            "remaining": len(self.snapshots) - self.position,
+        }
+
+
+def create_replay(sources: Iterable[Union[str, Path]], speed: Optional[float] = 1.0,
+                  start: Optional[float] = None, **server_options) -> ReplayEngine:
+    """
+    Build an offline server and a replay engine for recorded snapshots.
+
+    Args:
+        sources: JSON capture files, directories of captures, capture logs, snapshot stores or archive directories
+        speed: Simulated seconds per real second. None replays as fast as possible.
+        start: Simulated start time. Defaults to the first snapshot's fetch time.
+        **server_options: Further OddsMcpServer arguments (e.g. cache_ttl)
+
+    Returns:
+        ReplayEngine: Engine whose ``server`` attribute is the offline OddsMcpServer
+    """
+    try:
+        from .odds_client_server import OddsMcpServer
+    except ImportError:
+        from odds_client_server import OddsMcpServer
+
+    snapshots = load_snapshots(sources)
+    if not snapshots:
+        raise ValueError("No odds snapshots found to replay")
+    clock = SimulatedClock(snapshots[0].fetched_at if start is None else start, speed=speed)
+    server = OddsMcpServer(offline=True, clock=clock, **server_options)
+    # Building the server takes a while; none of it should pass in simulated time
+    clock.restart()
+    return ReplayEngine(server, snapshots)
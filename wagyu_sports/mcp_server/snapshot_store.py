@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Snapshot Store Module
+
+This module keeps a history of /odds snapshots in a content-addressed store,
+so retained history grows with what changed rather than with how often a
+slate was polled.
+
+Store layout (one directory)::
+
+    objects/ab/cdef...   zlib-compressed canonical JSON, named by its SHA-256
+    snapshots.ndjson     one line per snapshot: fetched_at, sport, options, root
+
+Each bookmaker's sub-tree of an event (its markets and prices) is one
+object. A snapshot's root object lists the events with their bookmakers
+replaced by the hashes of those objects. Two identical responses therefore
+produce the same root, and storing the second one only appends a line to
+``snapshots.ndjson``. A bookmaker that has not updated since the previous
+snapshot (same ``last_update`` and the same markets) reuses the previous
+hash without being serialized or hashed again.
+
+Only the events are stored; response headers (quota counters) change on
+every call and are not part of the history.
+"""
+import os
+import json
+import zlib
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator, Tuple, Union
+
+
+def _canonical(obj: Any) -> bytes:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+def is_snapshot_store(path: Union[str, Path]) -> bool:
+    """Whether a path is a snapshot store directory."""
+    return (Path(path) / "snapshots.ndjson").exists()
+
+
+class SnapshotStore:
+    """Appends /odds snapshots to a content-addressed store."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a snapshot store for appending, creating it if needed.
+
+        Args:
+            path: Store directory
+        """
+        self.path = Path(path)
+        (self.path / "objects").mkdir(parents=True, exist_ok=True)
+        (self.path / "snapshots.ndjson").touch()
+        self._lock = threading.Lock()
+        # (odds format, event, book, markets) -> (last_update, hash) from the previous snapshot
+        self._books: Dict[Tuple, Tuple[str, str]] = {}
+        self.stats = {"snapshots": 0, "duplicates": 0, "books_reused": 0, "books_hashed": 0,
+                      "objects_written": 0, "bytes_written": 0}
+
+    def _object_path(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    def _put_object(self, raw: bytes) -> str:
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            data = zlib.compress(raw)
+            # Write then rename so readers never see a partial object
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            self.stats["objects_written"] += 1
+            self.stats["bytes_written"] += len(data)
+        return digest
+
+    def _put_book(self, odds_format: Optional[str], event_id: str, bookmaker: Dict[str, Any]) -> str:
+        key = (odds_format, event_id, bookmaker.get("key"),
+               tuple(market.get("key") for market in bookmaker.get("markets", [])))
+        last_update = bookmaker.get("last_update")
+        previous = self._books.get(key)
+        if previous is not None and last_update is not None and previous[0] == last_update:
+            self.stats["books_reused"] += 1
+            return previous[1]
+        self.stats["books_hashed"] += 1
+        digest = self._put_object(_canonical(bookmaker))
+        self._books[key] = (last_update, digest)
+        return digest
+
+    def put(self, sport: str, events: List[Dict[str, Any]], fetched_at: float,
+            options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store a snapshot.
+
+        Args:
+            sport: Sport key
+            events: Events from an /odds response
+            fetched_at: Epoch seconds the snapshot was fetched
+            options: Options the snapshot was fetched with
+
+        Returns:
+            str: Hash of the snapshot's root object
+        """
+        options = options or {}
+        with self._lock:
+            odds_format = options.get("oddsFormat")
+            root = [dict({key: value for key, value in event.items() if key != "bookmakers"},
+                         bookmakers=[self._put_book(odds_format, event["id"], bookmaker)
+                                     for bookmaker in event.get("bookmakers", [])])
+                    for event in events]
+            written = self.stats["objects_written"]
+            digest = self._put_object(_canonical(root))
+            if self.stats["objects_written"] == written:
+                self.stats["duplicates"] += 1
+            line = json.dumps({"fetched_at": fetched_at, "sport": sport, "options": options, "root": digest})
+            with open(self.path / "snapshots.ndjson", "a") as f:
+                f.write(line + "\n")
+            self.stats["snapshots"] += 1
+        return digest
+
+    def put_response(self, sport: str, response: Dict[str, Any], fetched_at: float,
+                     options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Store the events of a response in the OddsClient format.
+
+        Args:
+            sport: Sport key
+            response: Response whose ``data`` is the event list
+            fetched_at: Epoch seconds the snapshot was fetched
+            options: Options the snapshot was fetched with
+
+        Returns:
+            Optional[str]: Root hash, or None if the response holds no event list
+        """
+        if not isinstance(response.get("data"), list):
+            return None
+        return self.put(sport, response["data"], fetched_at, options)
+
+
+class SnapshotReader:
+    """Reads snapshots from a snapshot store."""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a snapshot store for reading.
+
+        Args:
+            path: Store directory
+        """
+        self.path = Path(path)
+        if not is_snapshot_store(self.path):
+            raise FileNotFoundError(f"No snapshot store at {self.path}")
+        # Objects are immutable, so parsed ones are shared between snapshots
+        self._objects: Dict[str, Any] = {}
+
+    def list_snapshots(self, sport: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        List stored snapshots in the order they were stored.
+
+        Args:
+            sport: Only this sport's snapshots. Defaults to all.
+
+        Returns:
+            Iterator[Dict[str, Any]]: ``fetched_at``, ``sport``, ``options`` and ``root`` per snapshot
+        """
+        with open(self.path / "snapshots.ndjson") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # A line still being written
+                    break
+                entry = json.loads(line)
+                if sport is None or entry["sport"] == sport:
+                    yield entry
+
+    def _object(self, digest: str) -> Any:
+        if digest not in self._objects:
+            with open(self.path / "objects" / digest[:2] / digest[2:], "rb") as f:
+                self._objects[digest] = json.loads(zlib.decompress(f.read()))
+        return self._objects[digest]
+
+    def load(self, root: str) -> List[Dict[str, Any]]:
+        """
+        Rebuild a snapshot's events.
+
+        Args:
+            root: Root hash from list_snapshots()
+
+        Returns:
+            List[Dict[str, Any]]: Events in the /odds shape; bookmaker entries are shared
+                with other loaded snapshots and must not be modified
+        """
+        return [dict(event, bookmakers=[self._object(digest) for digest in event["bookmakers"]])
+                for event in self._object(root)]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Symbol Tables Module
+
+This module keeps process-wide tables of the strings repeated across /odds
+snapshots (bookmakers, markets, teams, titles and outcome names), each
+holding one shared copy of every string it has seen.
+
+``intern_events`` replaces the repeated strings of a snapshot with the single
+copy owned by the tables, so every retained snapshot (cache, board, last good
+response) shares them instead of holding its own. Values that are unique to
+one event or one update (event IDs, commence and update timestamps) are left
+alone: interning them would only grow the tables, since nothing else shares
+them for long. The tables are append-only, so the catch-all table for names
+is bounded; once it is full, new strings are kept as they are.
+
+``iter_lines`` names each priced outcome of an event by its line, the
+(event, bookmaker, market, outcome label) tuple that code keeping per-line
+state across snapshots (alert rules, subscriptions, polling volatility) keys
+it by.
+"""
+import threading
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+# Names kept by the catch-all table: teams, titles, outcome and player names
+MAX_STRINGS = 100_000
+
+# event ID, bookmaker, market, outcome label
+Line = Tuple[str, str, str, str]
+
+
+class SymbolTable:
+    """Append-only, thread-safe table of shared string copies."""
+
+    def __init__(self, name: str, limit: Optional[int] = None):
+        """
+        Initialize the table.
+
+        Args:
+            name (str): Table name, for reports
+            limit (int, optional): Maximum number of strings. None is unbounded.
+        """
+        self.name = name
+        self.limit = limit
+        self._strings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, value: str) -> str:
+        """
+        Get the table's copy of a string, adding it on first use.
+
+        Args:
+            value (str): String to look up
+
+        Returns:
+            str: The shared copy, or the string itself once the table is full
+        """
+        shared = self._strings.get(value)
+        if shared is not None:
+            return shared
+        with self._lock:
+            shared = self._strings.get(value)
+            if shared is not None:
+                return shared
+            if self.limit is not None and len(self._strings) >= self.limit:
+                return value
+            self._strings[value] = value
+            return value
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._strings
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+BOOKMAKERS = SymbolTable("bookmaker")
+MARKETS = SymbolTable("market")
+# Teams, titles, outcome names and other values that are repeated across snapshots
+STRINGS = SymbolTable("string", MAX_STRINGS)
+
+TABLES = {table.name: table for table in (BOOKMAKERS, MARKETS, STRINGS)}
+
+
+def outcome_label(outcome: Dict[str, Any]) -> str:
+    """
+    Get the label that identifies an outcome within its market.
+
+    Args:
+        outcome (Dict[str, Any]): Outcome from an /odds response
+
+    Returns:
+        str: The outcome name, plus ``|description`` for outcomes that have one
+            (e.g., player props, where the name is only 'Over' or 'Under')
+    """
+    description = outcome.get("description")
+    return outcome["name"] if not description else f"{outcome['name']}|{description}"
+
+
+def iter_lines(event: Dict[str, Any]) -> Iterator[Tuple[Line, Dict[str, Any]]]:
+    """
+    Iterate over the priced outcomes of an event.
+
+    Args:
+        event (Dict[str, Any]): Event from an /odds response
+
+    Yields:
+        Tuple[Line, Dict[str, Any]]: Line and outcome
+    """
+    event_id = event["id"]
+    for bookmaker in event.get("bookmakers", []):
+        book = bookmaker["key"]
+        for market in bookmaker.get("markets", []):
+            market_key = market["key"]
+            for outcome in market.get("outcomes", []):
+                yield (event_id, book, market_key, outcome_label(outcome)), outcome
+
+
+_EVENT_STRINGS = ("sport_key", "sport_title", "home_team", "away_team")
+
+
+def intern_events(events: List[Dict[str, Any]]) -> None:
+    """
+    Replace the repeated strings of a snapshot, in place, with the tables' copies.
+
+    Args:
+        events (List[Dict[str, Any]]): Events from an /odds response
+    """
+    strings = STRINGS.intern
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        for field in _EVENT_STRINGS:
+            if isinstance(event.get(field), str):
+                event[field] = strings(event[field])
+        for bookmaker in event.get("bookmakers", []):
+            bookmaker["key"] = BOOKMAKERS.intern(bookmaker["key"])
+            if isinstance(bookmaker.get("title"), str):
+                bookmaker["title"] = strings(bookmaker["title"])
+            for market in bookmaker.get("markets", []):
+                market["key"] = MARKETS.intern(market["key"])
+                for outcome in market.get("outcomes", []):
+                    outcome["name"] = strings(outcome["name"])
+                    if isinstance(outcome.get("description"), str):
+                        outcome["description"] = strings(outcome["description"])
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Warm Start Module
+
+This module seeds a server at startup from the newest recorded snapshots
+(the mocks_live captures, capture directories, capture logs, snapshot
+stores and archives the replay engine reads). Only the newest snapshot of
+each sport and set of options is kept, and it enters the server with its
+original fetch time. Seeding runs before the server can serve anything, so
+archives and snapshot stores are ranked from their snapshot indexes and
+only the newest snapshots are rebuilt.
+
+Seeded odds are never fresh enough to answer a live call while the API is
+reachable. They are served, labeled with their age and source, when a live
+fetch fails: the upstream is down, the deadline expires, or the quota is
+spent. The newest recorded sports list backs get_sports the same way.
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple, Union
+
+try:
+    # When imported as a package
+    from .odds_archive import ArchiveReader, parse_capture, parse_timestamp
+    from .capture_log import CaptureReader, is_capture_log
+    from .snapshot_store import SnapshotReader, is_snapshot_store
+    from .replay import Snapshot, capture_snapshot, derive_options, options_for
+except ImportError:
+    # When run directly
+    from odds_archive import ArchiveReader, parse_capture, parse_timestamp
+    from capture_log import CaptureReader, is_capture_log
+    from snapshot_store import SnapshotReader, is_snapshot_store
+    from replay import Snapshot, capture_snapshot, derive_options, options_for
+
+# A recorded get_sports response: source, fetch time and response
+SportsList = Tuple[str, float, Dict[str, Any]]
+
+
+def _request_key(sport: str, options: Optional[Dict[str, Any]]) -> Tuple:
+    return sport, tuple(sorted((options or {}).items()))
+
+
+def _newest_archived(archive: ArchiveReader) -> List[Snapshot]:
+    """The newest snapshot of each request in an archive, picked from the snapshot columns."""
+    winners: Dict[Tuple, Tuple[float, int, str, Dict[str, Any]]] = {}
+    for sport, fetched_at, index in archive.list_snapshots():
+        # Archives do not record options; the snapshot's books and markets tell them
+        options = options_for(*archive.snapshot_contents(index))
+        key = _request_key(sport, options)
+        if key not in winners or fetched_at >= winners[key][0]:
+            winners[key] = (fetched_at, index, sport, options)
+    return [Snapshot(fetched_at, sport, options, {"data": archive.snapshot(index)["data"]})
+            for fetched_at, index, sport, options in winners.values()]
+
+
+def _newest_stored(store: SnapshotReader) -> List[Snapshot]:
+    """The newest snapshot of each request in a snapshot store, picked from snapshots.ndjson."""
+    winners: Dict[Tuple, Dict[str, Any]] = {}
+    for entry in store.list_snapshots():
+        # Snapshots stored without options count as one request per sport
+        key = _request_key(entry["sport"], entry["options"])
+        if key not in winners or entry["fetched_at"] >= winners[key]["fetched_at"]:
+            winners[key] = entry
+    snapshots = []
+    for entry in winners.values():
+        events = store.load(entry["root"])
+        snapshots.append(Snapshot(entry["fetched_at"], entry["sport"], entry["options"] or derive_options(events),
+                                  {"data": events}))
+    return snapshots
+
+
+def _captures(source: Path) -> Iterable[Tuple[Any, Any]]:
+    """Each capture of a capture log, file or directory, with a fallback for its fetch time."""
+    if is_capture_log(source):
+        with CaptureReader(source) as log:
+            for n in range(len(log)):
+                yield log.read(n), (lambda n=n: log.captured_at(n))
+        return
+    for capture_file in (sorted(source.glob("*.json")) if source.is_dir() else [source]):
+        try:
+            with open(capture_file) as f:
+                capture = json.load(f)
+        except (OSError, ValueError):
+            continue
+        yield capture, (lambda capture_file=capture_file: capture_file.stat().st_mtime)
+
+
+def _sports_capture(capture: Any) -> Optional[Tuple[float, Dict[str, Any]]]:
+    """The fetch time and response of a get_sports capture, or None for any other capture."""
+    if not isinstance(capture, dict):
+        return None
+    metadata = capture.get("_metadata", {})
+    if (metadata.get("tool") or metadata.get("method")) != "get_sports" or not metadata.get("captured_at"):
+        return None
+    data = capture.get("data")
+    # Capture logs keep the full client response; mocks_live keeps its data
+    response = data if isinstance(data, dict) else {"data": data}
+    if not isinstance(response.get("data"), list):
+        return None
+    return parse_timestamp(metadata["captured_at"]), response
+
+
+def newest_recorded(sources: Iterable[Union[str, Path]]
+                    ) -> Tuple[List[Tuple[str, Snapshot]], Optional[SportsList]]:
+    """
+    Find the newest recorded snapshot of each sport and set of options, and the newest
+    recorded get_sports response.
+
+    Archives and snapshot stores are ranked from their snapshot indexes, and only the
+    winners are rebuilt. Capture logs and capture files are read once for both.
+
+    Args:
+        sources: JSON capture files, directories of captures, capture logs, snapshot stores or archive directories
+
+    Returns:
+        Tuple: Source and snapshot pairs in fetch order, and the source, fetch time and
+            response of the newest get_sports capture (or None)
+    """
+    newest: Dict[Tuple, Tuple[str, Snapshot]] = {}
+    sports_list: Optional[SportsList] = None
+    for source in sources:
+        source = Path(source)
+        if (source / "manifest.json").exists():
+            with ArchiveReader(source) as archive:
+                snapshots = _newest_archived(archive)
+        elif is_snapshot_store(source):
+            snapshots = _newest_stored(SnapshotReader(source))
+        elif is_capture_log(source) or source.is_file() or source.is_dir():
+            snapshots = []
+            for capture, default_time in _captures(source):
+                found = _sports_capture(capture)
+                if found is not None:
+                    if sports_list is None or found[0] >= sports_list[1]:
+                        sports_list = (str(source), found[0], found[1])
+                    continue
+                odds = parse_capture(capture, default_time)
+                if odds is not None:
+                    snapshots.append(capture_snapshot(odds))
+        else:
+            continue
+        for snapshot in snapshots:
+            key = _request_key(snapshot.sport, snapshot.options)
+            if key not in newest or snapshot.fetched_at >= newest[key][1].fetched_at:
+                newest[key] = (str(source), snapshot)
+    return sorted(newest.values(), key=lambda pair: pair[1].fetched_at), sports_list
+
+
+def newest_snapshots(sources: Iterable[Union[str, Path]]) -> List[Tuple[str, Snapshot]]:
+    """
+    Find the newest recorded snapshot of each sport and set of options.
+
+    Args:
+        sources: JSON capture files, directories of captures, capture logs, snapshot stores or archive directories
+
+    Returns:
+        List[Tuple[str, Snapshot]]: Source and snapshot pairs in fetch order
+    """
+    return newest_recorded(sources)[0]
+
+
+def newest_sports_list(sources: Iterable[Union[str, Path]]) -> Optional[SportsList]:
+    """
+    Find the newest recorded get_sports response.
+
+    Args:
+        sources: JSON capture files, directories of captures or capture logs (other sources are skipped)
+
+    Returns:
+        Optional[Tuple[str, float, Dict[str, Any]]]: Source, fetch time and response, or None
+    """
+    return newest_recorded(sources)[1]
+
+
+def seed_server(server: Any, sources: Iterable[Union[str, Path]]) -> Dict[str, Any]:
+    """
+    Ingest the newest recorded snapshots into a server.
+
+    Args:
+        server: OddsMcpServer to seed
+        sources: JSON capture files, directories of captures, capture logs, snapshot stores or archive directories
+
+    Returns:
+        Dict[str, Any]: ``snapshots`` (sport, options, source and fetch time of each seeded
+            snapshot) and ``sports_list`` (source, fetch time and response of the newest
+            recorded get_sports response, or None)
+    """
+    snapshots, sports_list = newest_recorded(sources)
+    seeded = []
+    for source, snapshot in snapshots:
+        response = dict(snapshot.response, seed={"source": source})
+        # Seeded odds are already recorded, so they are not archived again
+        server.ingest_odds(snapshot.sport, snapshot.options, response, fetched_at=snapshot.fetched_at,
+                           archive=False)
+        seeded.append({"sport": snapshot.sport, "options": snapshot.options, "source": source,
+                       "fetched_at": snapshot.fetched_at})
+    return {"snapshots": seeded, "sports_list": sports_list}
@@ -4,8 +4,363 @@ Wagyu Sports Client Module
 
 This module provides a client for interacting with sports betting data APIs.
 """
+import re
+import json
+import codecs
+import random
+import threading
+import time
 import requests
-from typing import Dict, List, Optional, Any, Union
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Union, Tuple, Sequence, Iterable, Callable
+
+try:
+    # When imported as a package (this module is also shipped as wagyu_sports.odds_client)
+    from wagyu_sports.mcp_server.outrights import OUTRIGHTS_MARKET, is_outright_sport
+except ImportError:
+    # When run directly
+    from outrights import OUTRIGHTS_MARKET, is_outright_sport
+
+
+# Status codes worth retrying: rate limiting and transient upstream failures
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Bytes read from the socket at a time when streaming a response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that may follow an element of a JSON array
+_DELIMITERS = frozenset(",] \t\n\r")
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when a request is rejected because the endpoint's circuit is open."""
+
+
+class NoUsableKeyError(requests.exceptions.RequestException):
+    """Raised when every API key in the pool is exhausted or revoked."""
+
+
+class ApiKeyState:
+    """Quota and health tracking for one API key."""
+    
+    def __init__(self, key: str):
+        self.key = key
+        self.remaining: Optional[int] = None
+        self.used: Optional[int] = None
+        self.requests = 0
+        self.health = "healthy"
+        self.changed_at = None
+    
+    @property
+    def masked(self) -> str:
+        """The key with all but its last four characters hidden."""
+        return "*" * max(len(self.key) - 4, 0) + self.key[-4:]
+    
+    def describe(self) -> Dict[str, Any]:
+        """Usage summary that is safe to show to clients."""
+        return {
+            "key": self.masked,
+            "health": self.health,
+            "remaining_requests": self.remaining,
+            "used_requests": self.used,
+            "requests": self.requests
+        }
+
+
+class ApiKeyPool:
+    """
+    Pool of API keys with per-key quota tracking.
+    
+    Requests are routed to the healthy key with the most remaining quota; keys
+    whose quota is still unknown are tried first. Keys that run out of quota
+    are skipped until ``recheck_interval`` has passed, revoked keys for good.
+    """
+    
+    def __init__(self, keys: Sequence[str], recheck_interval: float = 3600.0):
+        """
+        Initialize the pool.
+        
+        Args:
+            keys (Sequence[str]): API keys, duplicates are ignored
+            recheck_interval (float): Seconds before an exhausted key is tried again
+        """
+        self.keys = [ApiKeyState(key) for key in dict.fromkeys(keys)]
+        self.recheck_interval = recheck_interval
+        self._lock = threading.Lock()
+    
+    def _usable(self, state: ApiKeyState) -> bool:
+        if state.health == "healthy":
+            return True
+        return state.health == "exhausted" and time.monotonic() - state.changed_at >= self.recheck_interval
+    
+    def select(self) -> ApiKeyState:
+        """
+        Pick the key with the most headroom.
+        
+        Returns:
+            ApiKeyState: Selected key
+            
+        Raises:
+            NoUsableKeyError: If every key is exhausted or revoked
+        """
+        with self._lock:
+            usable = [state for state in self.keys if self._usable(state)]
+            if not usable:
+                raise NoUsableKeyError("All API keys are exhausted or revoked")
+            return min(usable, key=lambda state: (
+                -(state.remaining if state.remaining is not None else float("inf")),
+                state.requests
+            ))
+    
+    def has_usable(self) -> bool:
+        """Whether any key can currently be used."""
+        with self._lock:
+            return any(self._usable(state) for state in self.keys)
+    
+    def record(self, state: ApiKeyState, status_code: Any, headers: Any) -> None:
+        """
+        Update a key from a response.
+        
+        Args:
+            state (ApiKeyState): Key the request was sent with
+            status_code (Any): Response status code
+            headers (Any): Response headers
+        """
+        with self._lock:
+            state.requests += 1
+            try:
+                state.remaining = int(float(headers['x-requests-remaining']))
+            except (KeyError, TypeError, ValueError):
+                pass
+            try:
+                state.used = int(float(headers['x-requests-used']))
+            except (KeyError, TypeError, ValueError):
+                pass
+            
+            if state.remaining == 0:
+                health = "exhausted"
+            elif status_code == 401:
+                health = "revoked"
+            else:
+                health = "healthy"
+            if health != state.health or health != "healthy":
+                state.health = health
+                state.changed_at = time.monotonic()
+    
+    def total_remaining(self) -> Optional[int]:
+        """Remaining quota summed over usable keys, or None if no key has reported it."""
+        with self._lock:
+            known = [state.remaining for state in self.keys if self._usable(state) and state.remaining is not None]
+        return sum(known) if known else None
+    
+    def usage(self) -> List[Dict[str, Any]]:
+        """Per-key usage summaries."""
+        with self._lock:
+            return [state.describe() for state in self.keys]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single API endpoint.
+    
+    After ``failure_threshold`` consecutive failed requests the circuit opens
+    and requests fail fast. Once ``reset_timeout`` seconds have passed a single
+    trial request is let through; its outcome closes or re-opens the circuit.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold (int): Consecutive failures before the circuit opens
+            reset_timeout (float): Seconds to stay open before allowing a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open'."""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        """
+        Check whether a request may be sent.
+        
+        Returns:
+            bool: True if the circuit is closed or this is the half-open trial request
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LatencyTracker:
+    """Rolling window of request latencies for a single endpoint."""
+    
+    def __init__(self, window: int = 200):
+        """
+        Initialize the tracker.
+        
+        Args:
+            window (int): Number of most recent samples kept
+        """
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float) -> None:
+        """Record the latency of a completed request."""
+        with self._lock:
+            self.samples.append(seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+        
+        Args:
+            pct (float): Percentile between 0 and 100
+            
+        Returns:
+            Optional[float]: Latency in seconds, or None if there are no samples
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+
+def _compacting_hook(strings: Dict[str, str], floats: Dict[float, float]):
+    """Object hook that makes equal keys, strings and floats share one object."""
+    def hook(pairs):
+        obj = {}
+        for key, value in pairs:
+            if type(value) is str:
+                value = strings.setdefault(value, value)
+            elif type(value) is float:
+                value = floats.setdefault(value, value)
+            obj[strings.setdefault(key, key)] = value
+        return obj
+    return hook
+
+
+def load_json_stream(chunks: Iterable[bytes], compact: bool = True) -> Any:
+    """
+    Parse a UTF-8 JSON body from an iterable of byte chunks.
+    
+    A top-level array is decoded one element at a time as the chunks arrive,
+    so the whole body is never held as bytes or text next to the parsed
+    result. With ``compact``, repeated keys, strings (bookmakers, teams,
+    timestamps) and prices share a single object across the whole response.
+    Other JSON values are decoded in one piece.
+    
+    Args:
+        chunks (Iterable[bytes]): Response body, e.g. ``response.iter_content()``
+        compact (bool): Share repeated keys, strings and floats. Defaults to True.
+        
+    Returns:
+        Any: Parsed value
+        
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    if compact:
+        decoder = json.JSONDecoder(object_pairs_hook=_compacting_hook({}, {}))
+    else:
+        decoder = json.JSONDecoder()
+    decode = codecs.getincrementaldecoder("utf-8")().decode
+    chunks = iter(chunks)
+    buffer, pos, eof = "", 0, False
+    # Characters needed after pos before decoding again; doubles while an element stays incomplete
+    need = 1
+    items: List[Any] = []
+    state = "open"
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if not eof and len(buffer) - pos < need:
+            pending = [buffer[pos:]]
+            size = len(pending[0])
+            while size < need:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                    pending.append(decode(b"", final=True))
+                    break
+                pending.append(decode(chunk))
+                size += len(pending[-1])
+            buffer, pos = "".join(pending), 0
+            continue
+        if pos == len(buffer):
+            raise ValueError("Unexpected end of JSON body")
+        char = buffer[pos]
+        if state == "open":
+            if char != "[":
+                # Not an array: nothing to stream
+                rest = [buffer[pos:]] + [decode(chunk) for chunk in chunks] + [decode(b"", final=True)]
+                return decoder.decode("".join(rest))
+            state, pos = "first", pos + 1
+        elif char == "]" and state in ("first", "separator"):
+            # Only whitespace may follow the array
+            rest = buffer[pos + 1:] + "".join(decode(chunk) for chunk in chunks) + decode(b"", final=True)
+            if _WHITESPACE.match(rest).end() != len(rest):
+                raise ValueError("Extra data after JSON array")
+            return items
+        elif state == "separator":
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            state, pos = "item", pos + 1
+        else:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                need = max(2 * (len(buffer) - pos), 1)
+                continue
+            if end == len(buffer) or buffer[end] not in _DELIMITERS:
+                if eof and end == len(buffer):
+                    raise ValueError("Unexpected end of JSON body")
+                if eof:
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {buffer[end]!r}")
+                # A number cut by a chunk boundary (e.g. '2.' + '5') decodes to its prefix,
+                # so an element is only complete once a delimiter follows it
+                need = len(buffer) - pos + 1
+                continue
+            items.append(item)
+            state, pos, need = "separator", end, 1
 
 
 class OddsClient:
@@ -18,16 +373,81 @@ class OddsClient:
     
     BASE_URL = "https://api.the-odds-api.com/v4"
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: Union[str, Sequence[str]], timeout: Optional[float] = None, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_cap: float = 8.0, retry_budget: float = 20.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 hedge_percentile: Optional[float] = None, hedge_min_samples: int = 20,
+                 hedge_min_remaining: int = 100, hedge_max_ratio: float = 0.1, stream_json: bool = False,
+                 on_phase: Optional[Callable[[str, float], None]] = None, max_last_good: int = 256,
+                 outright_sports: Optional[set] = None):
         """
         Initialize the Wagyu Sports client.
         
         Args:
-            api_key (str): API key for authentication with The Odds API
+            api_key (Union[str, Sequence[str]]): API key for authentication with The Odds API,
+                or a pool of keys (a sequence or a comma-separated string)
+            timeout (float, optional): Per-attempt HTTP timeout in seconds. Defaults to None (no timeout).
+            max_retries (int): Retries after the first attempt for timeouts, connection
+                errors, 429 and 5xx responses. Defaults to 3.
+            backoff_base (float): Base delay in seconds for exponential backoff. Defaults to 0.5.
+            backoff_cap (float): Maximum delay between attempts in seconds. Defaults to 8.0.
+            retry_budget (float): Maximum total seconds spent sleeping between attempts. Defaults to 20.0.
+            failure_threshold (int): Consecutive failed requests before an endpoint's
+                circuit opens. Defaults to 5.
+            reset_timeout (float): Seconds an open circuit fails fast. Defaults to 30.0.
+            hedge_percentile (float, optional): When set, a duplicate request is sent if the
+                first one is still pending after this latency percentile (e.g., 95) of the
+                endpoint. Defaults to None (no hedging).
+            hedge_min_samples (int): Latency samples required before hedging. Defaults to 20.
+            hedge_min_remaining (int): Only hedge while the known remaining quota is above
+                this. Defaults to 100.
+            hedge_max_ratio (float): Maximum fraction of requests that may be hedged. Defaults to 0.1.
+            stream_json (bool): Stream response bodies and parse them incrementally with
+                ``load_json_stream`` instead of ``response.json()``, which lowers peak memory
+                for large /odds responses. Defaults to False.
+            on_phase (Callable[[str, float], None], optional): Called with ('network', seconds)
+                after each attempt and ('parse', seconds) after parsing a body, for profiling.
+                Defaults to None.
+            max_last_good (int): Last good responses kept for the stale fallback, least
+                recently used first out. Defaults to 256.
+            outright_sports (set, optional): Set the sports flagged ``has_outrights`` by /sports
+                are added to, so a caller can share it. Defaults to a new set.
         """
-        self.api_key = api_key
+        if isinstance(api_key, str):
+            keys = [key.strip() for key in api_key.split(",") if key.strip()]
+        else:
+            keys = list(api_key or [])
+        self.key_pool = ApiKeyPool(keys)
+        self.api_key = keys[0] if keys else api_key
         self.remaining_requests = None
         self.used_requests = None
+        self.last_request_cost = None
+        
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_budget = retry_budget
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._last_good: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.max_last_good = max_last_good
+        self._lock = threading.Lock()
+        
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_remaining = hedge_min_remaining
+        self.hedge_max_ratio = hedge_max_ratio
+        self.latency: Dict[str, LatencyTracker] = {}
+        self.hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "loser_cost": 0}
+        # Quota spent by losing hedged requests, per endpoint
+        self.hedge_cost: Dict[str, int] = {}
+        self._hedge_pool = None
+        # Sports flagged has_outrights by /sports, in addition to is_outright_sport()
+        self.outright_sports = outright_sports if outright_sports is not None else set()
+        self.stream_json = stream_json
+        self.on_phase = on_phase
     
     def get_sports(self, all_sports: bool = False) -> Dict[str, Any]:
         """
@@ -46,7 +466,11 @@ class OddsClient:
         if all_sports:
             params["all"] = "true"
             
-        return self.make_request("/sports", params)
+        result = self.make_request("/sports", params)
+        for sport in result.get("data") or []:
+            if isinstance(sport, dict) and sport.get("has_outrights"):
+                self.outright_sports.add(sport["key"])
+        return result
     
     def get_odds(self, sport: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
@@ -60,6 +484,8 @@ class OddsClient:
                 - markets: Comma-separated list of markets (e.g., 'h2h,spreads')
                 - oddsFormat: Format for odds ('decimal' or 'american')
                 - dateFormat: Format for dates ('unix' or 'iso')
+                Outright sports (e.g. 'americanfootball_nfl_super_bowl_winner') only offer
+                the 'outrights' market, which is requested unless markets is given.
                 
         Returns:
             Dict[str, Any]: Response containing odds data
@@ -72,6 +498,9 @@ class OddsClient:
         
         if options:
             params.update(options)
+        if "markets" not in params and is_outright_sport(sport, self.outright_sports):
+            # The API's default of h2h is rejected for outright sports
+            params["markets"] = OUTRIGHTS_MARKET
             
         return self.make_request(endpoint, params)
     
@@ -79,6 +508,16 @@ class OddsClient:
         """
         Make a request to the sports data API.
         
+        Timeouts, connection errors, 429 and 5xx responses are retried with capped
+        exponential backoff and full jitter, honoring ``Retry-After``. Each endpoint
+        has a circuit breaker that fails fast while the upstream keeps failing, and
+        attempts may be hedged (see ``hedge_percentile``). When
+        a request cannot be completed, the last good response for the same endpoint
+        and parameters is returned with a ``stale`` marker instead.
+        
+        If ``params`` contains ``apiKey``, it is replaced with the pool key that has
+        the most headroom; exhausted or revoked keys are skipped automatically.
+        
         Args:
             endpoint (str): API endpoint (e.g., '/sports')
             params (Dict[str, Any], optional): Query parameters. Defaults to None.
@@ -87,25 +526,270 @@ class OddsClient:
             Dict[str, Any]: Response data
             
         Raises:
-            requests.exceptions.RequestException: If the request fails
+            requests.exceptions.RequestException: If the request fails and no previous
+                good response is available
         """
         url = f"{self.BASE_URL}{endpoint}"
-        response = requests.get(url, params=params)
+        key = self._response_key(endpoint, params)
+        breaker = self._breaker(endpoint)
         
-        # Store quota information from headers
-        if 'x-requests-remaining' in response.headers:
-            self.remaining_requests = response.headers['x-requests-remaining']
-        if 'x-requests-used' in response.headers:
-            self.used_requests = response.headers['x-requests-used']
+        if not breaker.allow():
+            return self._stale_or_raise(endpoint, params, CircuitOpenError(f"Circuit open for {endpoint}"))
         
-        # Raise exception for error status codes
-        response.raise_for_status()
+        slept = 0.0
+        attempt = 0
+        while True:
+            retry_after = None
+            key_state = None
+            if params and "apiKey" in params:
+                try:
+                    key_state = self.key_pool.select()
+                except NoUsableKeyError as e:
+                    error = e
+                    break
+                params = dict(params, apiKey=key_state.key)
+            
+            try:
+                response = self._send(endpoint, url, params, key_state)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                error = e
+            else:
+                # Store quota information from headers
+                if key_state is not None:
+                    self.key_pool.record(key_state, response.status_code, response.headers)
+                if 'x-requests-remaining' in response.headers:
+                    self.remaining_requests = self._pool_remaining(key_state, response.headers)
+                if 'x-requests-used' in response.headers:
+                    self.used_requests = response.headers['x-requests-used']
+                # Cost of this request only, so never carried over from a previous response
+                self.last_request_cost = response.headers.get('x-requests-last')
+                
+                if (key_state is not None and response.status_code in (401, 429)
+                        and key_state.health != "healthy" and self.key_pool.has_usable()):
+                    # The request was rejected for this key, so retry right away with another one
+                    continue
+                
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    # Raise exception for other error status codes
+                    try:
+                        response.raise_for_status()
+                    except Exception:
+                        # The upstream answered, so this does not count against the circuit
+                        breaker.record_success()
+                        response.close()
+                        raise
+                    
+                    # Return JSON response
+                    result = {
+                        "data": self._json(response),
+                        "headers": {
+                            "x-requests-remaining": self.remaining_requests,
+                            "x-requests-used": self.used_requests,
+                            "x-requests-last": self.last_request_cost
+                        }
+                    }
+                    breaker.record_success()
+                    with self._lock:
+                        self._last_good[key] = (time.time(), result)
+                        self._last_good.move_to_end(key)
+                        while len(self._last_good) > self.max_last_good:
+                            self._last_good.popitem(last=False)
+                    return result
+                
+                error = requests.exceptions.HTTPError(
+                    f"{response.status_code} Error for url: {url}", response=response
+                )
+                retry_after = self._retry_after(response)
+                response.close()
+            
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff_delay(attempt, retry_after)
+            if delay is None or slept + delay > self.retry_budget:
+                break
+            time.sleep(delay)
+            slept += delay
+            attempt += 1
         
-        # Return JSON response
-        return {
-            "data": response.json(),
-            "headers": {
-                "x-requests-remaining": self.remaining_requests,
-                "x-requests-used": self.used_requests
-            }
-        }
+        breaker.record_failure()
+        return self._stale_or_raise(endpoint, params, error)
+    
+    def _get(self, url: str, params: Optional[Dict[str, Any]]) -> requests.Response:
+        kwargs: Dict[str, Any] = {}
+        if self.timeout is not None:
+            kwargs["timeout"] = self.timeout
+        if self.stream_json:
+            kwargs["stream"] = True
+        return requests.get(url, params=params, **kwargs)
+    
+    def _json(self, response: requests.Response) -> Any:
+        """Parse a successful response body."""
+        start = time.monotonic()
+        try:
+            if not self.stream_json:
+                return response.json()
+            # Reading the streamed body happens here too
+            return load_json_stream(response.iter_content(STREAM_CHUNK_SIZE))
+        finally:
+            if self.stream_json:
+                response.close()
+            if self.on_phase is not None:
+                self.on_phase("parse", time.monotonic() - start)
+    
+    def _send(self, endpoint: str, url: str, params: Optional[Dict[str, Any]],
+              key_state: Optional[ApiKeyState] = None) -> requests.Response:
+        """Send one attempt, hedging it with a duplicate if it runs past the latency percentile."""
+        with self._lock:
+            tracker = self.latency.setdefault(endpoint, LatencyTracker())
+            self.hedge_stats["requests"] += 1
+        delay = self._hedge_delay(tracker)
+        start = time.monotonic()
+        
+        if delay is None:
+            response = self._get(url, params)
+            self._record_latency(tracker, time.monotonic() - start)
+            return response
+        
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="odds-hedge")
+        primary = self._hedge_pool.submit(self._get, url, params)
+        done, _ = wait([primary], timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedge_stats["hedged"] += 1
+            hedge = self._hedge_pool.submit(self._get, url, params)
+            done, pending = wait([primary, hedge], return_when=FIRST_COMPLETED)
+            winner = done.pop()
+            if winner.exception() is not None and pending:
+                # Whichever request succeeds first wins; fall back to waiting for the other
+                winner = pending.pop()
+            # The loser spends quota too, whenever it finishes
+            loser = hedge if winner is primary else primary
+            loser.add_done_callback(lambda f: self._settle_loser(endpoint, key_state, f))
+            if winner is hedge:
+                with self._lock:
+                    self.hedge_stats["hedge_wins"] += 1
+            response = winner.result()
+        else:
+            response = primary.result()
+        self._record_latency(tracker, time.monotonic() - start)
+        return response
+    
+    def _settle_loser(self, endpoint: str, key_state: Optional[ApiKeyState], future) -> None:
+        """Account for the quota a losing hedged request spent."""
+        if future.exception() is not None:
+            return
+        response = future.result()
+        headers = response.headers
+        try:
+            if key_state is not None:
+                self.key_pool.record(key_state, response.status_code, headers)
+            with self._lock:
+                # The loser usually answered last, so its counters are the newest
+                used = headers.get('x-requests-used')
+                try:
+                    newer = self.used_requests is None or int(float(used)) > int(float(self.used_requests))
+                except (TypeError, ValueError):
+                    newer = False
+                if used is not None and newer:
+                    self.used_requests = used
+            if 'x-requests-remaining' in headers:
+                self.remaining_requests = self._pool_remaining(key_state, headers)
+                try:
+                    cost = int(float(headers['x-requests-last']))
+                except (KeyError, TypeError, ValueError):
+                    cost = 0
+                self.hedge_stats["loser_cost"] += cost
+                self.hedge_cost[endpoint] = self.hedge_cost.get(endpoint, 0) + cost
+        finally:
+            if self.stream_json:
+                # A streamed loser holds its connection until its body is closed
+                response.close()
+    
+    def _pool_remaining(self, key_state: Optional[ApiKeyState], headers: Any) -> str:
+        """Quota left across the pool once a response from ``key_state`` is recorded."""
+        # The answering key's header only speaks for that key
+        total = self.key_pool.total_remaining() if key_state is not None else None
+        return str(total) if total is not None else headers['x-requests-remaining']
+    
+    def _record_latency(self, tracker: LatencyTracker, seconds: float) -> None:
+        tracker.record(seconds)
+        if self.on_phase is not None:
+            self.on_phase("network", seconds)
+    
+    def _hedge_delay(self, tracker: LatencyTracker) -> Optional[float]:
+        """Seconds to wait before hedging, or None if this request must not be hedged."""
+        if self.hedge_percentile is None or len(tracker.samples) < self.hedge_min_samples:
+            return None
+        remaining = self.key_pool.total_remaining()
+        if remaining is None:
+            try:
+                remaining = int(self.remaining_requests)
+            except (TypeError, ValueError):
+                # Unknown quota: do not spend it on duplicates
+                return None
+        if remaining <= self.hedge_min_remaining:
+            return None
+        with self._lock:
+            if self.hedge_stats["hedged"] >= self.hedge_max_ratio * self.hedge_stats["requests"]:
+                return None
+        return tracker.percentile(self.hedge_percentile)
+    
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return self.breakers[endpoint]
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Delay before the next attempt, or None when Retry-After exceeds the backoff cap."""
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_cap else None
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get('Retry-After')
+        try:
+            return max(float(value), 0.0)
+        except (TypeError, ValueError):
+            return None
+    
+    @staticmethod
+    def _response_key(endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple:
+        items = (params or {}).items()
+        return (endpoint, tuple(sorted((k, str(v)) for k, v in items if k != "apiKey")))
+    
+    def last_good_response(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                           reason: str = "") -> Optional[Dict[str, Any]]:
+        """
+        Get the last good response for an endpoint and parameters, marked as stale.
+        
+        Args:
+            endpoint (str): API endpoint (e.g., '/sports')
+            params (Dict[str, Any], optional): Query parameters; the API key is ignored
+            reason (str): Why the stale response is being used
+            
+        Returns:
+            Optional[Dict[str, Any]]: Response with a ``stale`` section, or None if there is none
+        """
+        with self._lock:
+            key = self._response_key(endpoint, params)
+            last_good = self._last_good.get(key)
+            if last_good is not None:
+                self._last_good.move_to_end(key)
+        if last_good is None:
+            return None
+        fetched_at, result = last_good
+        return dict(result, stale={
+            "fetched_at": datetime.fromtimestamp(fetched_at, tz=timezone.utc).isoformat(),
+            "age_seconds": round(time.time() - fetched_at, 3),
+            "reason": reason
+        })
+    
+    def _stale_or_raise(self, endpoint: str, params: Optional[Dict[str, Any]], error: Exception) -> Dict[str, Any]:
+        result = self.last_good_response(endpoint, params, reason=str(error))
+        if result is None:
+            raise error
+        return result
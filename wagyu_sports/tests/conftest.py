@@ -0,0 +1,28 @@
+"""Shared fixtures for the Wagyu Sports tests"""
+
+import json
+from pathlib import Path
+import pytest
+
+MOCKS_DIR = Path(__file__).parent.parent / "mcp_server" / "mocks_live"
+
+
+@pytest.fixture
+def mocks_dir():
+    """Directory of the captured live responses."""
+    return MOCKS_DIR
+
+
+@pytest.fixture
+def nba_response():
+    """Loader returning a fresh copy of the captured NBA /odds response on every call."""
+    def load():
+        with open(MOCKS_DIR / "nba_games_live.json") as f:
+            return json.load(f)
+    return load
+
+
+@pytest.fixture
+def nba_events(nba_response):
+    """Loader returning a fresh copy of the captured NBA events on every call."""
+    return lambda: nba_response()["data"]
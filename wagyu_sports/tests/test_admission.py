@@ -0,0 +1,96 @@
+"""Tests for admission control and fair queuing"""
+
+import asyncio
+import json
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.admission import FairGate, Shed
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+H2H_SPREADS_US = {"regions": "us", "markets": "h2h,spreads", "oddsFormat": "decimal"}
+
+
+@pytest.mark.anyio
+async def test_slots_rotate_between_sessions():
+    """A chatty session does not keep the slot from a session that queued later"""
+    gate = FairGate("get_odds", limit=1, max_queue=10, max_session_queue=10)
+    order = []
+
+    async def call(session, n):
+        await gate.acquire(session)
+        order.append(f"{session}{n}")
+        await asyncio.sleep(0)
+        gate.release()
+
+    await gate.acquire("a")
+    tasks = [asyncio.create_task(call("a", n)) for n in (2, 3, 4)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call("b", 1)))
+    await asyncio.sleep(0)
+    assert gate.metrics()["queue_depth"] == 4
+    gate.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["a2", "b1", "a3", "a4"]
+    metrics = gate.metrics()
+    assert metrics["running"] == 0 and metrics["queue_depth"] == 0
+    assert metrics["admitted"] == 5 and metrics["peak_queued"] == 4
+    assert metrics["wait_ms"]["p95"] >= 0
+
+
+@pytest.mark.anyio
+async def test_full_queues_shed():
+    """Calls beyond a session's or the tool's queue are shed"""
+    gate = FairGate("get_odds", limit=1, max_queue=2, max_session_queue=1)
+    await gate.acquire("a")
+    waiting = asyncio.create_task(gate.acquire("a"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Shed):
+        await gate.acquire("a")
+    other = asyncio.create_task(gate.acquire("b"))
+    await asyncio.sleep(0)
+    with pytest.raises(Shed):
+        await gate.acquire("c")
+
+    # A caller that gives up leaves the queue
+    other.cancel()
+    await asyncio.gather(other, return_exceptions=True)
+    assert gate.metrics()["queue_depth"] == 1
+    gate.release()
+    await waiting
+    assert gate.stats["shed"] == 2
+
+
+@pytest.mark.anyio
+async def test_shed_calls_answer_from_cache(nba_response):
+    """With no slot free, get_odds answers from cache and other tools say busy"""
+    server = OddsMcpServer(offline=True, max_concurrent=1, max_queue=0)
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, nba_response())
+    await server.admission.gate("get_odds").acquire("other session")
+    await server.admission.gate("get_sports").acquire("other session")
+
+    async with client_session(server.server) as client:
+        odds = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us",
+                                                   "markets": "h2h"})
+        sports = await client.call_tool("get_sports", {})
+        server.admission.gate("get_sports").release()
+        sports_later = await client.call_tool("get_sports", {})
+        quota = await client.call_tool("get_quota_info", {})
+
+    odds = json.loads(odds.content[0].text)
+    assert odds["stale"]["busy"] is True and odds["data"]
+    assert json.loads(sports.content[0].text)["busy"] is True
+    assert "data" in json.loads(sports_later.content[0].text)
+    admission = json.loads(quota.content[0].text)["admission"]
+    assert admission["get_odds"]["shed"] == 1
+    assert admission["get_sports"]["admitted"] == 2
@@ -0,0 +1,145 @@
+"""Tests for the alert rule engine and its tools"""
+
+import json
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.alert_rules import AlertEngine
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+NOW = 1_741_000_000.0
+H2H_SPREADS_US = {"regions": "us", "markets": "h2h,spreads", "oddsFormat": "decimal"}
+
+
+def snapshot(warriors=1.9, spread=-3.5, book="draftkings"):
+    return [{"id": "gsw-lal", "home_team": "Golden State Warriors", "away_team": "Los Angeles Lakers",
+             "bookmakers": [{"key": book, "markets": [
+                 {"key": "h2h", "outcomes": [{"name": "Golden State Warriors", "price": warriors},
+                                             {"name": "Los Angeles Lakers", "price": 1.9}]},
+                 {"key": "spreads", "outcomes": [{"name": "Golden State Warriors", "price": 1.91, "point": spread},
+                                                 {"name": "Los Angeles Lakers", "price": 1.91, "point": -spread}]},
+             ]}]}]
+
+
+def test_level_rule_fires_once_per_crossing():
+    """A level rule fires when the line crosses into range, and re-arms when it leaves"""
+    engine = AlertEngine()
+    rule = engine.add_rule("h2h", outcome="Golden State Warriors", above=2.5)
+
+    assert engine.process("basketball_nba", snapshot(2.4), NOW) == []
+    fired = engine.process("basketball_nba", snapshot(2.6), NOW + 60)
+    assert [(a["rule_id"], a["bookmaker"], a["price"]) for a in fired] == [(rule.id, "draftkings", 2.6)]
+    assert engine.process("basketball_nba", snapshot(2.7), NOW + 120) == []
+    assert engine.process("basketball_nba", snapshot(2.3), NOW + 180) == []
+    assert len(engine.process("basketball_nba", snapshot(2.6), NOW + 240)) == 1
+    # Every book is tracked separately
+    assert len(engine.process("basketball_nba", snapshot(2.6, book="fanduel"), NOW + 300)) == 1
+
+
+def test_movement_rule_uses_window():
+    """A movement rule compares against the value in effect at the start of its window"""
+    engine = AlertEngine()
+    engine.add_rule("spreads", outcome="Golden State Warriors", field="point", move=1.5, window=1800)
+
+    engine.process("basketball_nba", snapshot(spread=-3.5), NOW)
+    assert engine.process("basketball_nba", snapshot(spread=-4.0), NOW + 2000) == []
+    # -3.5 was still in effect 30 minutes ago
+    fired = engine.process("basketball_nba", snapshot(spread=-5.0), NOW + 2100)
+    assert [a["moved"] for a in fired] == [-1.5]
+    # The same move does not fire twice
+    assert engine.process("basketball_nba", snapshot(spread=-5.5), NOW + 2200) == []
+    assert engine.process("basketball_nba", snapshot(spread=-4.5), NOW + 2300) == []
+    # Moving back is a new move
+    assert len(engine.process("basketball_nba", snapshot(spread=-3.5), NOW + 2400)) == 1
+
+    slow = AlertEngine()
+    slow.add_rule("spreads", outcome="Golden State Warriors", field="point", move=1.5, window=1800)
+    for minutes, spread in ((0, -3.5), (40, -4.0), (80, -4.5), (120, -5.0)):
+        assert slow.process("basketball_nba", snapshot(spread=spread), NOW + minutes * 60) == []
+
+
+def test_only_changed_lines_are_evaluated():
+    """Unchanged lines and unrelated markets never reach the rules"""
+    engine = AlertEngine()
+    for level in range(200):
+        engine.add_rule("h2h", event_id=f"other{level}", above=2.0)
+    engine.add_rule("h2h", outcome="Golden State Warriors", above=5.0)
+
+    engine.process("basketball_nba", snapshot(), NOW)
+    engine.process("basketball_nba", snapshot(), NOW + 60)
+    engine.process("basketball_nba", snapshot(2.0), NOW + 120)
+
+    assert engine.stats["deltas"] == 4 + 1
+    assert engine.stats["evaluations"] == 2
+    assert engine.remove_rule(201) is True
+    assert engine.remove_rule(201) is False
+    assert len(engine.rules()) == 200
+
+
+def test_evicted_events_are_forgotten():
+    """Line state goes away with the events the odds board evicts"""
+    server = OddsMcpServer(offline=True)
+    engine = server.alerts
+    engine.add_rule("h2h", outcome="Golden State Warriors", above=2.5)
+    engine.add_rule("spreads", outcome="Golden State Warriors", field="point", move=1.5, window=1800)
+    other = [dict(snapshot()[0], id="bos-nyk")]
+
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": snapshot(2.6) + other}, fetched_at=NOW)
+    assert len(engine._last) == 8 and len(engine._history) == 4 and len(engine._met) == 2
+
+    # The board drops gsw-lal after it misses three refreshes
+    for minutes in (1, 2, 3):
+        server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": other}, fetched_at=NOW + minutes * 60)
+
+    assert server.board.event("basketball_nba", "gsw-lal") is None
+    assert {line[0] for line in engine._last} == {"bos-nyk"}
+    assert {line[0] for line in engine._history} == {"bos-nyk"}
+    assert {key[1][0] for key in engine._met} == {"bos-nyk"}
+
+
+def test_invalid_rules_are_rejected():
+    """Rules need exactly one kind of condition"""
+    engine = AlertEngine()
+    with pytest.raises(ValueError):
+        engine.add_rule("h2h")
+    with pytest.raises(ValueError):
+        engine.add_rule("h2h", above=2.0, move=0.1)
+    with pytest.raises(ValueError):
+        engine.add_rule("h2h", field="total", above=2.0)
+
+
+@pytest.mark.anyio
+async def test_alert_tools():
+    """Rules added through the tools fire on ingested odds"""
+    server = OddsMcpServer(offline=True)
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": snapshot(2.4)}, fetched_at=NOW)
+
+    async with client_session(server.server) as client:
+        added = await client.call_tool("add_alert_rule", {
+            "market": "h2h", "outcome": "Golden State Warriors", "above": 150, "odds_format": "american"})
+        rule = json.loads(added.content[0].text)
+        assert rule["above"] == 2.5
+
+        server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": snapshot(2.55)}, fetched_at=NOW + 60)
+
+        alerts = json.loads((await client.call_tool("get_triggered_alerts", {})).content[0].text)
+        listed = json.loads((await client.call_tool("list_alert_rules", {})).content[0].text)
+        removed = json.loads((await client.call_tool("remove_alert_rule", {"rule_id": rule["id"]})).content[0].text)
+        missing = json.loads((await client.call_tool("remove_alert_rule", {"rule_id": rule["id"]})).content[0].text)
+        later = json.loads((await client.call_tool("get_triggered_alerts", {"since_id": alerts[0]["id"]})).content[0].text)
+
+    assert [(a["rule_id"], a["event"], a["price"]) for a in alerts] == \
+        [(rule["id"], "Los Angeles Lakers @ Golden State Warriors", 2.55)]
+    assert [r["id"] for r in listed["rules"]] == [rule["id"]]
+    assert listed["stats"]["alerts"] == 1
+    assert removed == {"removed": rule["id"]}
+    assert "error" in missing
+    assert later == []
@@ -0,0 +1,138 @@
+"""Tests for the cross-process shared cache daemon"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server import cache_daemon
+from wagyu_sports.mcp_server.cache_daemon import CacheDaemon, SharedCacheClient
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "cache.sock")
+
+
+@pytest.fixture
+def daemon(socket_path):
+    """Run a daemon on a background event loop."""
+    yield from run_daemon(socket_path)
+
+
+def run_daemon(socket_path):
+    daemon = CacheDaemon(socket_path, idle_timeout=None)
+    thread = threading.Thread(target=asyncio.run, args=(daemon.serve(),), daemon=True)
+    thread.start()
+    while not os.path.exists(socket_path):
+        time.sleep(0.01)
+    yield daemon
+    SharedCacheClient(socket_path, autostart=False).request({"op": "shutdown"})
+    thread.join(timeout=5)
+
+
+def test_single_flight_across_clients(daemon, socket_path):
+    """Concurrent fetches of the same key reach the upstream once"""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.3)
+        return {"data": ["snapshot"], "headers": {}}
+
+    def attach():
+        return SharedCacheClient(socket_path, autostart=False).single_flight("nba", fetch, max_age=60)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(lambda _: attach(), range(3)))
+
+    assert len(calls) == 1
+    assert all(value == {"data": ["snapshot"], "headers": {}} for value, _, _ in results)
+    assert sorted(fetched for _, _, fetched in results) == [False, False, True]
+
+
+def test_failed_leader_releases_waiters(daemon, socket_path):
+    """When the leader's fetch fails another process may fetch"""
+    client = SharedCacheClient(socket_path, autostart=False)
+
+    def failing():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        client.single_flight("nba", failing, max_age=60)
+    value, _, fetched = client.single_flight("nba", lambda: {"data": []}, max_age=60)
+
+    assert fetched is True
+    assert value == {"data": []}
+
+
+def test_global_quota_ledger(daemon, socket_path):
+    """Quota reports from several processes are merged"""
+    first = SharedCacheClient(socket_path, autostart=False)
+    second = SharedCacheClient(socket_path, autostart=False)
+
+    first.record_quota([{"key": "****aaaa", "remaining_requests": 90, "used_requests": 10}], spent=2)
+    second.record_quota([{"key": "****aaaa", "remaining_requests": 88, "used_requests": 12}], spent=2)
+
+    ledger = first.ledger()
+    assert ledger["spent"] == 4
+    assert ledger["upstream_calls"] == 2
+    assert ledger["keys"]["****aaaa"]["used_requests"] == 12
+
+
+def test_falls_back_to_local_when_unavailable(socket_path):
+    """Without a daemon every call goes straight upstream"""
+    client = SharedCacheClient(socket_path, autostart=False)
+
+    value, _, fetched = client.single_flight("nba", lambda: "local", max_age=60)
+
+    assert (value, fetched) == ("local", True)
+    assert client.available is False
+    assert client.ledger() is None
+
+
+def test_autostart(socket_path):
+    """The daemon is started on first use"""
+    client = SharedCacheClient(socket_path, autostart=True)
+    try:
+        response = client.request({"op": "ping"})
+        assert response["ok"] is True
+        assert response["pid"] != os.getpid()
+    finally:
+        client.request({"op": "shutdown"})
+
+
+def test_connections_are_reused(daemon, socket_path):
+    """Sequential requests from one client share a connection"""
+    client = SharedCacheClient(socket_path, autostart=False)
+    for _ in range(3):
+        assert client.request({"op": "ping"})["ok"] is True
+
+    assert daemon.connections == 1
+    client.close()
+
+
+def test_oversized_message_is_answered(socket_path, monkeypatch):
+    """A line over the size limit gets an error reply and the daemon keeps serving"""
+    monkeypatch.setattr(cache_daemon, "MAX_MESSAGE_BYTES", 1024)
+    running = run_daemon(socket_path)
+    next(running)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps({"op": "ping", "padding": "x" * 4096}).encode() + b"\n")
+            with sock.makefile("rb") as stream:
+                assert "error" in json.loads(stream.readline())
+
+        assert SharedCacheClient(socket_path, autostart=False).request({"op": "ping"})["ok"] is True
+    finally:
+        next(running, None)
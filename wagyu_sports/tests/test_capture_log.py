@@ -0,0 +1,104 @@
+"""Tests for the append-only capture log"""
+
+import gzip
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server import capture_log
+from wagyu_sports.mcp_server.capture_log import CaptureLog, CaptureReader, INDEX_ENTRY, is_capture_log
+from wagyu_sports.mcp_server.replay import load_snapshots
+
+
+def test_append_and_read(tmp_path):
+    """Records come back in order with their metadata"""
+    with CaptureLog(tmp_path) as log:
+        assert log.append("get_sports", {"data": []}, captured_at=100.0) == 0
+        assert log.append("get_odds", {"data": [1, 2]}, {"sport": "basketball_nba"}, captured_at=160.0) == 1
+
+    assert is_capture_log(tmp_path)
+    with CaptureReader(tmp_path) as reader:
+        assert len(reader) == 2
+        record = reader.read(1)
+        assert record["_metadata"]["method"] == "get_odds"
+        assert record["_metadata"]["parameters"] == {"sport": "basketball_nba"}
+        assert record["data"] == {"data": [1, 2]}
+        assert reader.seek(150.0) == 1
+        assert [r["_metadata"]["method"] for r in reader.records(since=100.0)] == ["get_sports", "get_odds"]
+
+
+def test_segments_roll_over(tmp_path):
+    """Full segments are left behind and record numbers continue across them and across writers"""
+    log = CaptureLog(tmp_path, max_segment_bytes=1)
+    other = CaptureLog(tmp_path, max_segment_bytes=1)
+    numbers = [log.append("get_odds", {"n": 0}), other.append("get_odds", {"n": 1}), log.append("get_odds", {"n": 2})]
+    log.close()
+    other.close()
+
+    assert numbers == [0, 1, 2]
+    segments = sorted(tmp_path.glob("segment-*.ndjson.gz"))
+    assert len(segments) == 3
+    # Each segment is a plain gzip stream of NDJSON lines
+    assert [json.loads(gzip.open(segment).read())["data"] for segment in segments] == [{"n": n} for n in range(3)]
+    with CaptureReader(tmp_path) as reader:
+        assert [reader.read(n)["data"]["n"] for n in range(len(reader))] == [0, 1, 2]
+
+
+def test_reader_refresh_and_torn_index(tmp_path):
+    """A reader picks up new records and a torn index entry is dropped on reopen"""
+    log = CaptureLog(tmp_path)
+    log.append("get_odds", {"n": 0})
+    reader = CaptureReader(tmp_path)
+    log.append("get_odds", {"n": 1})
+    log.close()
+    reader.refresh()
+    assert len(reader) == 2
+
+    # An append interrupted halfway through its index entry
+    with open(tmp_path / "segment-000001.index", "ab") as f:
+        f.write(b"\0" * (INDEX_ENTRY.size // 2))
+    with CaptureLog(tmp_path) as log:
+        assert log.append("get_odds", {"n": 2}) == 2
+    with CaptureReader(tmp_path) as reader:
+        assert [record["data"]["n"] for record in reader.records()] == [0, 1, 2]
+
+
+def test_replay_from_capture_log(tmp_path, nba_events):
+    """Captured /odds responses replay as snapshots"""
+    with CaptureLog(tmp_path) as log:
+        log.append("get_sports", {"data": [{"key": "basketball_nba"}]}, captured_at=1000.0)
+        log.append("get_odds", {"data": nba_events(), "headers": {}},
+                   {"sport": "basketball_nba", "options": {"regions": "us", "markets": "h2h,spreads"}},
+                   captured_at=1060.0)
+
+    snapshots = load_snapshots([tmp_path])
+    assert [(s.fetched_at, s.sport) for s in snapshots] == [(1060.0, "basketball_nba")]
+    assert snapshots[0].options == {"oddsFormat": "decimal", "regions": "us", "markets": "h2h,spreads"}
+
+
+def test_appends_lock_without_fcntl(tmp_path, monkeypatch):
+    """Without fcntl (Windows), appends take a byte-range lock with msvcrt instead"""
+    calls = []
+    fake_msvcrt = SimpleNamespace(LK_LOCK=1, LK_UNLCK=0, locking=lambda fd, mode, size: calls.append(mode))
+    monkeypatch.setattr(capture_log, "fcntl", None)
+    monkeypatch.setattr(capture_log, "msvcrt", fake_msvcrt, raising=False)
+
+    with CaptureLog(tmp_path) as log:
+        log.append("get_sports", {"data": []}, captured_at=100.0)
+
+    assert calls == [1, 0, 1, 0]
+    with CaptureReader(tmp_path) as reader:
+        assert reader.read(0)["data"] == {"data": []}
+
+
+def test_client_utilities_do_not_load_the_capture_log():
+    """Importing the client utilities leaves the capture log (and fcntl) unloaded"""
+    script = "import sys, wagyu_sports.utils; print('wagyu_sports.mcp_server.capture_log' in sys.modules)"
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,152 @@
+"""Tests for the ESPN client and the ESPN/Odds API join index"""
+
+import asyncio
+import json
+import os
+import sys
+import httpx
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.espn_client import EspnClient, GameJoinIndex, espn_dates
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+
+def competitor(side, name, score):
+    return {"homeAway": side, "score": score, "team": {"displayName": name}}
+
+
+# ESPN scoreboard for 2025-03-03 (US Eastern) matching the captured NBA slate.
+# Portland is listed under a different name and Miami/Washington is missing.
+SCOREBOARD = {"events": [
+    {"id": "401705432", "name": "Golden State Warriors at Charlotte Hornets", "date": "2025-03-04T00:00Z",
+     "competitions": [{
+         "competitors": [competitor("home", "Charlotte Hornets", "58"), competitor("away", "Golden State Warriors", "61")],
+         "status": {"period": 3, "displayClock": "7:12", "type": {"state": "in", "completed": False,
+                                                                  "shortDetail": "7:12 - 3rd"}},
+     }]},
+    {"id": "401705433", "name": "Portland at Philadelphia", "date": "2025-03-04T00:00Z",
+     "competitions": [{
+         "competitors": [competitor("home", "Philadelphia 76ers", "0"), competitor("away", "Portland Blazers", "0")],
+         "status": {"period": 0, "displayClock": "0:00", "type": {"state": "pre", "completed": False}},
+     }]},
+    {"id": "401705434", "name": "Atlanta Hawks at Memphis Grizzlies", "date": "2025-03-04T01:00Z",
+     "competitions": [{
+         "competitors": [competitor("home", "Memphis Grizzlies", "0"), competitor("away", "Atlanta Hawks", "0")],
+         "status": {"period": 0, "displayClock": "0:00", "type": {"state": "pre", "completed": False}},
+     }]},
+]}
+
+
+class StandIn:
+    """Local stand-in for the ESPN site API."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if request.url.path.endswith("/basketball/nba/scoreboard") and request.url.params.get("dates") == "20250303":
+            return httpx.Response(200, json=SCOREBOARD)
+        if request.url.path.endswith("/basketball/nba/scoreboard"):
+            return httpx.Response(200, json={"events": []})
+        return httpx.Response(404)
+
+
+@pytest.mark.anyio
+async def test_scoreboard_is_cached_per_endpoint():
+    """Repeated and concurrent scoreboard requests reach ESPN once within the TTL"""
+    stand_in = StandIn()
+    client = EspnClient(transport=httpx.MockTransport(stand_in))
+
+    boards = await asyncio.gather(*(client.get_scoreboard("basketball_nba", "20250303") for _ in range(3)))
+    await client.get_scoreboard("basketball_nba", "20250303")
+
+    assert len(stand_in.requests) == 1
+    assert boards[0][0]["status"] == {"state": "in", "completed": False, "detail": "7:12 - 3rd",
+                                      "period": 3, "clock": "7:12"}
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.get_summary("basketball_nba", "401705432")
+    with pytest.raises(ValueError):
+        await client.get_scoreboard("cricket_test_match")
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_join_index_matches_once(nba_events):
+    """Events are matched by teams (or nicknames) and start time, then remembered"""
+    client = EspnClient(transport=httpx.MockTransport(StandIn()))
+    index = GameJoinIndex()
+    events = nba_events()
+    assert espn_dates(events) == ["20250303"]
+
+    index.add_games("basketball_nba", await client.get_scoreboard("basketball_nba", "20250303"))
+    matched = {event["home_team"]: (index.lookup("basketball_nba", event) or {}).get("id") for event in events}
+
+    assert matched == {
+        "Charlotte Hornets": "401705432",
+        "Philadelphia 76ers": "401705433",
+        "Miami Heat": None,
+        "Memphis Grizzlies": "401705434",
+    }
+    assert index.stats() == {"games": 3, "linked": 3, "unmatched": 1}
+
+    # A far-off start time is not the same game
+    rematch = dict(events[0], id="other", commence_time="2025-03-10T00:10:00Z")
+    assert index.lookup("basketball_nba", rematch) is None
+    await client.aclose()
+
+
+def test_join_index_evicts_finished_days():
+    """Old games leave the index with their links, and an unknown start time never matches"""
+    now = [1741050000.0]  # 2025-03-04T01:00Z
+    index = GameJoinIndex(clock=lambda: now[0])
+    game = lambda game_id, start, state="post": {"id": game_id, "home_team": "Charlotte Hornets",
+                                                 "away_team": "Golden State Warriors", "start": start,
+                                                 "status": {"state": state}}
+    event = {"id": "gsw-cha", "home_team": "Charlotte Hornets", "away_team": "Golden State Warriors",
+             "commence_time": "2025-03-04T00:00:00Z"}
+    index.add_games("basketball_nba", [game("tonight", 1741046400.0, "in"), game("undated", None)])
+    assert index.lookup("basketball_nba", event)["id"] == "tonight"
+    assert index.lookup("basketball_nba", dict(event, id="no-start", commence_time=None)) is None
+
+    # A week later, the next scoreboard evicts last week's games, except one still in progress
+    now[0] += 7 * 86400
+    index.add_games("basketball_nba", [game("next-week", now[0])])
+    assert sorted(index.games) == ["next-week", "tonight"]
+    index.games["tonight"]["status"]["state"] = "post"
+    index.add_games("basketball_nba", [game("next-week", now[0])])
+
+    assert list(index.games) == ["next-week"]
+    assert index.stats() == {"games": 1, "linked": 0, "unmatched": 0}
+    assert all(game_ids == ["next-week"] for game_ids in index._by_teams.values())
+
+
+def test_espn_dates_follow_daylight_saving():
+    """Scoreboard days are US Eastern dates under both EST and EDT"""
+    # 04:30 UTC is 23:30 the previous day in January (EST) but 00:30 the same day in July (EDT)
+    assert espn_dates([{"commence_time": "2025-01-15T04:30:00Z"}]) == ["20250114"]
+    assert espn_dates([{"commence_time": "2025-07-01T04:30:00Z"}]) == ["20250701"]
+
+
+@pytest.mark.anyio
+async def test_get_odds_with_scores():
+    """One tool call returns odds with the matching live scores"""
+    server = OddsMcpServer(test_mode=True)
+    server.espn = EspnClient(transport=httpx.MockTransport(StandIn()))
+
+    async with client_session(server.server) as client:
+        result = await client.call_tool("get_odds_with_scores", {"sport": "basketball_nba", "odds_format": "american"})
+        response = json.loads(result.content[0].text)
+
+    first = response["data"][0]
+    assert first["espn"]["home_score"] == "58"
+    assert first["espn"]["status"]["state"] == "in"
+    assert first["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] == 455
+    assert response["data"][2]["espn"] is None
@@ -0,0 +1,143 @@
+"""Tests for the precomputed game line summaries"""
+
+import json
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.game_lines import summarize_event, render_game
+from wagyu_sports.mcp_server.odds_projection import project_events, split_csv
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+HOME, AWAY = "Los Angeles Lakers", "Boston Celtics"
+
+
+def book(key, spread=None, total=None, moneyline=None):
+    markets = []
+    if moneyline:
+        markets.append({"key": "h2h", "outcomes": [{"name": HOME, "price": moneyline[0]},
+                                                   {"name": AWAY, "price": moneyline[1]}]})
+    if spread:
+        markets.append({"key": "spreads", "outcomes": [
+            {"name": HOME, "price": spread[1], "point": spread[0]},
+            {"name": AWAY, "price": 1.91, "point": -spread[0]}]})
+    if total:
+        markets.append({"key": "totals", "outcomes": [
+            {"name": "Over", "price": 1.91, "point": total},
+            {"name": "Under", "price": 1.91, "point": total}]})
+    return {"key": key, "title": key, "markets": markets}
+
+
+def game(*bookmakers):
+    return {"id": "lal-bos", "commence_time": "2025-03-04T03:00:00Z", "home_team": HOME, "away_team": AWAY,
+            "bookmakers": list(bookmakers)}
+
+
+EVENT = game(
+    book("draftkings", spread=(-4.5, 1.91), total=224.5, moneyline=(1.52, 2.6)),
+    book("fanduel", spread=(-4.5, 1.87), total=224.5, moneyline=(1.53, 2.55)),
+    book("betmgm", spread=(-5.0, 1.95), total=225.0, moneyline=(1.5, 2.7)),
+)
+
+
+def test_consensus_uses_most_offered_point():
+    """The main point is the one most books offer, priced at their median"""
+    summary = summarize_event(EVENT)
+
+    assert summary["consensus"]["spread"] == {"home_point": -4.5, "home_price": pytest.approx(1.89),
+                                              "away_price": 1.91, "books": 2}
+    assert summary["consensus"]["total"]["point"] == 224.5
+    assert summary["consensus"]["moneyline"] == {HOME: 1.52, AWAY: 2.6}
+    assert summary["consensus"]["best_moneyline"][AWAY] == {"price": 2.7, "book": "betmgm"}
+
+    rendered = render_game(summary)
+    assert rendered["line"] == f"{HOME} -4.5, O/U 224.5, {HOME} ML -192"
+    assert rendered["spread"]["price"] == -112
+
+
+def test_preferred_book_overrides_what_it_offers():
+    """A preferred book replaces the consensus only for the markets it has"""
+    event = game(*EVENT["bookmakers"], book("bovada", moneyline=(1.45, 2.9)))
+
+    rendered = render_game(summarize_event(event), "decimal", bookmaker="betmgm")
+    assert rendered["line"] == f"{HOME} -5, O/U 225, {HOME} ML 1.5"
+    assert rendered["spread"]["source"] == "betmgm"
+
+    rendered = render_game(summarize_event(event), "decimal", bookmaker="bovada")
+    assert rendered["spread"]["source"] == "consensus"
+    assert rendered["moneyline"] == {HOME: 1.45, AWAY: 2.9}
+    assert rendered["moneyline_source"] == "bovada"
+
+
+@pytest.mark.anyio
+async def test_get_game_lines_combines_ingested_markets():
+    """Markets ingested in separate snapshots are summarized together"""
+    server = OddsMcpServer(offline=True)
+    spreads_only = game(*[dict(b, markets=[m for m in b["markets"] if m["key"] != "totals"])
+                          for b in EVENT["bookmakers"]])
+    totals_only = game(*[dict(b, markets=[m for m in b["markets"] if m["key"] == "totals"])
+                         for b in EVENT["bookmakers"]])
+    server.ingest_odds("basketball_nba", {"regions": "us", "markets": "h2h,spreads"}, {"data": [spreads_only]})
+    server.ingest_odds("basketball_nba", {"regions": "us", "markets": "totals"}, {"data": [totals_only]})
+
+    async with client_session(server.server) as client:
+        result = await client.call_tool("get_game_lines", {"sport": "basketball_nba"})
+        missing = await client.call_tool("get_game_lines", {"sport": "soccer_epl"})
+
+    games = json.loads(result.content[0].text)["games"]
+    assert [g["line"] for g in games] == [f"{HOME} -4.5, O/U 224.5, {HOME} ML -192"]
+    assert "error" in json.loads(missing.content[0].text)
+
+
+@pytest.mark.anyio
+async def test_get_game_lines_only_summarizes_requested_regions():
+    """Books of other regions, merged on the board or cached for wider calls, stay out of a region's lines"""
+    server = OddsMcpServer(api_key="test_key", planner_window=0.0)
+    both = game(*EVENT["bookmakers"], book("skybet", moneyline=(1.4, 3.5)))
+    fetched = []
+
+    def get_odds(sport, options):
+        fetched.append(options["regions"])
+        return {"data": project_events([both], regions=split_csv(options["regions"])), "headers": {}}
+    server.client.get_odds = get_odds
+
+    async with client_session(server.server) as client:
+        await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us,uk",
+                                            "markets": "h2h,spreads,totals"})
+        us = await client.call_tool("get_game_lines", {"sport": "basketball_nba", "regions": "us"})
+        uk = await client.call_tool("get_game_lines", {"sport": "basketball_nba", "regions": "uk"})
+
+    # Both were answered from the one wider fetch, projected to their regions
+    assert fetched == ["uk,us"]
+    us, uk = json.loads(us.content[0].text)["games"][0], json.loads(uk.content[0].text)["games"][0]
+    assert us["best_moneyline"][AWAY]["book"] == "betmgm" and us["line"] == f"{HOME} -4.5, O/U 224.5, {HOME} ML -192"
+    assert uk["best_moneyline"][AWAY]["book"] == "skybet" and "spread" not in uk
+    # The stored summaries are kept apart by the regions they were ingested for
+    assert [s["books"].keys() for s in server.game_lines.get("basketball_nba", regions="uk,us")] == [
+        {"draftkings", "fanduel", "betmgm", "skybet"}]
+    assert server.game_lines.get("basketball_nba", regions="us") == []
+    # A us refresh is summarized without the uk book the board still holds from the wider fetch
+    server.ingest_odds("basketball_nba", {"regions": "us", "markets": "h2h"},
+                       {"data": project_events([both], markets={"h2h"}, regions={"us"})})
+    assert [s["books"].keys() for s in server.game_lines.get("basketball_nba", regions="us")] == [
+        {"draftkings", "fanduel", "betmgm"}]
+
+
+@pytest.mark.anyio
+async def test_get_game_lines_test_mode():
+    """Test mode summarizes the mock slate"""
+    server = OddsMcpServer(test_mode=True)
+
+    async with client_session(server.server) as client:
+        result = await client.call_tool("get_game_lines", {"sport": "basketball_nba"})
+
+    games = json.loads(result.content[0].text)["games"]
+    assert games and all(g["line"] for g in games)
+    assert games[0]["line"].startswith("Golden State Warriors -12")
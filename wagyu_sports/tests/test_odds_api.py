@@ -9,6 +9,7 @@ This file contains all tests for the Wagyu Sports client, including:
 """
 import os
 import sys
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 import importlib.util
@@ -17,7 +18,10 @@ import importlib.util
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the client
+import requests
 from wagyu_sports import OddsClient
+import json
+from wagyu_sports.odds_client import CircuitOpenError, LatencyTracker, load_json_stream
 from dotenv import load_dotenv
 
 
@@ -139,6 +143,269 @@ def test_make_request_error(mock_get, client):
     )
 
 
+def make_response(status_code, json_data=None, headers=None):
+    """Build a mock requests.Response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = json_data
+    if status_code >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} Error")
+    return response
+
+
+@patch('time.sleep')
+@patch('requests.get')
+def test_make_request_retries_transient_errors(mock_get, mock_sleep, client):
+    """Test that 5xx responses and timeouts are retried with capped backoff."""
+    mock_get.side_effect = [
+        make_response(503),
+        requests.exceptions.Timeout("timed out"),
+        make_response(200, [{"key": "sport1"}]),
+    ]
+    
+    result = client.get_sports()
+    
+    assert result['data'] == [{"key": "sport1"}]
+    assert mock_get.call_count == 3
+    assert mock_sleep.call_count == 2
+    assert all(0 <= call.args[0] <= client.backoff_cap for call in mock_sleep.call_args_list)
+
+
+@patch('time.sleep')
+@patch('requests.get')
+def test_make_request_honors_retry_after(mock_get, mock_sleep, client):
+    """Test that a 429 waits for the Retry-After interval."""
+    mock_get.side_effect = [
+        make_response(429, headers={'Retry-After': '2'}),
+        make_response(200, []),
+    ]
+    
+    client.get_sports()
+    
+    mock_sleep.assert_called_once_with(2.0)
+
+
+@patch('time.sleep')
+@patch('requests.get')
+def test_circuit_breaker_fails_fast(mock_get, mock_sleep):
+    """Test that an endpoint's circuit opens after repeated failures."""
+    client = OddsClient("test_api_key", max_retries=0, failure_threshold=2)
+    mock_get.return_value = make_response(502)
+    
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_sports()
+    with pytest.raises(CircuitOpenError):
+        client.get_sports()
+    
+    assert mock_get.call_count == 2
+    assert client.breakers['/sports'].state == "open"
+
+
+@patch('time.sleep')
+@patch('requests.get')
+def test_stale_fallback(mock_get, mock_sleep):
+    """Test that the last good response is returned with a staleness marker."""
+    client = OddsClient("test_api_key", max_retries=1)
+    mock_get.side_effect = [
+        make_response(200, [{"key": "sport1"}], {'x-requests-remaining': '10'}),
+        make_response(500),
+        requests.exceptions.ConnectionError("down"),
+    ]
+    
+    client.get_sports()
+    result = client.get_sports()
+    
+    assert result['data'] == [{"key": "sport1"}]
+    assert result['stale']['age_seconds'] >= 0
+    assert "down" in result['stale']['reason']
+
+
+@patch('time.sleep')
+@patch('requests.get')
+def test_last_good_responses_are_bounded(mock_get, mock_sleep):
+    """Test that only the most recently used last good responses are kept."""
+    client = OddsClient("test_api_key", max_retries=0, max_last_good=2)
+    mock_get.side_effect = lambda *args, **kwargs: make_response(200, [{"key": "sport1"}])
+    
+    for sport in ("a", "b", "c"):
+        client.get_odds(sport, {"regions": "us"})
+    
+    assert len(client._last_good) == 2
+    assert client.last_good_response("/sports/a/odds", {"regions": "us"}) is None
+    assert client.last_good_response("/sports/c/odds", {"regions": "us"}) is not None
+
+
+@patch('requests.get')
+def test_hedged_request(mock_get):
+    """Test that a slow request is hedged with a duplicate once past the latency percentile."""
+    client = OddsClient("test_api_key", hedge_percentile=50, hedge_min_samples=1)
+    client.remaining_requests = "1000"
+    client.latency['/sports'] = LatencyTracker()
+    client.latency['/sports'].record(0.01)
+    
+    def slow_then_fast(url, params):
+        if mock_get.call_count == 1:
+            time.sleep(0.5)
+            return make_response(200, ["slow"])
+        return make_response(200, ["fast"])
+    mock_get.side_effect = slow_then_fast
+    
+    result = client.get_sports()
+    
+    assert result['data'] == ["fast"]
+    assert client.hedge_stats['hedged'] == 1
+    assert client.hedge_stats['hedge_wins'] == 1
+
+
+@patch('requests.get')
+def test_hedged_loser_quota_is_counted(mock_get):
+    """Test that the quota spent by the losing hedged request is accounted for."""
+    client = OddsClient("test_api_key", hedge_percentile=50, hedge_min_samples=1)
+    client.remaining_requests = "1000"
+    client.latency['/sports'] = LatencyTracker()
+    client.latency['/sports'].record(0.01)
+    
+    def slow_then_fast(url, params, **kwargs):
+        if mock_get.call_count == 1:
+            time.sleep(0.3)
+            return make_response(200, ["slow"], {'x-requests-remaining': '990', 'x-requests-used': '10',
+                                                 'x-requests-last': '1'})
+        return make_response(200, ["fast"], {'x-requests-remaining': '991', 'x-requests-used': '9',
+                                             'x-requests-last': '1'})
+    mock_get.side_effect = slow_then_fast
+    
+    client.get_sports()
+    time.sleep(0.5)
+    
+    assert client.hedge_stats['loser_cost'] == 1
+    assert client.hedge_cost == {'/sports': 1}
+    assert client.used_requests == '10'
+    assert client.key_pool.keys[0].requests == 2
+    assert client.key_pool.keys[0].remaining == 990
+
+
+@patch('requests.get')
+def test_no_hedging_without_quota_headroom(mock_get):
+    """Test that requests are not hedged when remaining quota is low."""
+    client = OddsClient("test_api_key", hedge_percentile=50, hedge_min_samples=1, hedge_min_remaining=100)
+    client.remaining_requests = "50"
+    client.latency['/sports'] = LatencyTracker()
+    client.latency['/sports'].record(0.0)
+    mock_get.return_value = make_response(200, [], {'x-requests-remaining': '50'})
+    
+    client.get_sports()
+    
+    assert mock_get.call_count == 1
+    assert client.hedge_stats['hedged'] == 0
+
+
+@patch('requests.get')
+def test_key_pool_routes_to_most_headroom(mock_get):
+    """Test that requests go to the pooled key with the most remaining quota."""
+    client = OddsClient("key_aaaa,key_bbbb")
+    mock_get.side_effect = [
+        make_response(200, [], {'x-requests-remaining': '10', 'x-requests-used': '490'}),
+        make_response(200, [], {'x-requests-remaining': '300', 'x-requests-used': '200'}),
+        make_response(200, [], {'x-requests-remaining': '299', 'x-requests-used': '201'}),
+    ]
+    
+    for _ in range(3):
+        client.get_sports()
+    
+    used_keys = [call.kwargs['params']['apiKey'] for call in mock_get.call_args_list]
+    assert used_keys == ['key_aaaa', 'key_bbbb', 'key_bbbb']
+    usage = {entry['key']: entry for entry in client.key_pool.usage()}
+    assert usage['****aaaa']['remaining_requests'] == 10
+    assert usage['****bbbb']['requests'] == 2
+    # The quota left is the pool's, not that of the key that answered last
+    assert client.remaining_requests == '309'
+
+
+@patch('requests.get')
+def test_key_pool_skips_revoked_keys(mock_get):
+    """Test that a rejected key is marked and the request moves to the next key."""
+    client = OddsClient(["bad_key_1", "good_key_2"])
+    mock_get.side_effect = [
+        make_response(401),
+        make_response(200, [{"key": "sport1"}], {'x-requests-remaining': '100'}),
+    ]
+    
+    result = client.get_sports()
+    
+    assert result['data'] == [{"key": "sport1"}]
+    assert [call.kwargs['params']['apiKey'] for call in mock_get.call_args_list] == ['bad_key_1', 'good_key_2']
+    assert [entry['health'] for entry in client.key_pool.usage()] == ['revoked', 'healthy']
+    
+    mock_get.side_effect = [make_response(200, [], {'x-requests-remaining': '99'})]
+    client.get_sports()
+    assert mock_get.call_args.kwargs['params']['apiKey'] == 'good_key_2'
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_load_json_stream_matches_json():
+    """Test that streamed parsing gives the same result for any chunking."""
+    events = [
+        {"id": "e1", "home_team": "Atlético Madrid", "bookmakers": [
+            {"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+                {"name": "Atlético Madrid", "price": 1.91}, {"name": "Draw", "price": 3.4}]}]},
+        ]},
+        {"id": "e2", "home_team": "Atlético Madrid", "bookmakers": [
+            {"key": "draftkings", "markets": [{"key": "totals", "outcomes": [
+                {"name": "Over", "price": 1.91, "point": 2}]}]},
+        ]},
+    ]
+    body = json.dumps(events, ensure_ascii=False).encode("utf-8")
+    
+    for size in (1, 3, 64, len(body)):
+        assert load_json_stream(chunked(body, size)) == events
+    assert load_json_stream([b'  [ ', b' ]']) == []
+    assert load_json_stream([b'{"message": ', b'"not an array"}']) == {"message": "not an array"}
+    # Numbers split across chunks are not cut short
+    assert load_json_stream([b'[12', b'34, 5', b'.5]']) == [1234, 5.5]
+    assert load_json_stream([b'[2.', b'5]']) == [2.5]
+    assert load_json_stream([b'[{"p": 1}', b', 2.', b'5]']) == [{"p": 1}, 2.5]
+    assert load_json_stream([b'[1e', b'5]']) == [1e5]
+    numbers = b'[2.5, {"p": 1}, 1e5,-0.25 ,7]'
+    for size in range(1, len(numbers) + 1):
+        assert load_json_stream(chunked(numbers, size)) == json.loads(numbers)
+    
+    parsed = load_json_stream(chunked(body, 5))
+    # Repeated strings and prices are shared across events
+    assert parsed[0]["home_team"] is parsed[1]["home_team"]
+    first_prices = parsed[0]["bookmakers"][0]["markets"][0]["outcomes"]
+    assert first_prices[0]["price"] is parsed[1]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+    # Integers are not replaced by equal floats
+    assert type(parsed[1]["bookmakers"][0]["markets"][0]["outcomes"][0]["point"]) is int
+
+
+def test_load_json_stream_rejects_malformed_bodies():
+    """Test that truncated or malformed bodies raise ValueError."""
+    for body in (b'', b'[1,', b'[1 2]', b'[{"a": 1}', b'[{"a":', b'[{}] x', b'[1x]', b'[2.5]]', b'[1e'):
+        with pytest.raises(ValueError):
+            load_json_stream(chunked(body, 2))
+
+
+@patch('requests.get')
+def test_stream_json_parses_chunks(mock_get):
+    """Test that stream_json reads the body in chunks instead of calling json()."""
+    client = OddsClient("test_api_key", stream_json=True)
+    response = make_response(200, headers={'x-requests-remaining': '98'})
+    response.iter_content.return_value = iter(chunked(b'[{"id": "game1", "bookmakers": []}]', 4))
+    mock_get.return_value = response
+    
+    result = client.get_odds("basketball_nba", {"regions": "us"})
+    
+    assert result['data'] == [{"id": "game1", "bookmakers": []}]
+    assert mock_get.call_args.kwargs['stream'] is True
+    response.json.assert_not_called()
+    response.close.assert_called_once()
+
+
 def test_api_key_env():
     """Test that the API key can be loaded from environment variables."""
     # Load environment variables from .env file
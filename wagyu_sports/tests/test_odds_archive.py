@@ -0,0 +1,160 @@
+"""Tests for the columnar odds snapshot archive"""
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_archive import ArchiveReader, ArchiveWriter, import_capture
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+
+def moved(events, delta):
+    """Copy of ``events`` with every price moved by ``delta``."""
+    events = copy.deepcopy(events)
+    for event in events:
+        for bookmaker in event["bookmakers"]:
+            for market in bookmaker["markets"]:
+                for outcome in market["outcomes"]:
+                    outcome["price"] = round(outcome["price"] + delta, 2)
+    return events
+
+
+def test_snapshot_round_trip(tmp_path, nba_events, mocks_dir):
+    """A captured slate is rebuilt exactly from the columns"""
+    assert import_capture(ArchiveWriter(tmp_path), mocks_dir / "nba_games_live.json") > 0
+
+    with ArchiveReader(tmp_path) as reader:
+        snapshot = reader.snapshot_at("basketball_nba", float("inf"))
+        assert snapshot["data"] == nba_events()
+        assert reader.snapshot_at("basketball_nba", 0) is None
+        assert reader.snapshot_at("soccer_epl", float("inf")) is None
+
+
+def test_line_history(tmp_path, nba_events):
+    """Line movement is read across snapshots and time ranges"""
+    events = nba_events()
+    writer = ArchiveWriter(tmp_path)
+    for i in range(3):
+        writer.append("basketball_nba", moved(events, i / 100), fetched_at=1000.0 + 60 * i)
+
+    event = events[0]
+    team = event["home_team"]
+    with ArchiveReader(tmp_path) as reader:
+        history = reader.line_history(event["id"], "h2h", book="draftkings", outcome=team)
+        assert [h["fetched_at"] for h in history] == [1000.0, 1060.0, 1120.0]
+        assert [h["price"] for h in history] == [5.55, 5.56, 5.57]
+
+        recent = reader.line_history(event["id"], "spreads", book="draftkings", since=1030.0)
+        assert len(recent) == 4
+        assert all("point" in h for h in recent)
+        assert reader.line_history("unknown", "h2h") == []
+
+
+def test_reader_sees_committed_appends_only(tmp_path, nba_events):
+    """Readers refresh to see new snapshots; torn appends are dropped on reopen"""
+    writer = ArchiveWriter(tmp_path)
+    writer.append("basketball_nba", nba_events(), fetched_at=1000.0)
+    reader = ArchiveReader(tmp_path)
+    rows = len(reader)
+
+    writer.append("basketball_nba", nba_events(), fetched_at=1060.0)
+    assert len(reader) == rows
+    reader.refresh()
+    assert len(reader) == 2 * rows
+    reader.close()
+
+    # Simulate a crash after the columns were written but before the commit
+    with open(tmp_path / "rows.price", "ab") as f:
+        f.write(b"\x00" * 24)
+    ArchiveWriter(tmp_path).append("basketball_nba", nba_events(), fetched_at=1120.0)
+    with ArchiveReader(tmp_path) as reader:
+        assert len(reader) == 3 * rows
+        assert reader.snapshot_at("basketball_nba", 1120.0)["data"] == nba_events()
+
+
+def test_dictionaries_only_grow_by_new_entries(tmp_path, nba_events):
+    """Appends write only new dictionary entries, and older archives are converted"""
+    writer = ArchiveWriter(tmp_path)
+    writer.append("basketball_nba", nba_events(), fetched_at=1000.0)
+    size = (tmp_path / "dictionaries.ndjson").stat().st_size
+    reader = ArchiveReader(tmp_path)
+
+    writer.append("basketball_nba", moved(nba_events(), 0.01), fetched_at=1060.0)
+    assert (tmp_path / "dictionaries.ndjson").stat().st_size == size
+    renamed = [dict(event, id=event["id"] + "-2") for event in nba_events()[:1]]
+    writer.append("basketball_nba", renamed, fetched_at=1120.0)
+    assert (tmp_path / "dictionaries.ndjson").stat().st_size > size
+    reader.refresh()
+    assert reader.snapshot_at("basketball_nba", 1120.0)["data"] == renamed
+    reader.close()
+
+    # An archive with a single dictionaries.json file
+    with ArchiveReader(tmp_path) as reader:
+        legacy = {name: reader.dictionaries[name] for name in reader.dictionaries}
+    (tmp_path / "dictionaries.json").write_text(json.dumps(legacy))
+    (tmp_path / "dictionaries.ndjson").unlink()
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    del manifest["dictionary_bytes"]
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    with ArchiveReader(tmp_path) as reader:
+        assert reader.snapshot_at("basketball_nba", 1000.0)["data"] == nba_events()
+    ArchiveWriter(tmp_path).append("basketball_nba", nba_events(), fetched_at=1180.0)
+    with ArchiveReader(tmp_path) as reader:
+        assert reader.snapshot_at("basketball_nba", 1120.0)["data"] == renamed
+        assert reader.snapshot_at("basketball_nba", 1180.0)["data"] == nba_events()
+
+
+def test_snapshots_must_be_in_order(tmp_path, nba_events):
+    """Out-of-order snapshots are rejected"""
+    writer = ArchiveWriter(tmp_path)
+    writer.append("basketball_nba", nba_events(), fetched_at=1000.0)
+
+    with pytest.raises(ValueError):
+        writer.append("basketball_nba", nba_events(), fetched_at=999.0)
+
+
+@pytest.mark.anyio
+async def test_server_archives_fetched_odds(tmp_path, nba_events):
+    """Odds fetched from upstream are appended to the archive"""
+    server = OddsMcpServer(api_key="test_key", archive=str(tmp_path))
+    server.client.get_odds = MagicMock(return_value={"data": nba_events(), "headers": {}})
+
+    await server.planner.get_odds("basketball_nba", {"regions": "us", "markets": "h2h,spreads"})
+
+    with ArchiveReader(tmp_path) as reader:
+        assert [sport for sport, _, _ in reader.list_snapshots()] == ["basketball_nba"]
+        assert reader.snapshot_at("basketball_nba", float("inf"))["data"] == nba_events()
+
+
+def test_interleaved_ingests_are_archived_in_order(tmp_path, nba_events):
+    """A slow ingest started first does not lose its snapshot to a faster one"""
+    server = OddsMcpServer(offline=True, archive=str(tmp_path))
+    update = server.board.update
+    first_started = threading.Event()
+
+    def slow_first_update(sport, events, fetched_at, options=None):
+        if sport == "basketball_nba" and not first_started.is_set():
+            first_started.set()
+            time.sleep(0.2)
+        return update(sport, events, fetched_at, options)
+    server.board.update = slow_first_update
+
+    slow = threading.Thread(target=server.ingest_odds,
+                            args=("basketball_nba", {"regions": "us"}, {"data": nba_events()}))
+    slow.start()
+    first_started.wait(5)
+    server.ingest_odds("basketball_ncaab", {"regions": "us"}, {"data": nba_events()})
+    slow.join()
+
+    with ArchiveReader(tmp_path) as reader:
+        snapshots = list(reader.list_snapshots())
+    assert [sport for sport, _, _ in snapshots] == ["basketball_nba", "basketball_ncaab"]
+    assert snapshots[0][1] <= snapshots[1][1]
@@ -0,0 +1,111 @@
+"""Tests for the containment-aware odds cache"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_cache import OddsCache
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(markets, books):
+    """Build an /odds response with one event priced by ``books`` in ``markets``."""
+    return {
+        "data": [{
+            "id": "game1",
+            "bookmakers": [
+                {"key": book, "markets": [{"key": m, "outcomes": []} for m in markets]}
+                for book in books
+            ],
+        }],
+        "headers": {"x-requests-remaining": "400"},
+    }
+
+
+def broad_cache(clock):
+    cache = OddsCache(ttl=60, clock=clock)
+    cache.put(
+        "basketball_nba",
+        {"markets": "h2h,spreads,totals", "regions": "us,uk", "oddsFormat": "decimal"},
+        make_response(["h2h", "spreads", "totals"], ["draftkings", "fanduel", "paddypower"]),
+    )
+    return cache
+
+
+def test_narrower_request_is_projected():
+    """h2h/us is answered from the h2h,spreads,totals/us,uk entry"""
+    cache = broad_cache(FakeClock())
+
+    result = cache.get("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "decimal"})
+
+    assert result is not None
+    books = result["data"][0]["bookmakers"]
+    assert [b["key"] for b in books] == ["draftkings", "fanduel"]
+    assert all([m["key"] for m in b["markets"]] == ["h2h"] for b in books)
+    assert result["cache"]["hit"] is True
+    assert cache.stats()["projected_hits"] == 1
+
+
+def test_bookmaker_filter_is_projected():
+    """A bookmakers filter is covered when every book belongs to a cached region"""
+    cache = broad_cache(FakeClock())
+
+    result = cache.get("basketball_nba", {"markets": "spreads", "bookmakers": "paddypower", "oddsFormat": "decimal"})
+
+    assert [b["key"] for b in result["data"][0]["bookmakers"]] == ["paddypower"]
+
+
+def test_wider_or_different_requests_miss():
+    """Requests outside the cached coverage or options are not answered"""
+    cache = broad_cache(FakeClock())
+
+    assert cache.get("basketball_nba", {"markets": "h2h", "regions": "eu", "oddsFormat": "decimal"}) is None
+    assert cache.get("basketball_nba", {"markets": "player_points", "regions": "us", "oddsFormat": "decimal"}) is None
+    assert cache.get("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "american"}) is None
+    assert cache.get("soccer_epl", {"markets": "h2h", "regions": "us", "oddsFormat": "decimal"}) is None
+
+
+def test_freshness():
+    """Entries expire after the TTL and the freshest covering entry wins"""
+    clock = FakeClock()
+    cache = broad_cache(clock)
+
+    clock.now += 30
+    cache.put("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "decimal"},
+              make_response(["h2h"], ["betmgm"]))
+
+    result = cache.get("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "decimal"})
+    assert [b["key"] for b in result["data"][0]["bookmakers"]] == ["betmgm"]
+    assert result["cache"]["age_seconds"] == 0
+
+    clock.now += 45
+    # The broad entry is now 75s old, the narrow one 45s
+    assert cache.get("basketball_nba", {"markets": "spreads", "regions": "us", "oddsFormat": "decimal"}) is None
+    stale = cache.get("basketball_nba", {"markets": "spreads", "regions": "us", "oddsFormat": "decimal"},
+                      max_age=float("inf"))
+    assert stale["cache"]["stale"] is True
+
+
+def test_broader_store_supersedes_older_entries():
+    """Storing a covering entry drops older entries it contains"""
+    clock = FakeClock()
+    cache = OddsCache(ttl=60, clock=clock)
+    cache.put("basketball_nba", {"markets": "h2h", "regions": "us"}, make_response(["h2h"], ["draftkings"]))
+    clock.now += 1
+    cache.put("basketball_nba", {"markets": "h2h,spreads", "regions": "us"},
+              make_response(["h2h", "spreads"], ["draftkings"]))
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["superseded"] == 1
@@ -0,0 +1,73 @@
+"""Tests for local odds format conversion"""
+
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_format import (
+    american_to_decimal,
+    convert_events,
+    convert_price,
+    decimal_to_american,
+    decimal_to_fractional,
+)
+
+
+def fixture_prices(events):
+    """Every distinct price in the captured NBA slate."""
+    return sorted({
+        outcome["price"]
+        for event in events
+        for bookmaker in event["bookmakers"]
+        for market in bookmaker["markets"]
+        for outcome in market["outcomes"]
+    })
+
+
+def test_american_round_trip_matches_fixtures(nba_events):
+    """Every captured decimal price survives decimal -> american -> decimal"""
+    prices = fixture_prices(nba_events())
+    assert prices
+    for price in prices:
+        assert american_to_decimal(decimal_to_american(price)) == price
+
+
+@pytest.mark.parametrize("price,american", [(2.0, 100), (2.5, 150), (1.5, -200), (1.91, -110), (1.16, -625), (5.55, 455)])
+def test_decimal_to_american(price, american):
+    """Known conversions follow the upstream rounding rule"""
+    assert decimal_to_american(price) == american
+
+
+def test_other_formats():
+    """Fractional, implied and Hong Kong conversions"""
+    assert decimal_to_fractional(2.5) == "3/2"
+    assert decimal_to_fractional(1.91) == "91/100"
+    assert convert_price(1.25, "implied") == 0.8
+    assert convert_price(1.91, "hongkong") == 0.91
+    assert convert_price(1.91, "decimal") == 1.91
+    with pytest.raises(ValueError):
+        convert_price(1.91, "moneyline")
+
+
+@pytest.mark.parametrize("odds_format", ["american", "fractional", "implied", "hongkong"])
+@pytest.mark.parametrize("price", [0, 1.0, -2.5, "abc", "nan"])
+def test_invalid_prices_raise_value_error(odds_format, price):
+    """Prices that are not above 1.0 are rejected the same way in every format"""
+    with pytest.raises(ValueError):
+        convert_price(price, odds_format)
+
+
+def test_convert_events_leaves_input_untouched():
+    """Bulk conversion returns a new tree"""
+    events = [{"id": "g", "bookmakers": [{"key": "b", "markets": [
+        {"key": "spreads", "outcomes": [{"name": "A", "price": 1.91, "point": -3.5}]}
+    ]}]}]
+
+    converted = convert_events(events, "american")
+
+    outcome = converted[0]["bookmakers"][0]["markets"][0]["outcomes"][0]
+    assert outcome == {"name": "A", "price": -110, "point": -3.5}
+    assert events[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"] == 1.91
@@ -2,6 +2,8 @@
 
 import os
 import sys
+import asyncio
+import socket
 import pytest
 import json
 
@@ -107,6 +109,77 @@ async def test_get_odds_with_options():
         assert first_game["sport_key"] == "soccer_epl"
 
 
+@pytest.mark.anyio
+async def test_get_odds_converts_format():
+    """Test that get_odds converts decimal prices locally"""
+    server = OddsMcpServer(test_mode=True)
+    
+    async with client_session(server.server) as client:
+        decimal = await client.call_tool("get_odds", {"sport": "basketball_nba"})
+        american = await client.call_tool("get_odds", {"sport": "basketball_nba", "odds_format": "american"})
+        
+        decimal_data = json.loads(decimal.content[0].text)["data"]
+        american_data = json.loads(american.content[0].text)["data"]
+        
+        decimal_price = decimal_data[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+        american_price = american_data[0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+        assert isinstance(decimal_price, float)
+        assert isinstance(american_price, int)
+        assert (american_price > 0) == (decimal_price >= 2.0)
+
+
+@pytest.mark.anyio
+async def test_get_odds_deadline_returns_cached_answer():
+    """Test that an expired deadline returns the best cached answer instead of hanging"""
+    server = OddsMcpServer(api_key="test_api_key")
+    options = {"oddsFormat": "decimal", "regions": "us", "markets": "h2h"}
+    server.cache.put("basketball_nba", options, {"data": [{"id": "cached"}], "headers": {}},
+                     fetched_at=server.cache.clock() - 3600)
+    
+    async def slow_get_odds(sport, options):
+        await asyncio.sleep(5)
+    server.planner.get_odds = slow_get_odds
+    
+    async with client_session(server.server) as client:
+        result = await client.call_tool(
+            "get_odds",
+            {"sport": "basketball_nba", "regions": "us", "markets": "h2h", "deadline_ms": 50}
+        )
+        response_data = json.loads(result.content[0].text)
+        
+        assert response_data["data"] == [{"id": "cached"}]
+        assert "Deadline" in response_data["stale"]["reason"]
+        assert response_data["stale"]["age_seconds"] >= 3600
+
+
+@pytest.mark.anyio
+async def test_client_stale_fallback_is_not_cached():
+    """A stale answer from the client is passed on but never cached as fresh"""
+    server = OddsMcpServer(api_key="test_api_key", planner_window=0.0)
+    stale = {"data": [{"id": "old"}], "headers": {}, "stale": {"reason": "down", "age_seconds": 900.0}}
+    calls = []
+    
+    def get_odds(sport, options):
+        calls.append(sport)
+        return stale
+    server.client.get_odds = get_odds
+    
+    async with client_session(server.server) as client:
+        for _ in range(2):
+            result = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us"})
+            assert json.loads(result.content[0].text)["stale"]["reason"] == "down"
+    
+    # Both calls went upstream: the first stale answer was not served from cache
+    assert len(calls) == 2
+    assert server.cache.stats()["stores"] == 0
+
+
+def test_streamed_parsing_is_opt_in():
+    """The client parses whole bodies unless streamed parsing is asked for"""
+    assert OddsMcpServer(api_key="test_api_key").client.stream_json is False
+    assert OddsMcpServer(api_key="test_api_key", stream_json=True).client.stream_json is True
+
+
 @pytest.mark.anyio
 async def test_get_quota_info():
     """Test the get_quota_info tool"""
@@ -126,5 +199,40 @@ async def test_get_quota_info():
         assert "used_requests" in response_data
 
 
+@pytest.mark.anyio
+async def test_streamable_http_transport_shares_server():
+    """Test that several sessions can share one server over streamable HTTP"""
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamable_http_client
+    
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    
+    server = OddsMcpServer(test_mode=True)
+    serve_task = asyncio.create_task(server.run(transport="streamable-http", port=port, shutdown_timeout=1))
+    try:
+        while server.http_server is None or not server.http_server.started:
+            await asyncio.sleep(0.05)
+        
+        for _ in range(2):
+            async with streamable_http_client(f"http://127.0.0.1:{port}/mcp") as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    result = await session.call_tool("get_sports", {})
+                    assert "basketball_nba" in result.content[0].text
+    finally:
+        server.shutdown()
+        await asyncio.wait_for(serve_task, timeout=5)
+
+
+@pytest.mark.anyio
+async def test_unknown_transport():
+    """Test that an unknown transport is rejected"""
+    server = OddsMcpServer(test_mode=True)
+    with pytest.raises(ValueError):
+        await server.run(transport="carrier-pigeon")
+
+
 if __name__ == "__main__":
     pytest.main(["-xvs", __file__])
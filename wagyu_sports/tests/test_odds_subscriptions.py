@@ -0,0 +1,147 @@
+"""Tests for odds resources and threshold-based subscriptions"""
+
+import asyncio
+import copy
+import json
+import os
+import sys
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+from mcp.types import ResourceUpdatedNotification, ServerNotification
+from pydantic import AnyUrl
+
+from wagyu_sports.mcp_server.odds_board import OddsBoard
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.odds_subscriptions import SubscriptionRegistry, parse_odds_uri
+
+H2H_SPREADS_US = {"regions": "us", "markets": "h2h,spreads", "oddsFormat": "decimal"}
+
+
+def moved(events, price=0.0, point=0.0):
+    """Copy of ``events`` with the first book's first outcome of each market moved."""
+    events = copy.deepcopy(events)
+    for event in events:
+        for market in event["bookmakers"][0]["markets"]:
+            outcome = market["outcomes"][0]
+            outcome["price"] = round(outcome["price"] + price, 2)
+            if "point" in outcome:
+                outcome["point"] += point
+    return events
+
+
+def test_parse_odds_uri():
+    """URIs name a sport, an optional event and thresholds"""
+    assert parse_odds_uri("odds://basketball_nba/abc?price=0.05&point=0.5") == ("basketball_nba", "abc", 0.05, 0.5)
+    assert parse_odds_uri("odds://basketball_nba") == ("basketball_nba", None, 0.0, 0.0)
+    with pytest.raises(ValueError):
+        parse_odds_uri("https://example.com/odds")
+
+
+def test_only_crossed_thresholds_fire(nba_events):
+    """Moves smaller than the threshold accumulate until they cross it"""
+    events = nba_events()
+    event_id = events[0]["id"]
+    registry = SubscriptionRegistry()
+    precise = registry.subscribe("s1", f"odds://basketball_nba/{event_id}?price=0.05", events)
+    anything = registry.subscribe("s2", "odds://basketball_nba", events)
+    points = registry.subscribe("s3", f"odds://basketball_nba/{event_id}?price=100&point=1", events)
+
+    assert registry.changes("basketball_nba", events) == []
+    assert registry.changes("basketball_nba", moved(events, price=0.03)) == [anything]
+    assert registry.changes("basketball_nba", moved(events, price=0.06)) == [anything, precise]
+    # precise has no point threshold, so any point move fires it
+    assert registry.changes("basketball_nba", moved(events, price=0.06, point=1.0)) == [anything, precise, points]
+    assert registry.changes("soccer_epl", events) == []
+
+    registry.unsubscribe("s2", "odds://basketball_nba")
+    registry.drop_session("s3")
+    assert len(registry) == 1
+
+
+@pytest.mark.anyio
+async def test_subscribers_are_notified_on_threshold(nba_events):
+    """One ingested refresh notifies the sessions whose thresholds it crosses"""
+    server = OddsMcpServer(offline=True)
+    events = nba_events()
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": events})
+    uri = f"odds://basketball_nba/{events[0]['id']}?price=0.05"
+    updates = []
+
+    async def on_message(message):
+        if isinstance(message, ServerNotification) and isinstance(message.root, ResourceUpdatedNotification):
+            updates.append(str(message.root.params.uri))
+
+    async with client_session(server.server, message_handler=on_message) as client:
+        await client.subscribe_resource(AnyUrl(uri))
+
+        server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": moved(events, price=0.02)})
+        await asyncio.sleep(0.05)
+        assert updates == []
+
+        # Delivered from a worker thread, as live fetches are
+        await asyncio.to_thread(server.ingest_odds, "basketball_nba", H2H_SPREADS_US,
+                                {"data": moved(events, price=0.1)})
+        await asyncio.sleep(0.05)
+        assert updates == [uri]
+
+        result = await client.read_resource(AnyUrl(uri))
+        latest = json.loads(result.contents[0].text)
+        first_price = lambda event: event["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+        assert first_price(latest) == round(first_price(events[0]) + 0.1, 2)
+
+
+@pytest.mark.anyio
+async def test_board_merges_snapshots(nba_events):
+    """A narrower snapshot only replaces the markets it contains"""
+    server = OddsMcpServer(offline=True)
+    events = nba_events()
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": events})
+    h2h_only = copy.deepcopy(events)
+    for bookmaker in h2h_only[0]["bookmakers"]:
+        bookmaker["markets"] = [m for m in bookmaker["markets"] if m["key"] == "h2h"]
+    server.ingest_odds("basketball_nba", {"regions": "us", "markets": "h2h"}, {"data": h2h_only})
+
+    async with client_session(server.server) as client:
+        capabilities = (await client.initialize()).capabilities
+        result = await client.read_resource(AnyUrl(f"odds://basketball_nba/{events[0]['id']}"))
+
+    assert capabilities.resources.subscribe is True
+    event = json.loads(result.contents[0].text)
+    assert [m["key"] for m in event["bookmakers"][0]["markets"]] == ["h2h", "spreads"]
+
+
+def test_board_evicts_what_refreshes_drop(nba_events):
+    """Markets a covering refresh no longer carries and events that stop being listed are evicted"""
+    board = OddsBoard(max_missed=2)
+    events = nba_events()
+    first, second = events[0]["id"], events[1]["id"]
+    before = 1741040000.0  # 2025-03-03T22:13Z, before every game starts
+    board.update("basketball_nba", events, before, H2H_SPREADS_US)
+    board.update("soccer_epl", [dict(events[3], id="epl")], before, H2H_SPREADS_US)
+
+    # draftkings stopped offering the spread, fanduel pulled the game
+    refresh = copy.deepcopy(events)
+    refresh[0]["bookmakers"] = [b for b in refresh[0]["bookmakers"] if b["key"] != "fanduel"]
+    refresh[0]["bookmakers"][0]["markets"] = refresh[0]["bookmakers"][0]["markets"][:1]
+    board.update("basketball_nba", refresh, before, H2H_SPREADS_US)
+    books = {b["key"]: [m["key"] for m in b["markets"]] for b in board.event("basketball_nba", first)["bookmakers"]}
+    assert books["draftkings"] == ["h2h"] and "fanduel" not in books and books["betrivers"] == ["h2h", "spreads"]
+
+    # A uk refresh says nothing about us books
+    board.update("basketball_nba", [dict(e, bookmakers=[]) for e in events], before, {"regions": "uk"})
+    assert len(board.event("basketball_nba", first)["bookmakers"]) == len(refresh[0]["bookmakers"])
+
+    # An unlisted event is dropped after max_missed refreshes, or at once when it is over.
+    # Other sports are swept once both their start and their last refresh are old.
+    assert board.update("basketball_nba", events[1:], before, H2H_SPREADS_US) == {}
+    assert board.update("basketball_nba", events[1:], before, H2H_SPREADS_US) == {"basketball_nba": [first]}
+    assert board.update("basketball_nba", events[2:], before + 7 * 3600, H2H_SPREADS_US) == {
+        "basketball_nba": [second], "soccer_epl": ["epl"]}
+    assert board.event("basketball_nba", first) is None and len(board.events("basketball_nba")) == 2
+    assert board.events("soccer_epl") == []
@@ -0,0 +1,112 @@
+"""Tests for futures (outright) odds support"""
+
+import json
+import os
+import sys
+from unittest.mock import patch, MagicMock
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.odds_client import OddsClient
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.outrights import compare_event, is_outright_sport
+
+SPORT = "americanfootball_nfl_super_bowl_winner"
+
+
+def book(key, prices):
+    return {"key": key, "title": key, "markets": [
+        {"key": "outrights", "outcomes": [{"name": name, "price": price} for name, price in prices.items()]}
+    ]}
+
+
+EVENT = {
+    "id": "super-bowl", "sport_key": SPORT, "sport_title": "NFL Super Bowl Winner",
+    "commence_time": "2026-02-08T23:30:00Z", "home_team": None, "away_team": None,
+    "bookmakers": [
+        book("draftkings", {"Kansas City Chiefs": 6.0, "Baltimore Ravens": 7.0, "Detroit Lions": 8.0}),
+        # Listed in a different order, and without one contender
+        book("fanduel", {"Detroit Lions": 9.0, "Kansas City Chiefs": 5.5}),
+        book("betmgm", {"Baltimore Ravens": 6.5, "Kansas City Chiefs": 6.0, "Detroit Lions": 7.5}),
+    ],
+}
+
+
+def test_contenders_ranked_with_best_price_and_spread():
+    """Contenders are matched by name across books and ranked by consensus"""
+    ranked = [contender.describe() for contender in compare_event(EVENT)]
+
+    assert [c["name"] for c in ranked] == ["Kansas City Chiefs", "Baltimore Ravens", "Detroit Lions"]
+    chiefs, ravens, lions = ranked
+    assert chiefs["best_price"] == 6.0 and chiefs["best_books"] == ["draftkings", "betmgm"]
+    assert chiefs["worst_price"] == 5.5 and chiefs["worst_book"] == "fanduel"
+    assert ravens["books"] == 2
+    assert lions["best_books"] == ["fanduel"]
+    assert lions["spread_pct"] == 20.0
+
+
+def test_outright_sport_keys():
+    """Outright keys are recognised by name or by the has_outrights flag"""
+    assert is_outright_sport(SPORT)
+    assert not is_outright_sport("basketball_nba")
+    assert is_outright_sport("politics_us_presidential_election", {"politics_us_presidential_election"})
+
+
+@patch('requests.get')
+def test_client_requests_outrights_market(mock_get):
+    """The client asks for the outrights market unless told otherwise"""
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = [EVENT]
+    mock_get.return_value = response
+    client = OddsClient("test_api_key")
+
+    client.get_odds(SPORT, {"regions": "us"})
+    client.get_odds("basketball_nba", {"regions": "us"})
+
+    assert mock_get.call_args_list[0].kwargs["params"]["markets"] == "outrights"
+    assert "markets" not in mock_get.call_args_list[1].kwargs["params"]
+
+
+@pytest.mark.anyio
+async def test_compare_outrights_tool():
+    """compare_outrights ranks ingested futures and converts prices"""
+    server = OddsMcpServer(offline=True)
+    server.ingest_odds(SPORT, {"regions": "us", "markets": "outrights", "oddsFormat": "decimal"},
+                       {"data": [EVENT]})
+
+    async with client_session(server.server) as client:
+        result = await client.call_tool("compare_outrights", {"sport": SPORT, "odds_format": "american",
+                                                               "limit": 2})
+        # get_odds without markets finds the same snapshot
+        odds = await client.call_tool("get_odds", {"sport": SPORT, "regions": "us"})
+
+    compared = json.loads(result.content[0].text)["events"]
+    assert compared[0]["books"] == 3 and compared[0]["contenders"] == 3
+    assert [(c["rank"], c["name"], c["best_price"]) for c in compared[0]["ranked"]] == [
+        (1, "Kansas City Chiefs", 500), (2, "Baltimore Ravens", 600)]
+    assert json.loads(odds.content[0].text)["data"][0]["id"] == "super-bowl"
+    assert server.game_lines.get(SPORT) == []
+
+
+@patch('requests.get')
+def test_server_shares_outright_sports_with_client(mock_get):
+    """Sports the client learns from /sports also steer the server's market defaults"""
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = [{"key": "politics_us_presidential_election", "has_outrights": True}]
+    mock_get.return_value = response
+    server = OddsMcpServer(api_key="test_api_key")
+
+    server.client.get_sports()
+
+    assert server.client.outright_sports is server.outright_sports
+    assert server._odds_options("politics_us_presidential_election", "us", None, None)["markets"] == "outrights"
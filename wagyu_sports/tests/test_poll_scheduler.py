@@ -0,0 +1,139 @@
+"""Tests for the adaptive odds polling scheduler"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.poll_scheduler import PollScheduler
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+NOW = 1_741_000_000.0
+H2H_US = {"regions": "us", "markets": "h2h", "oddsFormat": "decimal"}
+
+
+class FakeClock:
+    """Manually advanced time source."""
+
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def event(event_id, starts_in, home_price=1.9):
+    commence = datetime.fromtimestamp(NOW + starts_in, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"id": event_id, "commence_time": commence, "bookmakers": [
+        {"key": "draftkings", "markets": [{"key": "h2h", "outcomes": [
+            {"name": "Home", "price": home_price}, {"name": "Away", "price": 1.9},
+        ]}]},
+    ]}
+
+
+def test_interval_follows_time_to_commence():
+    """In-play games poll fastest, distant slates slowest"""
+    clock = FakeClock()
+    scheduler = PollScheduler({"live": H2H_US, "soon": H2H_US, "later": H2H_US, "idle": H2H_US},
+                              budget_per_hour=1000, clock=clock)
+    scheduler.observe("live", [event("a", -1800), event("b", 86400)])
+    scheduler.observe("soon", [event("c", 1800)])
+    scheduler.observe("later", [event("d", 2 * 86400)])
+    scheduler.observe("idle", [event("e", -10 * 3600)])
+
+    plan = scheduler.plan()
+
+    intervals = {sport: entry["interval"] for sport, entry in plan["sports"].items()}
+    assert intervals == {"live": 30.0, "soon": 60.0, "later": 3600.0, "idle": 6 * 3600.0}
+    assert plan["sports"]["live"]["reason"] == "in play"
+    assert plan["sports"]["live"]["next_due"] == NOW + 30
+    assert plan["burn_per_hour"] == 120 + 60 + 1 + round(1 / 6, 2)
+    assert plan["throttled"] is False
+
+
+def test_volatility_shortens_interval():
+    """Moving prices poll faster than a quiet market with the same schedule"""
+    scheduler = PollScheduler({"quiet": H2H_US, "busy": H2H_US}, budget_per_hour=1000, clock=FakeClock())
+    for price in (1.9, 1.9, 1.9):
+        scheduler.observe("quiet", [event("a", 5 * 3600, price)])
+    for price in (1.9, 2.2, 1.8):
+        scheduler.observe("busy", [event("b", 5 * 3600, price)])
+
+    entries = scheduler.plan()["sports"]
+
+    assert entries["quiet"]["interval"] == 300.0
+    assert entries["busy"]["interval"] < 150.0
+    assert entries["busy"]["volatility"] > 0.01
+
+
+def test_plan_fits_budget():
+    """When the plan would overspend, every interval is stretched to fit"""
+    expensive = {"regions": "us,uk", "markets": "h2h,spreads,totals", "oddsFormat": "decimal"}
+    scheduler = PollScheduler({"a": expensive, "b": H2H_US}, budget_per_hour=100, clock=FakeClock())
+    scheduler.observe("a", [event("x", -600)])
+    scheduler.observe("b", [event("y", 600)])
+
+    plan = scheduler.plan()
+
+    assert plan["throttled"] is True
+    assert plan["burn_per_hour"] <= 100
+    assert plan["sports"]["a"]["cost"] == 6
+    # Relative priorities are kept
+    assert plan["sports"]["a"]["interval"] < plan["sports"]["b"]["interval"]
+
+
+@pytest.mark.anyio
+async def test_run_polls_due_sports_once():
+    """Unseen sports are due immediately; after polling they wait their interval"""
+    clock = FakeClock()
+    scheduler = PollScheduler({"a": H2H_US, "b": H2H_US}, budget_per_hour=1000, clock=clock)
+    polled = []
+
+    async def poll(sport, options):
+        polled.append((sport, options["markets"]))
+        scheduler.observe(sport, [event("x", 1800)])
+
+    task = asyncio.create_task(scheduler.run(poll))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert sorted(polled) == [("a", "h2h"), ("b", "h2h")]
+    assert scheduler.due() == []
+    clock.now += 60
+    assert sorted(scheduler.due()) == ["a", "b"]
+
+
+@pytest.mark.anyio
+async def test_failed_polls_are_counted(capsys):
+    """Background poll failures show up in the plan and on stderr"""
+    scheduler = PollScheduler({"a": H2H_US, "b": H2H_US}, budget_per_hour=1000, clock=FakeClock())
+
+    async def poll(sport, options):
+        if sport == "a":
+            raise ConnectionError("upstream down")
+
+    task = asyncio.create_task(scheduler.run(poll))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    plan = scheduler.plan()
+    assert (plan["polls"], plan["failures"]) == (2, 1)
+    assert plan["sports"]["a"]["failures"] == 1 and plan["sports"]["a"]["last_error"] == "upstream down"
+    assert plan["sports"]["b"]["failures"] == 0 and plan["sports"]["b"]["last_error"] is None
+    assert "Background poll of a odds failed: upstream down" in capsys.readouterr().err
+
+
+def test_server_feeds_schedule():
+    """Odds ingested by the server feed the schedule"""
+    server = OddsMcpServer(api_key="test_key", poll={"basketball_nba": H2H_US}, poll_budget=30, clock=FakeClock())
+    server.ingest_odds("basketball_nba", H2H_US, {"data": [event("a", -600)], "headers": {}})
+
+    plan = server.scheduler.plan()
+
+    assert plan["sports"]["basketball_nba"]["reason"] == "in play"
+    assert plan["budget_per_hour"] == 30
+    assert plan["burn_per_hour"] <= 30
@@ -0,0 +1,115 @@
+"""Tests for speculative prefetching of likely next requests"""
+
+import asyncio
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.prefetch import Prefetcher
+
+H2H_US = {"oddsFormat": "decimal", "regions": "us", "markets": "h2h"}
+LINES_US = {"oddsFormat": "decimal", "regions": "us", "markets": "h2h,spreads,totals"}
+
+
+def test_predicts_same_sport_follow_up():
+    """A follow-up seen on other sports is predicted for the current one"""
+    prefetcher = Prefetcher(min_count=3)
+    for sport in ("basketball_nba", "basketball_ncaab", "icehockey_nhl"):
+        prefetcher.observe("s", "get_odds", (sport, H2H_US))
+        prefetcher.observe("s", "get_game_lines", (sport, LINES_US))
+
+    assert prefetcher.observe("s", "get_odds", ("baseball_mlb", H2H_US)) == [("baseball_mlb", LINES_US)]
+    # Another session has no previous call, but the same state predicts the same way
+    assert prefetcher.observe("t", "get_odds", ("basketball_nba", H2H_US)) == [("basketball_nba", LINES_US)]
+
+
+def test_budget_is_a_slice_of_headroom():
+    """Prefetches stop once they would use more than the slice of headroom"""
+    prefetcher = Prefetcher(quota_slice=0.1)
+
+    assert not prefetcher.allow(3, 20)
+    assert prefetcher.allow(1, 20)
+    assert prefetcher.allow(1, 19)
+    assert not prefetcher.allow(1, 18)
+    assert not prefetcher.allow(1, None)
+    assert not prefetcher.allow(1, 1000, cached=True)
+    assert prefetcher.spent == 2
+    assert prefetcher.stats["skipped_budget"] == 3 and prefetcher.stats["skipped_cached"] == 1
+
+
+def test_hit_rate():
+    """A prefetch used before it expires is a hit; one left unused expires"""
+    now = [1000.0]
+    prefetcher = Prefetcher(ttl=60.0, clock=lambda: now[0])
+    prefetcher.prefetched("basketball_nba", LINES_US)
+    prefetcher.prefetched("icehockey_nhl", LINES_US)
+
+    assert prefetcher.served("basketball_nba", {"regions": "us", "markets": "spreads"})
+    now[0] += 61
+    assert not prefetcher.served("icehockey_nhl", LINES_US)
+    assert prefetcher.metrics()["hit_rate"] == 0.5
+
+
+@pytest.mark.anyio
+async def test_server_prefetches_game_lines_after_odds(nba_events):
+    """Once sessions keep following get_odds with get_game_lines, the lines are fetched ahead"""
+    server = OddsMcpServer(api_key="test_key", planner_window=0.0, prefetch=0.05)
+    server.client.get_odds = MagicMock(side_effect=lambda sport, options: {"data": nba_events(), "headers": {}})
+    server.client.key_pool.total_remaining = lambda: 1000
+
+    async def settle():
+        while server._prefetches:
+            await asyncio.sleep(0.01)
+
+    async with client_session(server.server) as client:
+        for sport in ("basketball_nba", "basketball_ncaab", "icehockey_nhl", "baseball_mlb"):
+            await client.call_tool("get_odds", {"sport": sport, "regions": "us", "markets": "h2h"})
+            await settle()
+            calls = server.client.get_odds.call_count
+            await client.call_tool("get_game_lines", {"sport": sport})
+            await settle()
+        quota = json.loads((await client.call_tool("get_quota_info", {})).content[0].text)
+
+    # The last get_game_lines was answered by the prefetch
+    assert server.client.get_odds.call_count == calls
+    assert server.client.get_odds.call_args_list[-1].args == ("baseball_mlb",)
+    assert quota["prefetch"]["prefetched"] == 1 and quota["prefetch"]["hits"] == 1
+    assert quota["prefetch"]["quota_spent"] == 3
+
+
+@pytest.mark.anyio
+async def test_prefetches_yield_to_admitted_calls(nba_events):
+    """Shed calls teach nothing, and prefetches only run in a slot no call is waiting for"""
+    server = OddsMcpServer(api_key="test_key", planner_window=0.0, prefetch=0.05,
+                           max_concurrent=1, max_queue=0)
+    server.client.get_odds = MagicMock(side_effect=lambda sport, options: {"data": nba_events(), "headers": {}})
+    server.client.key_pool.total_remaining = lambda: 1000
+    gate = server.admission.gate("get_odds")
+
+    await gate.acquire("someone")
+    async with client_session(server.server) as client:
+        shed = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us"})
+    assert json.loads(shed.content[0].text)["busy"] is True
+    assert server.prefetcher.stats["observed"] == 0
+
+    # The slot is busy, so the prefetch is skipped without spending quota
+    await server._prefetch("basketball_nba", H2H_US, gate)
+    gate.release()
+    assert server.prefetcher.stats["skipped_busy"] == 1 and server.prefetcher.spent == 0
+
+    # A failed prefetch is counted and gives its slot back
+    server.client.get_odds.side_effect = RuntimeError("upstream down")
+    await server._prefetch("basketball_nba", H2H_US, gate)
+    metrics = server.prefetcher.metrics()
+    assert metrics["failed"] == 1 and metrics["last_error"] == "upstream down"
+    assert gate.active == 0 and gate.stats["background"] == 1
@@ -0,0 +1,89 @@
+"""Tests for sampled tool call profiling"""
+
+import json
+import os
+import pstats
+import sys
+from unittest.mock import patch, MagicMock
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.odds_client import OddsClient
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.profiling import Profiler
+
+H2H_SPREADS_US = {"regions": "us", "markets": "h2h,spreads", "oddsFormat": "decimal"}
+
+
+def test_profiling_is_off_by_default(monkeypatch):
+    """Without a directory no profiler exists and phases are a shared no-op"""
+    monkeypatch.delenv("WAGYU_PROFILE_DIR", raising=False)
+    server = OddsMcpServer(test_mode=True)
+
+    assert server.profiler is None
+    assert server._phase("parse") is server._phase("serialize")
+
+
+@pytest.mark.anyio
+async def test_profiled_call_writes_artifacts(tmp_path, monkeypatch, nba_response):
+    """A profiled get_odds call writes a phase breakdown, allocations and a CPU profile"""
+    monkeypatch.setenv("WAGYU_PROFILE_DIR", str(tmp_path))
+    server = OddsMcpServer(offline=True)
+    server.ingest_odds("basketball_nba", H2H_SPREADS_US, nba_response())
+
+    async with client_session(server.server) as client:
+        await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us",
+                                            "markets": "h2h", "odds_format": "american"})
+
+    summaries = sorted(tmp_path.glob("*.json"))
+    assert [path.name.endswith("-get_odds.json") for path in summaries] == [True]
+    summary = json.loads(summaries[0].read_text())
+    assert summary["arguments"]["odds_format"] == "american"
+    assert set(summary["phases"]) == {"cache", "transform", "serialize"}
+    assert summary["wall_ms"] >= sum(phase["ms"] for phase in summary["phases"].values())
+    assert summary["result_bytes"] > 0
+    assert summary["memory"]["peak_kb"] > 0 and summary["memory"]["top"]
+    stats = pstats.Stats(str(tmp_path / summary["cpu_profile"]))
+    assert any(name == "convert_events" for _, _, name in stats.stats)
+
+
+@pytest.mark.anyio
+async def test_calls_are_sampled(tmp_path):
+    """Only the sampled fraction of calls is profiled"""
+    draws = iter([0.1, 0.9, 0.3, 0.7])
+    profiler = Profiler(tmp_path, sample_rate=0.5, cpu=False, memory=False, rng=lambda: next(draws))
+
+    async def get_thing(n):
+        with profiler.phase("work"):
+            return str(n)
+
+    wrapped = profiler.wrap(get_thing)
+    assert [await wrapped(n=n) for n in range(4)] == ["0", "1", "2", "3"]
+
+    assert profiler.stats == {"calls": 4, "profiled": 2}
+    profiled = [json.loads(path.read_text()) for path in sorted(tmp_path.glob("*.json"))]
+    assert [summary["arguments"] for summary in profiled] == [{"n": 0}, {"n": 2}]
+    assert profiled[0]["phases"]["work"]["count"] == 1
+    assert profiled[0]["cpu_profile"] is None and profiled[0]["memory"] is None
+
+
+@patch('requests.get')
+def test_client_reports_network_and_parse(mock_get):
+    """The client reports its network and parse time to on_phase"""
+    phases = []
+    client = OddsClient("test_api_key", on_phase=lambda name, seconds: phases.append(name))
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = []
+    mock_get.return_value = response
+
+    client.get_odds("basketball_nba", {"regions": "us"})
+
+    assert phases == ["network", "parse"]
@@ -0,0 +1,165 @@
+"""Tests for the get_odds query planner"""
+
+import asyncio
+import os
+import sys
+import time
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_projection import estimate_cost, project_events, split_csv
+from wagyu_sports.mcp_server import query_planner
+from wagyu_sports.mcp_server.query_planner import QueryPlanner
+
+
+BOOKS = {"us": "draftkings", "uk": "paddypower"}
+
+
+def fake_fetch(calls):
+    """Build a blocking fetch function that records calls and echoes requested markets/regions."""
+    def fetch(sport, options):
+        calls.append(dict(options))
+        markets = split_csv(options["markets"])
+        regions = split_csv(options["regions"])
+        bookmakers = [
+            {
+                "key": BOOKS[region],
+                "markets": [{"key": m, "outcomes": [{"name": "Team A", "price": 1.9}]} for m in sorted(markets)],
+            }
+            for region in sorted(regions)
+        ]
+        return {
+            "data": [{"id": "game1", "sport_key": sport, "bookmakers": bookmakers}],
+            "headers": {"x-requests-last": str(estimate_cost(markets, regions))},
+        }
+    return fetch
+
+
+def test_project_events():
+    """Projection keeps only the requested markets and region bookmakers"""
+    events = fake_fetch([])("basketball_nba", {"markets": "h2h,spreads", "regions": "uk,us"})["data"]
+    projected = project_events(events, {"h2h"}, {"us"}, source_regions={"us", "uk"})
+
+    bookmakers = projected[0]["bookmakers"]
+    assert [b["key"] for b in bookmakers] == ["draftkings"]
+    assert [m["key"] for m in bookmakers[0]["markets"]] == ["h2h"]
+    # The source events are left untouched
+    assert len(events[0]["bookmakers"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_overlapping_requests_are_merged():
+    """h2h/us, spreads/us and h2h/uk are served by two upstream calls costing 3"""
+    calls = []
+    planner = QueryPlanner(fake_fetch(calls), window=0.01)
+
+    results = await asyncio.gather(
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "spreads", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "uk"}),
+    )
+
+    assert len(calls) == 2
+    assert sum(estimate_cost(split_csv(c["markets"]), split_csv(c["regions"])) for c in calls) == 3
+
+    for result, (market, book) in zip(results, [("h2h", "draftkings"), ("spreads", "draftkings"), ("h2h", "paddypower")]):
+        bookmakers = result["data"][0]["bookmakers"]
+        assert [b["key"] for b in bookmakers] == [book]
+        assert [m["key"] for m in bookmakers[0]["markets"]] == [market]
+
+    stats = planner.stats()
+    assert stats["requests"] == 3
+    assert stats["upstream_calls"] == 2
+    assert stats["estimated_cost_unplanned"] == 3
+    assert stats["actual_cost"] == 3
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_call():
+    """Duplicate requests collapse into a single upstream call"""
+    calls = []
+    planner = QueryPlanner(fake_fetch(calls), window=0.01)
+
+    await asyncio.gather(*(
+        planner.get_odds("basketball_nba", {"markets": "h2h,spreads", "regions": "us"}) for _ in range(4)
+    ))
+
+    assert len(calls) == 1
+    assert planner.stats()["estimated_quota_saved"] == 6
+
+
+@pytest.mark.asyncio
+async def test_different_formats_are_not_merged():
+    """Requests with different non-mergeable options use separate calls"""
+    calls = []
+    planner = QueryPlanner(fake_fetch(calls), window=0.01)
+
+    await asyncio.gather(
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "decimal"}),
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us", "oddsFormat": "american"}),
+    )
+
+    assert sorted(c["oddsFormat"] for c in calls) == ["american", "decimal"]
+
+
+@pytest.mark.asyncio
+async def test_regions_are_only_merged_when_cheaper():
+    """h2h/us and h2h/uk cost the same either way, so they are not merged and filtered"""
+    calls = []
+    planner = QueryPlanner(fake_fetch(calls), window=0.01)
+
+    await asyncio.gather(
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "uk"}),
+    )
+
+    assert sorted(c["regions"] for c in calls) == ["uk", "us"]
+
+
+@pytest.mark.asyncio
+async def test_planning_failure_reaches_every_caller(monkeypatch):
+    """A failing flush fails every pending request instead of leaving it hanging"""
+    def broken(requests, max_exact):
+        raise RuntimeError("planning failed")
+
+    monkeypatch.setattr(query_planner, "plan_groups", broken)
+    planner = QueryPlanner(fake_fetch([]), window=0.01)
+
+    results = await asyncio.wait_for(asyncio.gather(
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "spreads", "regions": "us"}),
+        return_exceptions=True,
+    ), timeout=1)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_projection_failure_stays_in_its_group(monkeypatch):
+    """A group whose projection fails does not fail callers waiting on another group"""
+    calls = []
+    fetch = fake_fetch(calls)
+
+    def slow_uk(sport, options):
+        if options["regions"] == "uk":
+            time.sleep(0.1)
+        return fetch(sport, options)
+
+    def broken(*args, **kwargs):
+        raise ValueError("projection failed")
+
+    monkeypatch.setattr(query_planner, "project_events", broken)
+    planner = QueryPlanner(slow_uk, window=0.01)
+
+    h2h, spreads, uk = await asyncio.wait_for(asyncio.gather(
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "spreads", "regions": "us"}),
+        planner.get_odds("basketball_nba", {"markets": "h2h", "regions": "uk"}),
+        return_exceptions=True,
+    ), timeout=1)
+
+    assert isinstance(h2h, ValueError) and isinstance(spreads, ValueError)
+    assert uk["data"][0]["bookmakers"][0]["key"] == "paddypower"
+    assert sorted(c["regions"] for c in calls) == ["uk", "us"]
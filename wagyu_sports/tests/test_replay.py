@@ -0,0 +1,107 @@
+"""Tests for replaying recorded snapshots through the MCP server"""
+
+import json
+import os
+import sys
+import time
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.odds_archive import ArchiveWriter
+from wagyu_sports.mcp_server.replay import create_replay, derive_options, load_snapshots
+
+
+def record_night(path, nba_events, snapshots=3, interval=60.0):
+    """Archive ``snapshots`` NBA slates whose prices drift by 0.01 each time."""
+    writer = ArchiveWriter(path)
+    for i in range(snapshots):
+        events = nba_events()
+        for event in events:
+            for bookmaker in event["bookmakers"]:
+                for market in bookmaker["markets"]:
+                    for outcome in market["outcomes"]:
+                        outcome["price"] = round(outcome["price"] + i / 100, 2)
+        writer.append("basketball_nba", events, fetched_at=1000.0 + interval * i)
+
+
+def first_price(response):
+    return response["data"][0]["bookmakers"][0]["markets"][0]["outcomes"][0]["price"]
+
+
+def test_load_captures_and_derive_options(mocks_dir, nba_events):
+    """mocks_live captures load with their recorded options"""
+    snapshots = load_snapshots([mocks_dir])
+
+    assert [s.sport for s in snapshots] == ["basketball_nba"]
+    assert snapshots[0].options == {"oddsFormat": "decimal", "regions": "us", "markets": "h2h,spreads"}
+    assert derive_options(nba_events()) == {"oddsFormat": "decimal", "markets": "h2h,spreads", "regions": "us"}
+
+
+def test_archive_snapshots_sharing_a_fetch_time_load_separately(tmp_path, nba_events):
+    """Two snapshots of a sport stored with one timestamp are both replayed"""
+    events = nba_events()
+    spreads = [dict(event, bookmakers=[dict(b, markets=b["markets"][1:]) for b in event["bookmakers"]])
+               for event in events]
+    writer = ArchiveWriter(tmp_path)
+    writer.append("basketball_nba", events, fetched_at=1000.0)
+    writer.append("basketball_nba", spreads, fetched_at=1000.0)
+
+    snapshots = load_snapshots([tmp_path])
+
+    assert [s.options["markets"] for s in snapshots] == ["h2h,spreads", "spreads"]
+    assert snapshots[0].response["data"] == events
+
+
+@pytest.mark.anyio
+async def test_tools_see_simulated_time(tmp_path, nba_events):
+    """get_odds answers with the newest snapshot at or before simulated time"""
+    record_night(tmp_path, nba_events)
+    replay = create_replay([tmp_path], speed=None)
+    assert replay.seek(1000.0) == 1
+
+    async with client_session(replay.server.server) as client:
+        result = await client.call_tool("get_odds", {"sport": "basketball_nba", "markets": "h2h", "regions": "us"})
+        assert first_price(json.loads(result.content[0].text)) == 5.55
+
+        replay.seek(1090.0)
+        result = await client.call_tool("get_odds", {"sport": "basketball_nba", "markets": "h2h", "regions": "us"})
+        response = json.loads(result.content[0].text)
+        assert first_price(response) == 5.56
+        assert response["cache"]["age_seconds"] == 30
+
+        result = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "uk"})
+        assert "error" in json.loads(result.content[0].text)
+
+        result = await client.call_tool("get_sports", {})
+        assert json.loads(result.content[0].text)["data"][0]["key"] == "basketball_nba"
+
+
+@pytest.mark.anyio
+async def test_accelerated_replay(tmp_path, nba_events):
+    """A replay at 600x covers ten simulated minutes in about a second"""
+    record_night(tmp_path, nba_events, snapshots=11)
+    replay = create_replay([tmp_path], speed=600.0)
+
+    started = time.monotonic()
+    await replay.run()
+
+    assert replay.finished
+    assert 0.9 <= time.monotonic() - started < 3.0
+    assert first_price(replay.server.cache.get("basketball_nba", {"regions": "us", "oddsFormat": "decimal"})) == 5.65
+
+
+@pytest.mark.anyio
+async def test_replay_as_fast_as_possible(tmp_path, nba_events):
+    """Without a speed the clock steps from snapshot to snapshot"""
+    record_night(tmp_path, nba_events, snapshots=100)
+    replay = create_replay([tmp_path], speed=None)
+
+    await replay.run()
+
+    assert replay.stats() == {"simulated_time": 1000.0 + 60 * 99, "ingested": 100, "remaining": 0}
@@ -0,0 +1,69 @@
+"""Tests for the content-addressed snapshot store"""
+
+import copy
+import os
+import sys
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.replay import load_snapshots
+from wagyu_sports.mcp_server.snapshot_store import SnapshotStore, SnapshotReader
+
+H2H_SPREADS_US = {"regions": "us", "markets": "h2h,spreads", "oddsFormat": "decimal"}
+
+
+def book_count(events):
+    return sum(len(event["bookmakers"]) for event in events)
+
+
+def test_identical_snapshots_share_everything(tmp_path, nba_events):
+    """A repeated poll of a quiet slate only adds a reference"""
+    store = SnapshotStore(tmp_path)
+    events = nba_events()
+
+    first = store.put("basketball_nba", events, 1000.0, H2H_SPREADS_US)
+    written = dict(store.stats)
+    second = store.put("basketball_nba", copy.deepcopy(events), 1060.0, H2H_SPREADS_US)
+
+    assert first == second
+    assert written["objects_written"] == book_count(events) + 1
+    assert store.stats["objects_written"] == written["objects_written"]
+    assert store.stats["duplicates"] == 1
+    assert store.stats["books_reused"] == book_count(events)
+
+    reader = SnapshotReader(tmp_path)
+    assert [(s["fetched_at"], s["root"]) for s in reader.list_snapshots()] == [(1000.0, first), (1060.0, first)]
+    assert reader.load(first) == events
+
+
+def test_only_changed_books_are_stored(tmp_path, nba_events):
+    """A bookmaker that moved is stored again; everything else is shared"""
+    store = SnapshotStore(tmp_path)
+    events = nba_events()
+    store.put("basketball_nba", events, 1000.0, H2H_SPREADS_US)
+    written = store.stats["objects_written"]
+
+    moved = copy.deepcopy(events)
+    book = moved[0]["bookmakers"][0]
+    book["last_update"] = "2025-03-03T10:00:00Z"
+    book["markets"][0]["outcomes"][0]["price"] += 0.05
+    root = store.put("basketball_nba", moved, 1060.0, H2H_SPREADS_US)
+
+    # The moved book and a new root
+    assert store.stats["objects_written"] == written + 2
+    assert SnapshotReader(tmp_path).load(root) == moved
+
+
+def test_server_stores_and_replays_snapshots(tmp_path, nba_events):
+    """Ingested snapshots are stored and can be replayed"""
+    server = OddsMcpServer(offline=True, snapshots=str(tmp_path))
+    for fetched_at in (1000.0, 1060.0, 1120.0):
+        server.ingest_odds("basketball_nba", H2H_SPREADS_US, {"data": nba_events()}, fetched_at=fetched_at)
+
+    assert server.snapshot_store.stats["duplicates"] == 2
+    snapshots = load_snapshots([tmp_path])
+    assert [s.fetched_at for s in snapshots] == [1000.0, 1060.0, 1120.0]
+    assert snapshots[0].options == H2H_SPREADS_US
+    assert snapshots[2].response["data"] == nba_events()
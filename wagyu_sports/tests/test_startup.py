@@ -0,0 +1,112 @@
+"""Tests for MCP server import time and deferred initialization"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import budget for the server module, about 1.25x its measured import time;
+# override with WAGYU_IMPORT_BUDGET_MS
+IMPORT_BUDGET_MS = float(os.environ.get("WAGYU_IMPORT_BUDGET_MS", "1100"))
+
+# Modules that must only be loaded once a tool needs them
+DEFERRED_MODULES = [
+    "requests",
+    "wagyu_sports.odds_client",
+    "wagyu_sports.mcp_server.odds_client",
+    "wagyu_sports.mcp_server.query_planner",
+    "wagyu_sports.mcp_server.odds_cache",
+    "wagyu_sports.mcp_server.odds_projection",
+    "wagyu_sports.mcp_server.odds_format",
+    "wagyu_sports.mcp_server.cache_daemon",
+    "wagyu_sports.mcp_server.odds_board",
+    "wagyu_sports.mcp_server.odds_subscriptions",
+    "wagyu_sports.mcp_server.alert_rules",
+    "wagyu_sports.mcp_server.game_lines",
+]
+
+
+def import_times(module):
+    """Import ``module`` in a fresh interpreter and return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_server_import_defers_heavy_modules():
+    """Importing the server loads neither the HTTP client nor the analytics modules"""
+    times = import_times("wagyu_sports.mcp_server.odds_client_server")
+
+    assert "wagyu_sports.mcp_server.odds_client_server" in times
+    loaded = [module for module in DEFERRED_MODULES if module in times]
+    assert loaded == []
+
+
+def test_server_creation_defers_heavy_modules():
+    """Creating a server and parsing its command line load none of the deferred modules"""
+    script = (
+        "import sys\n"
+        "from unittest.mock import patch\n"
+        "from wagyu_sports.mcp_server import odds_client_server as server\n"
+        "server.OddsMcpServer(test_mode=True)\n"
+        "with patch.object(sys, 'argv', ['wagyu', '--test-mode']), \\\n"
+        "        patch.object(server.OddsMcpServer, 'run', lambda self, **kwargs: None), \\\n"
+        "        patch.object(server.asyncio, 'run', lambda coroutine: coroutine.close()):\n"
+        "    server.main()\n"
+        f"print(','.join(m for m in {DEFERRED_MODULES[1:]!r} if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_server_import_budget():
+    """Importing the server stays within the import-time budget"""
+    times = import_times("wagyu_sports.mcp_server.odds_client_server")
+
+    elapsed_ms = times["wagyu_sports.mcp_server.odds_client_server"] / 1000
+    assert elapsed_ms < IMPORT_BUDGET_MS, f"import took {elapsed_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_components_created_on_first_use():
+    """The client, cache and planner are built when first accessed"""
+    server = OddsMcpServer(api_key="test_key")
+
+    assert "client" not in vars(server)
+    assert "planner" not in vars(server)
+    assert server._shared_objects == {}
+    assert server.board is server.board
+    assert server.planner is server.planner
+    assert server.client.api_key == "test_key"
+    assert server.shared_cache is None
+
+
+@pytest.mark.anyio
+async def test_mock_data_loaded_once(tmp_path):
+    """Mock fixtures are read from disk once per server"""
+    server = OddsMcpServer(test_mode=True)
+    server.mock_data_dir = tmp_path
+    (tmp_path / "sports.json").write_text('{"data": []}')
+
+    first = await server._get_mock_data("sports.json")
+    (tmp_path / "sports.json").unlink()
+
+    assert await server._get_mock_data("sports.json") == first
@@ -0,0 +1,57 @@
+"""Tests for the process-wide symbol tables"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from wagyu_sports.mcp_server import symbols
+from wagyu_sports.mcp_server.symbols import SymbolTable
+
+
+def test_symbol_table_shares_copies():
+    """A table hands out one copy per string until it is full"""
+    table = SymbolTable("test", limit=2)
+    a = table.intern("".join(["a"]))
+    assert table.intern("".join(["a"])) is a
+    table.intern("b")
+    assert len(table) == 2 and "b" in table
+    # A full table still interns what it has and passes new strings through
+    c = "".join(["c"])
+    assert table.intern(c) is c and "c" not in table and len(table) == 2
+    assert table.intern("".join(["a"])) is a
+
+
+def test_iter_lines_matches_outcomes(nba_events):
+    """Every priced outcome gets a distinct line, including player props"""
+    events = nba_events()
+    lines = [line for event in events for line, _ in symbols.iter_lines(event)]
+    outcomes = sum(len(m["outcomes"]) for e in events for b in e["bookmakers"] for m in b["markets"])
+    assert len(set(lines)) == len(lines) == outcomes
+
+    prop = {"id": "e", "bookmakers": [{"key": "fanduel", "markets": [{"key": "player_points", "outcomes": [
+        {"name": "Over", "description": "Stephen Curry", "price": 1.9, "point": 28.5},
+        {"name": "Over", "description": "LeBron James", "price": 1.9, "point": 25.5},
+    ]}]}]}
+    (first, _), (second, _) = symbols.iter_lines(prop)
+    assert first != second
+    assert first == ("e", "fanduel", "player_points", "Over|Stephen Curry")
+
+
+def test_intern_events_shares_strings(nba_events):
+    """Separately parsed snapshots share one copy of each repeated string"""
+    first, second = nba_events(), nba_events()
+    assert first[0]["home_team"] is not second[0]["home_team"]
+
+    symbols.intern_events(first)
+    symbols.intern_events(second)
+
+    assert first == nba_events()
+    assert first[0]["home_team"] is second[0]["home_team"]
+    book = lambda events: events[0]["bookmakers"][0]
+    assert book(first)["key"] is book(second)["key"]
+    assert book(first)["title"] is book(second)["title"]
+    # Per-event values are not kept in the tables
+    for value in (first[0]["id"], first[0]["commence_time"], book(first)["last_update"]):
+        assert value not in symbols.STRINGS
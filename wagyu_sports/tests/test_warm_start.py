@@ -0,0 +1,119 @@
+"""Tests for seeding the cache from recorded snapshots"""
+
+import json
+import os
+import sys
+from unittest.mock import MagicMock
+import pytest
+
+# Add the parent directory to the path so we can import the package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from mcp.shared.memory import (
+    create_connected_server_and_client_session as client_session,
+)
+
+from wagyu_sports.mcp_server.capture_log import CaptureLog, CaptureReader
+from wagyu_sports.mcp_server.odds_archive import ArchiveReader, ArchiveWriter
+from wagyu_sports.mcp_server.odds_client_server import OddsMcpServer
+from wagyu_sports.mcp_server.snapshot_store import SnapshotReader, SnapshotStore
+from wagyu_sports.mcp_server.warm_start import newest_recorded, newest_snapshots, newest_sports_list
+
+
+def nba_capture(nba_response, captured_at, markets="h2h"):
+    capture = nba_response()
+    capture["_metadata"]["captured_at"] = captured_at
+    capture["_metadata"]["parameters"]["markets"] = markets
+    return capture
+
+
+def test_newest_snapshot_per_request(tmp_path, mocks_dir, nba_response):
+    """Only the newest capture of each sport and set of options is seeded"""
+    for name, captured_at, markets in (("a.json", "2025-03-01T00:00:00Z", "h2h"),
+                                       ("b.json", "2025-03-02T00:00:00Z", "h2h"),
+                                       ("c.json", "2025-03-01T12:00:00Z", "spreads")):
+        (tmp_path / name).write_text(json.dumps(nba_capture(nba_response, captured_at, markets)))
+
+    seeded = newest_snapshots([tmp_path])
+    assert [(snapshot.options["markets"], snapshot.fetched_at) for _, snapshot in seeded] == [
+        ("spreads", 1740830400.0), ("h2h", 1740873600.0)]
+    assert newest_sports_list([tmp_path]) is None
+
+    source, fetched_at, response = newest_sports_list([mocks_dir])
+    assert source == str(mocks_dir) and response["data"][0]["key"] == "americanfootball_cfl"
+
+
+def test_only_the_newest_snapshots_are_rebuilt(tmp_path, monkeypatch, nba_events, nba_response, mocks_dir):
+    """Archives and stores are ranked from their indexes, and capture logs are read once"""
+    h2h = [dict(event, bookmakers=[dict(b, markets=[m for m in b["markets"] if m["key"] == "h2h"])
+                                   for b in event["bookmakers"]])
+           for event in nba_events()]
+    writer, store = ArchiveWriter(tmp_path / "archive"), SnapshotStore(tmp_path / "store")
+    for i in range(4):
+        writer.append("basketball_nba", nba_events(), fetched_at=1000.0 + i)
+        store.put("basketball_nba", nba_events(), 1000.0 + i,
+                  {"oddsFormat": "decimal", "regions": "us", "markets": "h2h,spreads"})
+    writer.append("basketball_nba", h2h, fetched_at=1010.0)
+    with CaptureLog(tmp_path / "log") as log:
+        log.append("get_odds", nba_response()["data"], {"sport": "basketball_nba", "markets": "h2h"},
+                   captured_at=1020.0)
+        with open(mocks_dir / "sports_list_live.json") as f:
+            log.append("get_sports", {"data": json.load(f)["data"]}, captured_at=1030.0)
+
+    calls = {"events": 0, "load": 0, "read": 0}
+    for cls, name, counter in ((ArchiveReader, "_events", "events"), (SnapshotReader, "load", "load"),
+                               (CaptureReader, "read", "read")):
+        def counted(self, *args, _original=getattr(cls, name), _counter=counter):
+            calls[_counter] += 1
+            return _original(self, *args)
+        monkeypatch.setattr(cls, name, counted)
+
+    snapshots, sports_list = newest_recorded([tmp_path / "archive", tmp_path / "store", tmp_path / "log"])
+
+    assert calls == {"events": 2, "load": 1, "read": 2}
+    assert [(source.rsplit("/", 1)[-1], s.options.get("markets"), s.fetched_at) for source, s in snapshots] == [
+        ("store", "h2h,spreads", 1003.0), ("archive", "h2h", 1010.0), ("log", "h2h", 1020.0)]
+    assert sports_list[0] == str(tmp_path / "log") and sports_list[1] == 1030.0
+
+
+@pytest.mark.anyio
+async def test_failed_fetches_serve_seeded_data(mocks_dir):
+    """When the upstream fails, seeded odds and sports are served with their age"""
+    server = OddsMcpServer(api_key="test_key", planner_window=0.0, seed=[str(mocks_dir)])
+    server.client.get_odds = MagicMock(side_effect=ConnectionError("upstream down"))
+    server.client.get_sports = MagicMock(side_effect=ConnectionError("upstream down"))
+
+    async with client_session(server.server) as client:
+        odds = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us",
+                                                   "markets": "h2h"})
+        sports = await client.call_tool("get_sports", {})
+        quota = await client.call_tool("get_quota_info", {})
+
+    odds = json.loads(odds.content[0].text)
+    assert odds["data"] and "seed" not in odds
+    assert odds["stale"]["reason"] == "upstream down"
+    assert odds["stale"]["seeded_from"] == str(mocks_dir)
+    assert odds["stale"]["fetched_at"].startswith("2025-03-03T09:47:34")
+    assert odds["stale"]["age_seconds"] > 0
+    sports = json.loads(sports.content[0].text)
+    assert sports["data"] and sports["stale"]["seeded_from"] == str(mocks_dir)
+    assert json.loads(quota.content[0].text)["seeded"][0]["sport"] == "basketball_nba"
+
+
+@pytest.mark.anyio
+async def test_seed_without_api_key_runs_offline(monkeypatch, mocks_dir):
+    """Without an API key, a seeded server serves its recorded odds instead of refusing to start"""
+    monkeypatch.delenv("ODDS_API_KEY", raising=False)
+    with pytest.raises(ValueError):
+        OddsMcpServer()
+    server = OddsMcpServer(seed=[str(mocks_dir)])
+    assert server.offline and server.client is None
+
+    async with client_session(server.server) as client:
+        odds = await client.call_tool("get_odds", {"sport": "basketball_nba", "regions": "us",
+                                                   "markets": "spreads"})
+        missing = await client.call_tool("get_odds", {"sport": "icehockey_nhl", "regions": "us"})
+
+    odds = json.loads(odds.content[0].text)
+    assert odds["stale"]["reason"] == "offline" and odds["stale"]["seeded_from"] == str(mocks_dir)
+    assert "error" in json.loads(missing.content[0].text)
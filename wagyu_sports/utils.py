@@ -3,84 +3,36 @@
 Utility functions for working with the Wagyu Sports client.
 """
 import os
-import json
-import glob
-from typing import Dict, Any, Optional, Tuple
-from pathlib import Path
+from typing import Optional, Tuple
 from dotenv import load_dotenv
 
 from .odds_client import OddsClient
 
 
-def get_next_test_number() -> int:
-    """
-    Get the next sequential test number for the output directory.
-    
-    This function looks at existing test directories and returns the next number in sequence.
-    
-    Returns:
-        int: Next test number
-    """
-    # Define the base directory for test outputs
-    base_dir = os.path.join(os.getcwd(), "test_outputs")
-    
-    # Ensure the directory exists
-    os.makedirs(base_dir, exist_ok=True)
-    
-    # Find all test directories
-    test_dirs = glob.glob(os.path.join(base_dir, "test*"))
-    
-    if not test_dirs:
-        return 1
-    
-    # Extract numbers from directory names
-    numbers = []
-    for dir_path in test_dirs:
-        dir_name = os.path.basename(dir_path)
-        try:
-            # Extract number from "test{number}"
-            num = int(dir_name.replace("test", ""))
-            numbers.append(num)
-        except ValueError:
-            continue
-    
-    # Return next number in sequence
-    return max(numbers) + 1 if numbers else 1
+# Capture log that test_wagyu_sports() appends its responses to
+CAPTURE_DIR = os.path.join("test_outputs", "captures")
 
 
-def save_response(filename: str, data: Dict[str, Any], test_number: Optional[int] = None) -> str:
+def open_capture_log(path: Optional[str] = None):
     """
-    Save API response to a JSON file.
+    Open the capture log for API responses.
+    
+    Responses are appended as compressed NDJSON records (see
+    mcp_server/capture_log.py), which ``--replay`` can serve back.
     
     Args:
-        filename (str): Name of the file to save
-        data (Dict[str, Any]): Data to save
-        test_number (int, optional): Test number for directory. If None, uses next available.
+        path (str, optional): Log directory. Defaults to test_outputs/captures
+            under the current directory.
         
     Returns:
-        str: Path to the saved file
+        CaptureLog: Log to append responses to
     """
-    # Get test number if not provided
-    if test_number is None:
-        test_number = get_next_test_number()
-    
-    # Define directory path
-    dir_path = os.path.join(os.getcwd(), "test_outputs", f"test{test_number}")
-    
-    # Ensure directory exists
-    os.makedirs(dir_path, exist_ok=True)
-    
-    # Define file path
-    file_path = os.path.join(dir_path, filename)
-    
-    # Save data to file
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    return file_path
+    # Imported on use, so importing the client utilities does not load the capture log
+    from .mcp_server.capture_log import CaptureLog
+    return CaptureLog(path or os.path.join(os.getcwd(), CAPTURE_DIR))
 
 
-def test_wagyu_sports() -> Tuple[str, str]:
+def test_wagyu_sports() -> Tuple[int, int]:
     """
     Example function that demonstrates full API workflow.
     
@@ -89,10 +41,11 @@ def test_wagyu_sports() -> Tuple[str, str]:
     2. Creates an OddsClient instance
     3. Fetches available sports
     4. Fetches NBA odds
-    5. Saves responses to files
+    5. Appends responses to the capture log
     
     Returns:
-        Tuple[str, str]: Paths to the saved files (sports, odds)
+        Tuple[int, int]: Record numbers of the responses in the capture log (sports, odds),
+            -1 for a response that could not be fetched
     """
     # Load environment variables
     load_dotenv(dotenv_path="config/.env")
@@ -105,18 +58,18 @@ def test_wagyu_sports() -> Tuple[str, str]:
     # Create client
     client = OddsClient(api_key)
     
-    # Get test number
-    test_number = get_next_test_number()
+    log = open_capture_log()
     
     # Get available sports
     try:
         sports_response = client.get_sports()
-        sports_file = save_response("1_available_sports.json", sports_response, test_number)
-        print(f"Available sports saved to {sports_file}")
+        sports_record = log.append("get_sports", sports_response)
+        print(f"Available sports saved as record {sports_record} of {log.path}")
         print(f"Remaining requests: {sports_response['headers']['x-requests-remaining']}")
     except Exception as e:
         print(f"Error fetching sports: {e}")
-        return "", ""
+        log.close()
+        return -1, -1
     
     # Get NBA odds
     try:
@@ -126,14 +79,17 @@ def test_wagyu_sports() -> Tuple[str, str]:
             "oddsFormat": "american"
         }
         odds_response = client.get_odds("basketball_nba", odds_options)
-        odds_file = save_response("2_nba_odds.json", odds_response, test_number)
-        print(f"NBA odds saved to {odds_file}")
+        odds_record = log.append("get_odds", odds_response,
+                                 {"sport": "basketball_nba", "options": odds_options})
+        print(f"NBA odds saved as record {odds_record} of {log.path}")
         print(f"Remaining requests: {odds_response['headers']['x-requests-remaining']}")
     except Exception as e:
         print(f"Error fetching NBA odds: {e}")
-        return sports_file, ""
+        return sports_record, -1
+    finally:
+        log.close()
     
-    return sports_file, odds_file
+    return sports_record, odds_record
 
 
 if __name__ == "__main__":